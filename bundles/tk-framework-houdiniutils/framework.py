@@ -0,0 +1,29 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Scene utilities shared by the Toolkit Houdini output node apps.
+"""
+
+import sgtk
+
+
+class HoudiniUtilsFramework(sgtk.platform.Framework):
+    """The Houdini utilities framework."""
+
+    def init_framework(self):
+        """Initialize the framework."""
+
+        self.log_debug("%s: Initializing..." % self)
+
+    def destroy_framework(self):
+        """Destroy the framework."""
+
+        self.log_debug("%s: Destroying..." % self)
@@ -0,0 +1,188 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+# built-ins
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from concurrent import futures
+
+
+class BackupSnapshotWriter(object):
+    """Copy hip file snapshots to their backup location in the background.
+
+    The hip file is copied to a local temporary file when the snapshot is
+    taken, so later saves can't change a snapshot waiting to be written.
+    Copies to the backup location then run in a small pool of worker threads
+    so the session isn't blocked while writing to network storage. A copy is
+    skipped when the content of the hip file hasn't changed since it was last
+    copied to the same backup path.
+    """
+
+    MAX_WORKERS = 2
+    """Maximum number of backup copies running at the same time."""
+
+    CHUNK_SIZE = 1024 * 1024
+    """Size of the chunks read when copying a hip file."""
+
+    def __init__(self, app, max_workers=MAX_WORKERS):
+        """Initialize the writer.
+
+        :param app: The calling Toolkit Application.
+        :param int max_workers: Maximum number of concurrent copies.
+
+        """
+
+        self._app = app
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+
+        # content hash of the last snapshot written to each backup path
+        self._hashes = {}
+
+        # the last snapshot submitted for each backup path
+        self._snapshots = {}
+
+        # one lock per backup path, so snapshots of the same path are written
+        # one after the other
+        self._path_locks = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self, source_path, backup_path):
+        """Take a snapshot of the supplied file and submit its copy to the
+        backup path.
+
+        :param str source_path: Path of the saved hip file.
+        :param str backup_path: Path of the backup to write.
+
+        :return: A future resolving to True if the file was copied or False
+            if the copy was skipped as the backup is up to date.
+
+        :raises: The error raised while taking the snapshot. Errors raised
+            while writing it to the backup path are logged, and raised by
+            :meth:`wait`.
+
+        """
+
+        (snapshot_path, content_hash) = _snapshot_file(
+            source_path, self.CHUNK_SIZE)
+
+        with self._lock:
+            path_lock = self._path_locks.setdefault(backup_path, threading.Lock())
+            snapshot = self._executor.submit(
+                self._write_snapshot, snapshot_path, content_hash, backup_path,
+                path_lock)
+            self._snapshots[backup_path] = snapshot
+
+        snapshot.add_done_callback(
+            lambda done: self._report_error(done, backup_path))
+
+        return snapshot
+
+    def wait(self, backup_path, timeout=None):
+        """Wait for the last snapshot submitted to the backup path to finish.
+
+        :param str backup_path: Path of the backup.
+        :param float timeout: Maximum number of seconds to wait.
+
+        :raises: The error raised while writing the snapshot, if any.
+
+        """
+
+        with self._lock:
+            snapshot = self._snapshots.get(backup_path)
+
+        if snapshot:
+            snapshot.result(timeout)
+
+    def _write_snapshot(self, snapshot_path, content_hash, backup_path,
+        path_lock):
+        """Copy a snapshot to the backup path unless it is up to date.
+
+        :param str snapshot_path: Path of the temporary snapshot file, which
+            is removed once written.
+        :param str content_hash: Hash of the content of the snapshot.
+        :param str backup_path: Path of the backup to write.
+        :param path_lock: Lock serializing the writes to the backup path.
+
+        """
+
+        try:
+            with path_lock:
+                if (self._hashes.get(backup_path) == content_hash
+                    and os.path.exists(backup_path)):
+                    self._app.log_debug(
+                        "Backup file is up to date, skipping copy: %s" %
+                        (backup_path,))
+                    return False
+
+                # Create dir if it doesn't exist
+                backup_dir_path = os.path.dirname(backup_path)
+                if not os.path.exists(backup_dir_path):
+                    os.makedirs(backup_dir_path)
+
+                # write to a temporary file first so an interrupted copy never
+                # leaves a partial backup behind
+                temp_path = "%s.tmp" % (backup_path,)
+                shutil.copy2(snapshot_path, temp_path)
+                os.replace(temp_path, backup_path)
+
+                self._hashes[backup_path] = content_hash
+                self._app.log_debug("Wrote backup file: %s" % (backup_path,))
+                return True
+        finally:
+            os.remove(snapshot_path)
+
+    def _report_error(self, snapshot, backup_path):
+        """Log the error of a failed snapshot copy.
+
+        :param snapshot: The finished snapshot future.
+        :param str backup_path: Path of the backup.
+
+        """
+
+        if snapshot.cancelled():
+            return
+
+        error = snapshot.exception()
+        if error is not None:
+            self._app.log_error(
+                "Failed to write backup file %s: %s" % (backup_path, error))
+
+
+def _snapshot_file(path, chunk_size):
+    """Copy a file to a local temporary file, hashing its content.
+
+    :param str path: Path of the file to copy.
+    :param int chunk_size: Size of the chunks to read.
+
+    :return: The path of the temporary file and the sha1 digest of the
+        content.
+    :rtype: tuple
+
+    """
+
+    digest = hashlib.sha1()
+    (handle, snapshot_path) = tempfile.mkstemp(
+        prefix="backup_snapshot_", suffix=os.path.splitext(path)[1])
+
+    try:
+        with os.fdopen(handle, "wb") as snapshot_file, \
+                open(path, "rb") as source_file:
+            for chunk in iter(lambda: source_file.read(chunk_size), b""):
+                digest.update(chunk)
+                snapshot_file.write(chunk)
+        shutil.copystat(path, snapshot_path)
+    except Exception:
+        os.remove(snapshot_path)
+        raise
+
+    return (snapshot_path, digest.hexdigest())
@@ -0,0 +1,156 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+# houdini
+import hou
+
+
+# kinds of parms, as far as copying their values is concerned
+PARM_KIND_SKIP = "skip"
+PARM_KIND_MULTIPARM = "multiparm"
+PARM_KIND_STRING = "string"
+PARM_KIND_VALUE = "value"
+
+
+def copy_parm_values(source_node, target_node, excludes=None, parm_kinds=None):
+    """Copy matching parameter values from source node to target node.
+
+    :param hou.Node source_node: Soure node with parm values to copy.
+    :param hou.Node target_node: Target node to receive the copied parm values.
+    :parm list excludes: List of parm names to exclude during copy.
+    :param dict parm_kinds: Optional cache of the parm kinds of the source node
+        type, see :func:`get_parm_kind`. Pass the same dictionary when
+        copying the parms of many nodes to only inspect each parm template once.
+
+    Values are set on the target node with a single ``setParms`` call, after
+    the multiparm counts so that the multiparm instances exist.
+
+    """
+
+    excludes = set(excludes or [])
+
+    if parm_kinds is None:
+        parm_kinds = {}
+
+    source_type_name = source_node.type().name()
+
+    multiparm_counts = []
+    keyframed_parms = []
+    values = {}
+
+    # build a parameter list from the source node, ignoring the excludes
+    for source_parm in source_node.parms():
+        parm_name = source_parm.name()
+        if parm_name in excludes:
+            continue
+
+        kind_key = (source_type_name, parm_name)
+        parm_kind = parm_kinds.get(kind_key)
+        if parm_kind is None:
+            parm_kind = get_parm_kind(source_parm)
+            parm_kinds[kind_key] = parm_kind
+
+        # skip folder parms
+        if parm_kind == PARM_KIND_SKIP:
+            continue
+
+        # if we have keys/expressions we need to copy them all.
+        if source_parm.keyframes():
+            keyframed_parms.append(source_parm)
+        elif parm_kind == PARM_KIND_MULTIPARM:
+            multiparm_counts.append((parm_name, source_parm.eval()))
+        # if the parameter is a string, copy the raw string.
+        elif parm_kind == PARM_KIND_STRING:
+            values[parm_name] = source_parm.unexpandedString()
+        # copy the evaluated value
+        else:
+            values[parm_name] = source_parm.eval()
+
+    for parm_name, count in multiparm_counts:
+        target_parm = target_node.parm(parm_name)
+        if target_parm is not None:
+            target_parm.set(count)
+
+    # if the parm on the target node doesn't exist, skip it
+    target_parm_names = set(parm.name() for parm in target_node.parms())
+    values = dict(
+        (parm_name, value)
+        for (parm_name, value) in values.items()
+        if parm_name in target_parm_names
+    )
+
+    try:
+        target_node.setParms(values)
+    except (TypeError, hou.OperationFailed):
+        # fall back to setting the values one at a time, see set_parm_value
+        for parm_name, value in values.items():
+            set_parm_value(target_node.parm(parm_name), value)
+
+    for source_parm in keyframed_parms:
+        target_parm = target_node.parm(source_parm.name())
+        if target_parm is None:
+            continue
+
+        for key in source_parm.keyframes():
+            target_parm.setKeyframe(key)
+
+
+def get_parm_kind(parm):
+    """Return how the value of the supplied parm is copied.
+
+    :param hou.Parm parm: The parm to inspect.
+
+    """
+
+    parm_template = parm.parmTemplate()
+
+    if isinstance(parm_template, hou.FolderSetParmTemplate):
+        return PARM_KIND_SKIP
+
+    if isinstance(
+        parm_template, hou.FolderParmTemplate
+    ) and parm_template.folderType() in (
+        hou.folderType.MultiparmBlock,
+        hou.folderType.ScrollingMultiparmBlock,
+        hou.folderType.TabbedMultiparmBlock,
+    ):
+        return PARM_KIND_MULTIPARM
+
+    if isinstance(parm_template, hou.StringParmTemplate):
+        return PARM_KIND_STRING
+
+    return PARM_KIND_VALUE
+
+
+def set_parm_value(target_parm, value):
+    """Set the evaluated value of a source parm on the target parm.
+
+    :param hou.Parm target_parm: The parm to set.
+    :param value: The value of the source parm.
+
+    """
+
+    try:
+        target_parm.set(value)
+    except TypeError:
+        # The pre- and post-script type comboboxes changed sometime around
+        # 16.5.439 to being string type parms that take the name of the language
+        # (hscript or python) instead of an integer index of the combobox item
+        # that's selected. To support both, we try the old way (which is how our
+        # otls are setup to work), and if that fails we then fall back on mapping
+        # the integer index from our otl's parm over to the string language name
+        # that the Houdini node is expecting.
+        if target_parm.name().startswith("lpre") or target_parm.name().startswith(
+            "lpost"
+        ):
+            value_map = ["hscript", "python"]
+            target_parm.set(value_map[value])
+        else:
+            raise
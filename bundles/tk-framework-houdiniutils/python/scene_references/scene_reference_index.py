@@ -0,0 +1,233 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+# built-ins
+import os
+
+# houdini
+import hou
+
+
+class SceneReferenceIndex(object):
+    """Index of the nodes referencing files in the current Houdini scene.
+
+    The scene is walked once, the first time references are queried, to find
+    the nodes of the referencing types. Only the nodes and their file parms
+    are cached. The paths are evaluated on every query, since they can depend
+    on variables or on other nodes without any event being sent when they
+    change.
+
+    Nodes being created or deleted in a network, or the scene being loaded,
+    cleared or merged, cause the scene to be walked again on the next query.
+    Only the networks the referencing node types can be created in are
+    watched.
+    """
+
+    REFERENCE_PARMS = {
+        "abc_cam": "abcFile",
+        "alembicarchive": "fileName",
+        "arnold_procedural": "ar_filename",
+        "arnold_volume": "ar_filename",
+        "sgtk_file": "file",
+    }
+    """Maps node types referencing files to the parm holding the path."""
+
+    REFERENCE_CONDITIONS = {
+        "sgtk_file": ("mode", "file"),
+    }
+    """Parm values a node must have for its file to be referenced."""
+
+    NETWORK_CATEGORIES = ("Object", "Sop")
+    """Categories of the networks the referencing node types live in."""
+
+    NETWORK_EVENT_TYPES = (
+        hou.nodeEventType.ChildCreated,
+        hou.nodeEventType.ChildDeleted,
+    )
+
+    HIP_FILE_EVENT_TYPES = (
+        hou.hipFileEventType.AfterClear,
+        hou.hipFileEventType.AfterLoad,
+        hou.hipFileEventType.AfterMerge,
+    )
+
+    def __init__(self, root_path="/obj"):
+        """Initialize the index.
+
+        :param str root_path: Path of the network to index.
+
+        """
+
+        self._root_path = root_path
+
+        # reference entries keyed by node session id. Each entry is a tuple
+        # of (node type, file hou.Parm, condition hou.Parm or None).
+        self._references = None
+
+        # networks with event callbacks, used to remove them when rebuilding
+        self._network_nodes = []
+
+        self._hip_file_callback_added = False
+
+    def get_references(self, node_types=None):
+        """Return the file paths referenced in the scene.
+
+        :param list node_types: Only return the references of these node
+            types. All the indexed types if not specified.
+
+        :return: The referenced paths, using native path separators.
+        :rtype: list of str
+
+        """
+
+        if self._references is None:
+            self._build()
+
+        paths = []
+        for session_id, entry in list(self._references.items()):
+            (node_type, parm, condition_parm) = entry
+            if node_types is not None and node_type not in node_types:
+                continue
+
+            try:
+                if condition_parm is not None:
+                    value = self.REFERENCE_CONDITIONS[node_type][1]
+                    if condition_parm.evalAsString() != value:
+                        continue
+
+                path = _eval_path(parm)
+            except hou.ObjectWasDeleted:
+                self._references.pop(session_id, None)
+                continue
+
+            if path:
+                paths.append(path)
+
+        return paths
+
+    def invalidate(self):
+        """Discard the index. The scene is walked again on the next query."""
+
+        self._references = None
+
+    ############################################################################
+    # Private methods
+
+    def _build(self):
+        """Walk the scene and index the nodes referencing files."""
+
+        self._remove_network_callbacks()
+        self._references = {}
+
+        if not self._hip_file_callback_added:
+            hou.hipFile.addEventCallback(self._on_hip_file_event)
+            self._hip_file_callback_added = True
+
+        root = hou.node(self._root_path)
+        if not root:
+            return
+
+        self._add_network_callback(root)
+        for node in root.allSubChildren(recurse_in_locked_nodes=False):
+            if self._is_watched_network(node):
+                self._add_network_callback(node)
+
+            if node.type().name() in self.REFERENCE_PARMS:
+                self._index_node(node)
+
+    def _index_node(self, node):
+        """Add the reference entry of the supplied node.
+
+        :param hou.Node node: A node of one of the referencing types.
+
+        """
+
+        node_type = node.type().name()
+
+        condition_parm = None
+        condition = self.REFERENCE_CONDITIONS.get(node_type)
+        if condition:
+            condition_parm = node.parm(condition[0])
+            if not condition_parm:
+                return
+
+        parm = node.parm(self.REFERENCE_PARMS[node_type])
+        if not parm:
+            return
+
+        self._references[node.sessionId()] = (node_type, parm, condition_parm)
+
+    def _is_watched_network(self, node):
+        """Return True if referencing nodes can be created in the network.
+
+        :param hou.Node node: The node to check.
+
+        """
+
+        return (
+            node.isNetwork()
+            and node.childTypeCategory().name() in self.NETWORK_CATEGORIES
+        )
+
+    def _add_network_callback(self, node):
+        """Watch the supplied network for nodes being created or deleted."""
+
+        node.addEventCallback(self.NETWORK_EVENT_TYPES, self._on_network_event)
+        self._network_nodes.append(node)
+
+    def _remove_network_callbacks(self):
+        """Remove all the network callbacks added by the last scene walk."""
+
+        for node in self._network_nodes:
+            try:
+                node.removeEventCallback(
+                    self.NETWORK_EVENT_TYPES, self._on_network_event)
+            except (hou.ObjectWasDeleted, hou.OperationFailed):
+                pass
+
+        self._network_nodes = []
+
+    def _on_hip_file_event(self, event_type):
+        """Called by Houdini when the hip file is loaded, cleared or merged."""
+
+        if event_type in self.HIP_FILE_EVENT_TYPES:
+            self.invalidate()
+
+    def _on_network_event(self, **kwargs):
+        """Called by Houdini when a node is created or deleted in a network.
+
+        Only referencing nodes and networks that can hold them change the
+        index.
+
+        """
+
+        if self._references is None:
+            return
+
+        child = kwargs.get("child_node")
+        try:
+            if (child is not None
+                    and child.type().name() not in self.REFERENCE_PARMS
+                    and not self._is_watched_network(child)):
+                return
+        except hou.ObjectWasDeleted:
+            pass
+
+        self.invalidate()
+
+
+def _eval_path(parm):
+    """Evaluate the path held by a file parm.
+
+    :param hou.Parm parm: The file parm.
+
+    """
+
+    return parm.eval().replace("/", os.path.sep)
@@ -0,0 +1,99 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock
+
+
+class TestBackupSnapshotWriter(unittest.TestCase):
+    def setUp(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python"))
+        import backup_snapshots
+
+        self.app = Mock()
+        self.writer = backup_snapshots.BackupSnapshotWriter(self.app)
+
+        self.folder = tempfile.mkdtemp()
+        self.hip_path = os.path.join(self.folder, "scene.hip")
+        self.backup_path = os.path.join(self.folder, "backup", "scene_v001.hip")
+
+    def tearDown(self):
+        sys.path.pop(0)
+        shutil.rmtree(self.folder)
+
+    def _save(self, content):
+        with open(self.hip_path, "w") as hip_file:
+            hip_file.write(content)
+
+    def _read_backup(self):
+        with open(self.backup_path) as backup_file:
+            return backup_file.read()
+
+    def test_snapshot_taken_at_save(self):
+        """
+        Ensures a backup holds the content saved when the snapshot was taken,
+        even if the file is saved again before it is written.
+        """
+        # hold the writes to the backup path.
+        path_lock = threading.Lock()
+        path_lock.acquire()
+        self.writer._path_locks[self.backup_path] = path_lock
+
+        self._save("first")
+        snapshot = self.writer.snapshot(self.hip_path, self.backup_path)
+        self._save("second")
+
+        path_lock.release()
+        self.assertTrue(snapshot.result(5))
+        self.assertEqual(self._read_backup(), "first")
+
+    def test_unchanged_snapshot_skipped(self):
+        """
+        Ensures an unchanged file is not written again.
+        """
+        self._save("content")
+        self.assertTrue(self.writer.snapshot(self.hip_path, self.backup_path).result(5))
+        self.assertFalse(
+            self.writer.snapshot(self.hip_path, self.backup_path).result(5)
+        )
+
+        self._save("changed")
+        self.assertTrue(self.writer.snapshot(self.hip_path, self.backup_path).result(5))
+        self.assertEqual(self._read_backup(), "changed")
+
+    def test_errors_reported(self):
+        """
+        Ensures snapshot and write errors are raised or logged.
+        """
+        with self.assertRaises(IOError):
+            self.writer.snapshot(self.hip_path, self.backup_path)
+
+        # the backup folder can't be created over a file.
+        self._save("content")
+        with open(os.path.join(self.folder, "backup"), "w"):
+            pass
+
+        snapshot = self.writer.snapshot(self.hip_path, self.backup_path)
+        with self.assertRaises(OSError):
+            self.writer.wait(self.backup_path, 5)
+
+        # the error is logged once the callbacks of the snapshot have run.
+        self.writer._executor.shutdown(wait=True)
+        self.assertTrue(snapshot.done())
+        self.assertEqual(self.app.log_error.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+import time
+import types
+import unittest
+
+
+class OperationFailed(Exception):
+    pass
+
+
+class ParmTemplate(object):
+    def __init__(self, folder_type=None):
+        self._folder_type = folder_type
+
+    def folderType(self):
+        return self._folder_type
+
+
+class FolderSetParmTemplate(ParmTemplate):
+    pass
+
+
+class FolderParmTemplate(ParmTemplate):
+    pass
+
+
+class StringParmTemplate(ParmTemplate):
+    pass
+
+
+class FakeParm(object):
+    def __init__(self, node, name, value, template, keyframes=()):
+        self.node = node
+        self._name = name
+        self.value = value
+        self._template = template
+        self._keyframes = list(keyframes)
+
+    def name(self):
+        return self._name
+
+    def parmTemplate(self):
+        self.node.counts["templates"] += 1
+        return self._template
+
+    def eval(self):
+        return self.value
+
+    def unexpandedString(self):
+        return self.value
+
+    def keyframes(self):
+        return self._keyframes
+
+    def set(self, value):
+        self.node.counts["sets"] += 1
+        if self._name.startswith("lpre") and not isinstance(value, str):
+            raise TypeError("expected a language name")
+        self.value = value
+
+    def setKeyframe(self, key):
+        self._keyframes.append(key)
+
+
+class FakeNode(object):
+    def __init__(self, type_name, parms):
+        self._type_name = type_name
+        self.counts = {"templates": 0, "sets": 0, "set_parms": 0}
+        self._parms = [
+            FakeParm(self, name, value, template, keyframes)
+            for (name, value, template, keyframes) in parms
+        ]
+
+    def type(self):
+        return types.SimpleNamespace(name=lambda: self._type_name)
+
+    def parms(self):
+        return list(self._parms)
+
+    def parm(self, name):
+        for parm in self._parms:
+            if parm.name() == name:
+                return parm
+        return None
+
+    def setParms(self, values):
+        self.counts["set_parms"] += 1
+        for name, value in values.items():
+            if name.startswith("lpre") and not isinstance(value, str):
+                raise TypeError("expected a language name")
+        for name, value in values.items():
+            self.parm(name).value = value
+
+
+def _make_hou():
+    hou = types.ModuleType("hou")
+    hou.OperationFailed = OperationFailed
+    hou.FolderSetParmTemplate = FolderSetParmTemplate
+    hou.FolderParmTemplate = FolderParmTemplate
+    hou.StringParmTemplate = StringParmTemplate
+    hou.folderType = types.SimpleNamespace(
+        MultiparmBlock="MultiparmBlock",
+        ScrollingMultiparmBlock="ScrollingMultiparmBlock",
+        TabbedMultiparmBlock="TabbedMultiparmBlock",
+        Tabs="Tabs",
+    )
+    return hou
+
+
+def _make_parms(count, prefix=""):
+    """
+    Returns the definitions of the parms of a fake output node.
+    """
+    parms = [
+        ("folder", 0, FolderSetParmTemplate(), ()),
+        ("tabs", 0, FolderParmTemplate("Tabs"), ()),
+        ("aovs", 3, FolderParmTemplate("MultiparmBlock"), ()),
+        ("frame", 10, ParmTemplate(), (1, 24)),
+    ]
+    for index in range(count):
+        if index % 2:
+            parms.append(
+                ("str%d" % index, prefix + "$HIP/%d" % index, StringParmTemplate(), ())
+            )
+        else:
+            parms.append(("val%d" % index, index, ParmTemplate(), ()))
+    return parms
+
+
+class TestCopyParmValues(unittest.TestCase):
+    def setUp(self):
+        sys.modules["hou"] = _make_hou()
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python"))
+        for name in list(sys.modules):
+            if name.startswith("parm_values"):
+                del sys.modules[name]
+        import parm_values
+
+        self.parm_values = parm_values
+
+    def tearDown(self):
+        sys.path.pop(0)
+        del sys.modules["hou"]
+
+    def test_copy(self):
+        """
+        Ensures values, multiparm counts and keyframes are copied and folders
+        and excluded parms are skipped.
+        """
+        source = FakeNode("rop_geometry", _make_parms(4, prefix="src"))
+        target = FakeNode(
+            "sgtk_geometry", _make_parms(4) + [("extra", 1, ParmTemplate(), ())]
+        )
+        target.parm("aovs").value = 0
+        target.parm("frame")._keyframes = []
+
+        self.parm_values.copy_parm_values(source, target, excludes=["val2"])
+
+        self.assertEqual(target.parm("aovs").value, 3)
+        self.assertEqual(target.parm("str1").value, "src$HIP/1")
+        self.assertEqual(target.parm("str3").value, "src$HIP/3")
+        self.assertEqual(target.parm("val2").value, 2)
+        self.assertEqual(target.parm("frame").keyframes(), [1, 24])
+        self.assertEqual(target.parm("extra").value, 1)
+        self.assertEqual(target.counts["set_parms"], 1)
+
+    def test_fallback(self):
+        """
+        Ensures values are set one at a time when setParms fails, mapping the
+        script language menu index to its name.
+        """
+        source = FakeNode(
+            "ifd",
+            [("lprerender", 1, ParmTemplate(), ()), ("val", 2, ParmTemplate(), ())],
+        )
+        target = FakeNode(
+            "ifd",
+            [
+                ("lprerender", "hscript", ParmTemplate(), ()),
+                ("val", 0, ParmTemplate(), ()),
+            ],
+        )
+
+        self.parm_values.copy_parm_values(source, target)
+
+        self.assertEqual(target.parm("lprerender").value, "python")
+        self.assertEqual(target.parm("val").value, 2)
+
+    def test_bulk_conversion(self):
+        """
+        Benchmarks converting many nodes: parm templates are only inspected
+        once per node type and each node gets a single setParms call.
+        """
+        parm_count = 200
+        node_count = 100
+        sources = [
+            FakeNode("rop_geometry", _make_parms(parm_count)) for _ in range(node_count)
+        ]
+        targets = [
+            FakeNode("sgtk_geometry", _make_parms(parm_count))
+            for _ in range(node_count)
+        ]
+
+        parm_kinds = {}
+        start_time = time.time()
+        for source, target in zip(sources, targets):
+            self.parm_values.copy_parm_values(source, target, parm_kinds=parm_kinds)
+        elapsed = time.time() - start_time
+
+        inspected = sum(source.counts["templates"] for source in sources)
+        self.assertEqual(inspected, parm_count + 4)
+        for target in targets:
+            self.assertEqual(target.counts["set_parms"], 1)
+            # only the multiparm count is set on its own
+            self.assertEqual(target.counts["sets"], 1)
+
+        sys.stderr.write(
+            "\nCopied %d parms of %d nodes in %.3fs\n"
+            % (parm_count + 4, node_count, elapsed)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
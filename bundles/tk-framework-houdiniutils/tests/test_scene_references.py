@@ -0,0 +1,194 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+import types
+import unittest
+
+
+class ObjectWasDeleted(Exception):
+    pass
+
+
+class FakeParm(object):
+    def __init__(self, value):
+        self.value = value
+        self.deleted = False
+
+    def eval(self):
+        if self.deleted:
+            raise ObjectWasDeleted()
+        # values can be computed, like expressions referencing other nodes.
+        return self.value() if callable(self.value) else self.value
+
+    def evalAsString(self):
+        return str(self.eval())
+
+
+class FakeNode(object):
+    _session_ids = 0
+
+    def __init__(self, type_name, parms=None, category=None, children=()):
+        FakeNode._session_ids += 1
+        self._session_id = FakeNode._session_ids
+        self._type_name = type_name
+        self._parms = dict(
+            (name, FakeParm(value)) for (name, value) in (parms or {}).items()
+        )
+        self._category = category
+        self.children = list(children)
+        self.callbacks = []
+        self.walks = 0
+
+    def type(self):
+        return types.SimpleNamespace(name=lambda: self._type_name)
+
+    def sessionId(self):
+        return self._session_id
+
+    def isNetwork(self):
+        return self._category is not None
+
+    def childTypeCategory(self):
+        return types.SimpleNamespace(name=lambda: self._category)
+
+    def allSubChildren(self, recurse_in_locked_nodes=True):
+        self.walks += 1
+        nodes = []
+        for child in self.children:
+            nodes.append(child)
+            nodes.extend(child.allSubChildren())
+        return nodes
+
+    def parm(self, name):
+        return self._parms.get(name)
+
+    def addEventCallback(self, event_types, callback):
+        self.callbacks.append(callback)
+
+    def removeEventCallback(self, event_types, callback):
+        self.callbacks.remove(callback)
+
+
+def _make_hou():
+    hou = types.ModuleType("hou")
+    hou.ObjectWasDeleted = ObjectWasDeleted
+    hou.OperationFailed = type("OperationFailed", (Exception,), {})
+    hou.nodeEventType = types.SimpleNamespace(
+        ChildCreated="ChildCreated", ChildDeleted="ChildDeleted"
+    )
+    hou.hipFileEventType = types.SimpleNamespace(
+        AfterClear="AfterClear",
+        AfterLoad="AfterLoad",
+        AfterMerge="AfterMerge",
+        AfterSave="AfterSave",
+    )
+    hou.hipFile = types.SimpleNamespace(
+        callbacks=[], addEventCallback=lambda callback: None
+    )
+    hou.nodes = {}
+    hou.node = hou.nodes.get
+    return hou
+
+
+class TestSceneReferenceIndex(unittest.TestCase):
+    def setUp(self):
+        self.hou = _make_hou()
+        sys.modules["hou"] = self.hou
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python"))
+        for name in list(sys.modules):
+            if name.startswith("scene_references"):
+                del sys.modules[name]
+        import scene_references
+
+        self.SceneReferenceIndex = scene_references.SceneReferenceIndex
+
+        self.job = "/job"
+        self.alembic = FakeNode(
+            "alembicarchive", {"fileName": lambda: self.job + "/cache.abc"}
+        )
+        self.file_sop = FakeNode("sgtk_file", {"mode": "read", "file": "/job/geo.bgeo"})
+        self.dopnet = FakeNode("dopnet", category="Dop")
+        self.geo = FakeNode("geo", category="Sop", children=[self.file_sop])
+        self.obj = FakeNode(
+            "obj", category="Object", children=[self.alembic, self.geo, self.dopnet]
+        )
+        self.hou.nodes["/obj"] = self.obj
+
+    def tearDown(self):
+        sys.path.pop(0)
+        del sys.modules["hou"]
+
+    def test_paths_evaluated_on_query(self):
+        """
+        Ensures paths and conditions are evaluated on each query while the
+        scene is only walked once.
+        """
+        index = self.SceneReferenceIndex()
+        self.assertEqual(index.get_references(), [os.path.normpath("/job/cache.abc")])
+
+        # changes that don't send any event are picked up.
+        self.job = "/other_job"
+        self.file_sop.parm("mode").value = "file"
+        self.assertEqual(
+            sorted(index.get_references()),
+            sorted(
+                [
+                    os.path.normpath("/other_job/cache.abc"),
+                    os.path.normpath("/job/geo.bgeo"),
+                ]
+            ),
+        )
+        self.assertEqual(
+            index.get_references(["alembicarchive"]),
+            [os.path.normpath("/other_job/cache.abc")],
+        )
+        self.assertEqual(self.obj.walks, 1)
+
+    def test_network_callbacks(self):
+        """
+        Ensures only the networks holding referencing nodes are watched and
+        only relevant nodes cause the scene to be walked again.
+        """
+        index = self.SceneReferenceIndex()
+        index.get_references()
+
+        self.assertEqual(len(self.obj.callbacks), 1)
+        self.assertEqual(len(self.geo.callbacks), 1)
+        self.assertEqual(self.dopnet.callbacks, [])
+
+        callback = self.obj.callbacks[0]
+        callback(event_type="ChildCreated", node=self.obj, child_node=FakeNode("null"))
+        index.get_references()
+        self.assertEqual(self.obj.walks, 1)
+
+        abc_cam = FakeNode("abc_cam", {"abcFile": "/job/cam.abc"})
+        self.obj.children.append(abc_cam)
+        callback(event_type="ChildCreated", node=self.obj, child_node=abc_cam)
+        self.assertIn(os.path.normpath("/job/cam.abc"), index.get_references())
+        self.assertEqual(self.obj.walks, 2)
+
+        # callbacks are not added twice when walking again.
+        self.assertEqual(len(self.obj.callbacks), 1)
+
+    def test_deleted_node(self):
+        """
+        Ensures deleted nodes are dropped from the index.
+        """
+        index = self.SceneReferenceIndex()
+        index.get_references()
+
+        self.alembic._parms["fileName"].deleted = True
+        self.assertEqual(index.get_references(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,7 @@
 import base64
 import os
 import sys
+import time
 import zlib
 
 from sgtk.util import pickle
@@ -22,6 +23,8 @@ import hou
 # toolkit
 import sgtk
 
+parm_values = sgtk.platform.import_framework("tk-framework-houdiniutils", "parm_values")
+
 
 class TkAlembicNodeHandler(object):
     """Handle Tk Alembic node operations and callbacks."""
@@ -100,8 +103,15 @@ class TkAlembicNodeHandler(object):
         tk_node_type = TkAlembicNodeHandler.TK_ALEMBIC_NODE_TYPE
 
         # iterate over all the alembic nodes and attempt to convert them
+        # the parm templates of each node type are only inspected once for
+        # all the nodes being converted
+        parm_kinds = {}
+        start_time = time.time()
+
         for alembic_node in alembic_nodes:
 
+            node_start_time = time.time()
+
             # get the user data dictionary stored on the node
             user_dict = alembic_node.userDataDict()
 
@@ -135,8 +145,11 @@ class TkAlembicNodeHandler(object):
                 )
 
             # copy over all parameter values except the output path
-            _copy_parm_values(
-                alembic_node, tk_alembic_node, excludes=[cls.NODE_OUTPUT_PATH_PARM]
+            parm_values.copy_parm_values(
+                alembic_node,
+                tk_alembic_node,
+                excludes=[cls.NODE_OUTPUT_PATH_PARM],
+                parm_kinds=parm_kinds,
             )
 
             # copy the inputs and move the outputs
@@ -166,10 +179,15 @@ class TkAlembicNodeHandler(object):
             tk_alembic_node.setPosition(alembic_node_pos)
 
             app.log_debug(
-                "Converted: Alembic node '%s' to TK Alembic node."
-                % (alembic_node_name,)
+                "Converted: Alembic node '%s' to TK Alembic node. (%.3fs)"
+                % (alembic_node_name, time.time() - node_start_time)
             )
 
+        app.log_debug(
+            "Converted %d nodes in %.3fs"
+            % (len(alembic_nodes), time.time() - start_time)
+        )
+
     @classmethod
     def convert_to_regular_alembic_nodes(cls, app):
         """Convert Toolkit Alembic nodes to regular Alembic nodes.
@@ -202,8 +220,15 @@ class TkAlembicNodeHandler(object):
             return
 
         # iterate over all the tk alembic nodes and attempt to convert them
+        # the parm templates of each node type are only inspected once for
+        # all the nodes being converted
+        parm_kinds = {}
+        start_time = time.time()
+
         for tk_alembic_node in tk_alembic_nodes:
 
+            node_start_time = time.time()
+
             # determine the corresponding, built-in operator type
             if tk_alembic_node.type() == sop_type:
                 alembic_operator = cls.HOU_SOP_ALEMBIC_TYPE
@@ -226,8 +251,11 @@ class TkAlembicNodeHandler(object):
             alembic_node.parm(cls.NODE_OUTPUT_PATH_PARM).set(filename)
 
             # copy across knob values
-            _copy_parm_values(
-                tk_alembic_node, alembic_node, excludes=[cls.NODE_OUTPUT_PATH_PARM]
+            parm_values.copy_parm_values(
+                tk_alembic_node,
+                alembic_node,
+                excludes=[cls.NODE_OUTPUT_PATH_PARM],
+                parm_kinds=parm_kinds,
             )
 
             # store the alembic output profile name in the user data so that we
@@ -263,10 +291,15 @@ class TkAlembicNodeHandler(object):
             alembic_node.setPosition(tk_alembic_node_pos)
 
             app.log_debug(
-                "Converted: Tk Alembic node '%s' to Alembic node."
-                % (tk_alembic_node_name,)
+                "Converted: Tk Alembic node '%s' to Alembic node. (%.3fs)"
+                % (tk_alembic_node_name, time.time() - node_start_time)
             )
 
+        app.log_debug(
+            "Converted %d nodes in %.3fs"
+            % (len(tk_alembic_nodes), time.time() - start_time)
+        )
+
     @classmethod
     def get_all_tk_alembic_nodes(cls):
         """
@@ -628,59 +661,6 @@ def _copy_inputs(source_node, target_node):
         target_node.setInput(connection.inputIndex(), connection.inputNode())
 
 
-# Copy parameter values of the source node to those of the target node if a
-# parameter with the same name exists.
-def _copy_parm_values(source_node, target_node, excludes=None):
-
-    if not excludes:
-        excludes = []
-
-    # build a parameter list from the source node, ignoring the excludes
-    source_parms = [parm for parm in source_node.parms() if parm.name() not in excludes]
-
-    for source_parm in source_parms:
-
-        source_parm_template = source_parm.parmTemplate()
-
-        # skip folder parms
-        if isinstance(source_parm_template, hou.FolderSetParmTemplate):
-            continue
-
-        target_parm = target_node.parm(source_parm.name())
-
-        # if the parm on the target node doesn't exist, skip it
-        if target_parm is None:
-            continue
-
-        # if we have keys/expressions we need to copy them all.
-        if source_parm.keyframes():
-            for key in source_parm.keyframes():
-                target_parm.setKeyframe(key)
-        else:
-            # if the parameter is a string, copy the raw string.
-            if isinstance(source_parm_template, hou.StringParmTemplate):
-                target_parm.set(source_parm.unexpandedString())
-            # copy the evaluated value
-            else:
-                try:
-                    target_parm.set(source_parm.eval())
-                except TypeError:
-                    # The pre- and post-script type comboboxes changed sometime around
-                    # 16.5.439 to being string type parms that take the name of the language
-                    # (hscript or python) instead of an integer index of the combobox item
-                    # that's selected. To support both, we try the old way (which is how our
-                    # otl is setup to work), and if that fails we then fall back on mapping
-                    # the integer index from our otl's parm over to the string language name
-                    # that the alembic node is expecting.
-                    if source_parm.name().startswith(
-                        "lpre"
-                    ) or source_parm.name().startswith("lpost"):
-                        value_map = ["hscript", "python"]
-                        target_parm.set(value_map[source_parm.eval()])
-                    else:
-                        raise
-
-
 # return the menu label for the supplied parameter
 def _get_output_menu_label(parm):
     if parm.menuItems()[parm.eval()] == "sgtk":
@@ -12,7 +12,7 @@
 import os
 import sys
 import re
-import shutil
+import time
 
 # houdini
 import hou
@@ -20,6 +20,15 @@ import hou
 # toolkit
 import sgtk
 
+from .publish_registrar import PublishRegistrar
+
+backup_snapshots = sgtk.platform.import_framework(
+    "tk-framework-houdiniutils", "backup_snapshots")
+parm_values = sgtk.platform.import_framework(
+    "tk-framework-houdiniutils", "parm_values")
+scene_references = sgtk.platform.import_framework(
+    "tk-framework-houdiniutils", "scene_references")
+
 
 class TkArnoldNodeHandler(object):
     """Handle Tk Arnold node operations and callbacks."""
@@ -85,6 +94,9 @@ class TkArnoldNodeHandler(object):
     TK_DEFAULT_AOV = "RGBA"
     """Default aov used to create template."""
 
+    TK_DEPENDENCY_NODE_TYPES = ["arnold_procedural", "arnold_volume"]
+    """Types of the nodes whose files are published as render dependencies."""
+
     ############################################################################
     # Class methods
 
@@ -107,9 +119,14 @@ class TkArnoldNodeHandler(object):
             app.log_debug("No Arnold Nodes found for conversion.")
             return
         
+        parm_kinds = {}
+        start_time = time.time()
+
         # iterate over all the arnold nodes and attempt to convert them
         for arnold_node in arnold_nodes:
 
+            node_start_time = time.time()
+
             # get the user data dictionary stored on the node
             user_dict = arnold_node.userDataDict()
 
@@ -142,7 +159,8 @@ class TkArnoldNodeHandler(object):
                     (tk_output_profile_name,))
 
             # copy over all parameter values except the output path 
-            _copy_parm_values(arnold_node, tk_arnold_node, excludes=[])
+            parm_values.copy_parm_values(arnold_node, tk_arnold_node, excludes=[],
+                parm_kinds=parm_kinds)
 
             # explicitly copy AOV settings to the new tk arnold node
             plane_numbers = _get_extra_plane_numbers(arnold_node)
@@ -167,8 +185,13 @@ class TkArnoldNodeHandler(object):
             tk_arnold_node.setName(arnold_node_name)
             tk_arnold_node.setPosition(arnold_node_pos)
 
-            app.log_debug("Converted: Arnold node '%s' to TK Arnold node."
-                % (arnold_node_name,))
+            app.log_debug(
+                "Converted: Arnold node '%s' to TK Arnold node. (%.3fs)"
+                % (arnold_node_name, time.time() - node_start_time)
+            )
+
+        app.log_debug("Converted %d nodes in %.3fs" %
+            (len(arnold_nodes), time.time() - start_time))
 
     @classmethod
     def convert_to_regular_arnold_nodes(cls, app):
@@ -187,17 +210,22 @@ class TkArnoldNodeHandler(object):
             app.log_debug("No Toolkit Arnold Nodes found for conversion.")
             return
 
+        parm_kinds = {}
+        start_time = time.time()
+
         for tk_arnold_node in tk_arnold_nodes:
 
+            node_start_time = time.time()
+
             # create a new, regular Arnold node
             arnold_node = tk_arnold_node.parent().createNode(
                 cls.HOU_ARNOLD_NODE_TYPE)
 
             # copy across knob values
-            exclude_parms = [parm for parm in tk_arnold_node.parms() 
+            exclude_parms = [parm.name() for parm in tk_arnold_node.parms()
                 if parm.name().startswith("sgtk_")]
-            _copy_parm_values(tk_arnold_node, arnold_node,
-                excludes=exclude_parms)
+            parm_values.copy_parm_values(tk_arnold_node, arnold_node,
+                excludes=exclude_parms, parm_kinds=parm_kinds)
 
             # store the arnold output profile name in the user data so that we
             # can retrieve it later.
@@ -231,8 +259,13 @@ class TkArnoldNodeHandler(object):
             arnold_node.setName(tk_arnold_node_name)
             arnold_node.setPosition(tk_arnold_node_pos)
 
-            app.log_debug("Converted: Tk Arnold node '%s' to Arnold node."
-                % (tk_arnold_node_name,))
+            app.log_debug(
+                "Converted: Tk Arnold node '%s' to Arnold node. (%.3fs)"
+                % (tk_arnold_node_name, time.time() - node_start_time)
+            )
+
+        app.log_debug("Converted %d nodes in %.3fs" %
+            (len(tk_arnold_nodes), time.time() - start_time))
 
     @classmethod
     def get_all_tk_arnold_nodes(cls):
@@ -285,6 +318,28 @@ class TkArnoldNodeHandler(object):
             self._app.log_debug("Caching arnold output profile: '%s'" % 
                 (output_profile_name,))
 
+        # index of the files referenced in the scene, used as dependencies
+        self._scene_references = scene_references.SceneReferenceIndex()
+
+        # writes the backup hip files in the background
+        self._backup_snapshots = backup_snapshots.BackupSnapshotWriter(self._app)
+
+        # the template inputs and resulting path last set on each output path
+        # parm, keyed by node session id and parm name. Used to only recompute
+        # the paths whose inputs changed. Entries are dropped when their node
+        # is deleted or the scene is cleared.
+        self._synced_paths = {}
+        hou.hipFile.addEventCallback(self._on_hip_file_event)
+
+        # fields of the current hip file, stored with the path they were
+        # extracted from
+        self._hipfile_fields = (None, {})
+
+        # context fields of the output templates, keyed by template name and
+        # stored with the context they were computed for
+        self._context_fields = {}
+        self._context_fields_context = None
+
 
     ############################################################################
     # methods and callbacks executed via the OTL
@@ -369,8 +424,13 @@ class TkArnoldNodeHandler(object):
         if node.name().startswith("original0"):
             return
 
+        start_time = time.time()
+        updated_count = 0
+        checked_count = 0
+
         for (parm_name, template_name) in self.TK_RENDER_TEMPLATE_MAPPING.items():
-            self._compute_and_set(node, parm_name, template_name)
+            updated_count += self._compute_and_set(node, parm_name, template_name)
+            checked_count += 1
 
         # Extra Image Planes / AOVs
         plane_numbers = _get_extra_plane_numbers(node)
@@ -384,24 +444,32 @@ class TkArnoldNodeHandler(object):
                     parm_name = parm_name.replace("#", str(plane_number))
                     aov_name = node.parm(
                         self.TK_EXTRA_PLANES_NAME % (plane_number,)).eval()
-                    self._compute_and_set(node, parm_name, template_name,
-                        aov_name)
+                    updated_count += self._compute_and_set(node, parm_name,
+                        template_name, aov_name)
+                    checked_count += 1
 
         # set the output paths
         path = node.parm(self.NODE_OUTPUT_PATH_PARM).unexpandedString()
-        node.parm("sgtk_ar_picture").set(path)
-        node.parm("ar_picture").set(path)
+        _set_parm_if_changed(node.parm("sgtk_ar_picture"), path)
+        _set_parm_if_changed(node.parm("ar_picture"), path)
         publish_template_parm = node.parm("publish_template")
         if node.parm("ar_ass_export_enable").evalAsInt() == 1:
             ass = True
         else:
             ass = False
-        publish_template_parm.lock(False)
-        publish_template_parm.set(self.get_publish_template(node, ass=ass))
-        publish_template_parm.lock(True)
+        publish_template = self.get_publish_template(node, ass=ass)
+        if publish_template_parm.unexpandedString() != publish_template:
+            publish_template_parm.lock(False)
+            publish_template_parm.set(publish_template)
+            publish_template_parm.lock(True)
 
         self.update_parms(node)
 
+        self._app.log_debug(
+            "Synced render paths of %s: %d of %d updated in %.4fs" %
+            (node.name(), updated_count, checked_count, time.time() - start_time)
+        )
+
 
     def set_profile(self, node=None, reset=False):
         """Apply the selected profile in the session.
@@ -530,9 +598,9 @@ class TkArnoldNodeHandler(object):
         if not node:
             node = hou.pwd()
 
-        # copies the value of one parm to another
-        copy_parm = lambda p1, p2: \
-            node.parm(p2).set(node.parm(p1).unexpandedString())
+        # copies the value of one parm to another, if it differs
+        copy_parm = lambda p1, p2: _set_parm_if_changed(
+            node.parm(p2), node.parm(p1).unexpandedString())
 
         # copy the default udpate parms
         for parm1, parm2 in self.TK_DEFAULT_UPDATE_PARM_MAPPING.items():
@@ -574,17 +642,15 @@ class TkArnoldNodeHandler(object):
     # write backup file
     def create_backup_file(self, node):
         backup_path = self._compute_backup_output_path(node)
-        
-        # Create dir if it doesn't exist
-        backup_dir_path = os.path.dirname(backup_path)
-        if not os.path.exists(backup_dir_path):
-            os.makedirs(backup_dir_path)
 
         # write backup hip
         hou.hipFile.save(file_name=None, save_to_recent_files=True)
 
-        shutil.copy2(hou.hipFile.path(), backup_path)
-        self._app.log_debug("Created backup file for %s" % node.name())
+        # the saved hip file is snapshotted now and copied to the backup
+        # location in the background. auto_publish waits for the copy before
+        # registering the backup file, failed copies are logged as errors.
+        self._backup_snapshots.snapshot(hou.hipFile.path(), backup_path)
+        self._app.log_debug("Submitted backup file for %s" % node.name())
 
     def auto_publish(self, node):
         # Recalculate all render passes
@@ -598,33 +664,26 @@ class TkArnoldNodeHandler(object):
         
         if len(publishes.keys()) == 0:
             # get caches in scene, only standins and aivolumes as it is a render
-            refs = []
-            for n in hou.node("/obj").allSubChildren(recurse_in_locked_nodes=False):
-                if n.type().name() in ['arnold_procedural', 'arnold_volume']:
-                    hou_path = n.parm("ar_filename").eval().replace("/", os.path.sep)
-
-                    if hou_path:
-                        refs.append(hou_path)
+            refs = self._scene_references.get_references(
+                self.TK_DEPENDENCY_NODE_TYPES)
 
             version = node.parm('ver').evalAsInt()
+            # registers the backup, beauty and aov publishes in batches
+            registrar = PublishRegistrar(self._app)
 
             # Publish backup hip file
             backup_path = self._compute_backup_output_path(node)
-            sgtk.util.register_publish(self._app.sgtk, self._app.context, backup_path, node.name(), published_file_type="Backup File", version_number=version, dependency_paths=refs, created_by=self._app.context.user)
+            self._backup_snapshots.wait(backup_path)
+            registrar.add(backup_path, node.name(), "Backup File", version, dependency_paths=refs)
 
             # Publish beauty
-            sgtk.util.register_publish(self._app.sgtk, self._app.context, cache_path, node.name(), published_file_type="Rendered Image Beauty", version_number=version, dependency_paths=[backup_path], created_by=self._app.context.user)
+            registrar.add(cache_path, node.name(), "Rendered Image Beauty", version, dependency_paths=[backup_path])
 
             # Publish render passes
-            for parm in node.parm('ar_aovs').multiParmInstances():
-                if 'sgtk_ar_aov_separate_file' in parm.name():
-                    index = re.findall(r'\d+', parm.name())[-1]
+            for path in self._get_aov_publish_paths(node):
+                registrar.add(path, node.name(), "Rendered Image AOV", version, dependency_paths=[backup_path])
 
-                    if node.parm('ar_enable_aov{}'.format(index)).evalAsInt() \
-                        and node.parm('ar_aov_label{}'.format(index)).evalAsString()\
-                        and node.parm('ar_aov_separate{}'.format(index)).evalAsInt():
-                        path = parm.evalAsString()
-                        sgtk.util.register_publish(self._app.sgtk, self._app.context, path, node.name(), published_file_type="Rendered Image AOV", version_number=version, dependency_paths=[backup_path], created_by=self._app.context.user)
+            registrar.register()
 
     def auto_version(self, node):
         # get relevant fields from the current file path
@@ -680,6 +739,25 @@ class TkArnoldNodeHandler(object):
     ############################################################################
     # Private methods
 
+    def _get_aov_publish_paths(self, node):
+        """Return the output paths of the enabled, separately written AOVs.
+
+        :param hou.Node node: The node being acted upon.
+
+        """
+
+        paths = []
+        for parm in node.parm(self.TK_EXTRA_PLANE_COUNT_PARM).multiParmInstances():
+            if 'sgtk_ar_aov_separate_file' in parm.name():
+                index = re.findall(r'\d+', parm.name())[-1]
+
+                if node.parm('ar_enable_aov{}'.format(index)).evalAsInt() \
+                    and node.parm('ar_aov_label{}'.format(index)).evalAsString()\
+                    and node.parm('ar_aov_separate{}'.format(index)).evalAsInt():
+                    paths.append(parm.evalAsString())
+
+        return paths
+
     def _compute_and_set(self, node, parm_name, template_name, aov_name=None):
         """Compute and set and output path for the supplied parm.
         
@@ -687,20 +765,60 @@ class TkArnoldNodeHandler(object):
         :param str parm_name: The name of the parameter to set.
         :param str template_name: The template to compute as the output path.
         :param str aov_name: Optional AOV name used during comput of path.
+
+        The path is only recomputed if the template or its fields changed
+        since the parm was last set.
+
+        :return: True if the parm was set, False if it was up to date.
         
         """
         if node.parm("trange").evalAsInt()!=0 and template_name == "output_ass_template":
             template_name = "output_ass_seq_template"
+
+        parm = node.parm(parm_name)
+        node_paths = self._synced_paths.get(node.sessionId())
+        if node_paths is None:
+            node_paths = self._synced_paths[node.sessionId()] = {}
+            node.addEventCallback(
+                (hou.nodeEventType.BeingDeleted,), self._on_node_deleted)
+
         try:
-            path = self._compute_output_path(node, template_name, aov_name)
+            (output_template, fields) = self._get_output_fields(
+                node, template_name, aov_name)
+            inputs = (output_template.name, tuple(sorted(fields.items())))
+
+            synced = node_paths.get(parm_name)
+            if (synced and synced[0] == inputs
+                and parm.unexpandedString() == synced[1]):
+                return False
+
+            path = output_template.apply_fields(fields)
+            path = path.replace(os.path.sep, "/")
+            node_paths[parm_name] = (inputs, path)
         except sgtk.TankError as err:
             self._app.log_warning("%s: %s" % (node.name(), err))
             path = "ERROR: %s" % (err,)
+            node_paths.pop(parm_name, None)
 
         # Unlock, set, lock
-        node.parm(parm_name).lock(False)
-        node.parm(parm_name).set(path)
-        node.parm(parm_name).lock(True)
+        parm.lock(False)
+        parm.set(path)
+        parm.lock(True)
+
+        return True
+
+
+    def _on_node_deleted(self, **kwargs):
+        """Called by Houdini when a node with synced paths is deleted."""
+
+        self._synced_paths.pop(kwargs["node"].sessionId(), None)
+
+
+    def _on_hip_file_event(self, event_type):
+        """Called by Houdini when the hip file is loaded, cleared or saved."""
+
+        if event_type == hou.hipFileEventType.AfterClear:
+            self._synced_paths = {}
 
 
     # compute the output path based on the current work file and backup template
@@ -744,6 +862,24 @@ class TkArnoldNodeHandler(object):
 
         """
 
+        (output_template, fields) = self._get_output_fields(
+            node, template_name, aov_name)
+
+        path = output_template.apply_fields(fields)
+        path = path.replace(os.path.sep, "/")
+
+        return path
+
+
+    def _get_output_fields(self, node, template_name, aov_name=None):
+        """Return the render template and the fields to compute a path with.
+
+        :param hou.Node node: The node being acted upon.
+        :param str template_name: The name of template to compute a path for.
+        :param str aov_name: Optional AOV name used to compute the path.
+
+        """
+
         # Get relevant fields from the scene filename and contents
         work_file_fields = self._get_hipfile_fields()
 
@@ -776,12 +912,30 @@ class TkArnoldNodeHandler(object):
         if aov_name:
             fields["aov_name"] = aov_name
 
-        fields.update(self._app.context.as_template_fields(output_template))
+        fields.update(self._get_context_fields(output_template))
 
-        path = output_template.apply_fields(fields)
-        path = path.replace(os.path.sep, "/")
+        return (output_template, fields)
 
-        return path
+
+    def _get_context_fields(self, template):
+        """Return the fields of the current context for the supplied template.
+
+        :param template: The template to get the context fields of.
+
+        The fields are cached until the context changes.
+
+        """
+
+        context = self._app.context
+        if context is not self._context_fields_context:
+            self._context_fields = {}
+            self._context_fields_context = context
+
+        if template.name not in self._context_fields:
+            self._context_fields[template.name] = \
+                context.as_template_fields(template)
+
+        return self._context_fields[template.name]
 
 
     def _get_output_profile(self, node=None):
@@ -814,13 +968,20 @@ class TkArnoldNodeHandler(object):
             else:
                 self._app.log_error('Could not find origin hip file!')
 
+        # the fields only change with the hip file path
+        (cached_path, work_fields) = self._hipfile_fields
+        if current_file_path == cached_path:
+            return dict(work_fields)
+
         work_fields = {}
         work_file_template = self._app.get_template("work_file_template")
         if (work_file_template and 
             work_file_template.validate(current_file_path)):
             work_fields = work_file_template.get_fields(current_file_path)
 
-        return work_fields
+        self._hipfile_fields = (current_file_path, work_fields)
+
+        return dict(work_fields)
 
 
     def _get_render_path(self, node):
@@ -888,61 +1049,19 @@ def _copy_inputs(source_node, target_node):
             connection.inputNode())
 
 
-def _copy_parm_values(source_node, target_node, excludes=None):
-    """Copy matching parameter values from source node to target node.
+def _set_parm_if_changed(parm, value):
+    """Set the value of a parm, unless it already has that value.
 
-    :param hou.Node source_node: Soure node with parm values to copy.
-    :param hou.Node target_node: Target node to receive the copied parm values.
-    :parm list excludes: List of parm names to exclude during copy.
+    :param hou.Parm parm: The parm to set.
+    :param str value: The raw string value to set.
 
-    """
+    Avoids triggering the callbacks and dependencies of the parm when nothing
+    changed.
 
-    if not excludes:
-        excludes = []
-
-    # build a parameter list from the source node, ignoring the excludes
-    source_parms = [
-        parm for parm in source_node.parms() if parm.name() not in excludes]
-
-    for source_parm in source_parms:
-
-        source_parm_template = source_parm.parmTemplate()
-
-        # skip folder parms
-        if isinstance(source_parm_template, hou.FolderSetParmTemplate):
-            continue
-
-        target_parm = target_node.parm(source_parm.name())
-
-        # if the parm on the target node doesn't exist, skip it
-        if target_parm is None:
-            continue
+    """
 
-        # if we have keys/expressions we need to copy them all.
-        if source_parm.keyframes():
-            for key in source_parm.keyframes():
-                target_parm.setKeyframe(key)
-        else:
-            # if the parameter is a string, copy the raw string.
-            if isinstance(source_parm_template, hou.StringParmTemplate):
-                target_parm.set(source_parm.unexpandedString())
-            # copy the evaluated value
-            else:
-                try:
-                    target_parm.set(source_parm.eval())
-                except TypeError:
-                    # The pre- and post-script type comboboxes changed sometime around
-                    # 16.5.439 to being string type parms that take the name of the language
-                    # (hscript or python) instead of an integer index of the combobox item
-                    # that's selected. To support both, we try the old way (which is how our
-                    # otl is setup to work), and if that fails we then fall back on mapping
-                    # the integer index from our otl's parm over to the string language name
-                    # that the arnold node is expecting.
-                    if source_parm.name().startswith("lpre") or source_parm.name().startswith("lpost"):
-                        value_map = ["hscript", "python"]
-                        target_parm.set(value_map[source_parm.eval()])
-                    else:
-                        raise
+    if parm.unexpandedString() != value:
+        parm.set(value)
 
 def _get_extra_plane_numbers(node):
     """Return a list of aov plane nubmers.
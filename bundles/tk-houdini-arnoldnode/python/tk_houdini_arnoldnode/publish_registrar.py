@@ -0,0 +1,243 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+# built-ins
+import os
+import time
+
+# toolkit
+import sgtk
+
+
+class PublishRegistrar(object):
+    """Register a set of related publishes in batched Shotgun requests.
+
+    Publishes are queued with :meth:`add` and submitted together by
+    :meth:`register`. All PublishedFile records are created in a single batch
+    transaction, followed by a single batch creating the dependency links
+    between them, instead of a separate ``sgtk.util.register_publish`` call
+    (and its round-trips) per file.
+
+    The data of each PublishedFile is still built by
+    ``sgtk.util.register_publish``, as a dry run, so the publishes get the
+    same path cache, entity and task fields as a regular registration.
+
+    A registrar is meant to be used for a single set of publishes. The queue
+    is emptied by :meth:`register`, even when the registration fails.
+    """
+
+    def __init__(self, app):
+        """Initialize the registrar.
+
+        :param app: The calling Toolkit Application.
+
+        """
+
+        self._app = app
+        self._pending = []
+
+        # cache of published file type entities, keyed by type name
+        self._publish_types = {}
+
+    def add(self, path, name, published_file_type, version_number,
+        dependency_paths=None):
+        """Queue a publish for registration.
+
+        :param str path: The path to publish.
+        :param str name: The name of the publish.
+        :param str published_file_type: The published file type name.
+        :param int version_number: The version of the publish.
+        :param list dependency_paths: Paths this publish depends on. These can
+            be paths queued in this registrar or paths already published.
+
+        """
+
+        self._pending.append({
+            "path": path,
+            "name": name,
+            "published_file_type": published_file_type,
+            "version_number": version_number,
+            "dependency_paths": dependency_paths or [],
+        })
+
+    def register(self):
+        """Register all the queued publishes.
+
+        Publishes whose data can not be built are skipped and reported
+        instead of failing the whole registration.
+
+        :return: The created PublishedFile entities.
+        :rtype: list of dict
+
+        """
+
+        try:
+            return self._register(self._pending)
+        finally:
+            self._pending = []
+
+    def _register(self, pending):
+        """Register the supplied queued publishes.
+
+        :param list pending: The queued publishes.
+
+        """
+
+        if not pending:
+            return []
+
+        start_time = time.time()
+        failures = []
+
+        # build all the publish payloads up front
+        batch_data = []
+        registered = []
+        for publish in pending:
+            try:
+                data = self._get_publish_data(publish)
+            except Exception as e:
+                failures.append((publish["path"], e))
+                continue
+
+            batch_data.append({
+                "request_type": "create",
+                "entity_type": "PublishedFile",
+                "data": data,
+            })
+            registered.append(publish)
+
+        publishes = []
+        if batch_data:
+            try:
+                publishes = self._app.shotgun.batch(batch_data)
+            except Exception as e:
+                # the batch is a single transaction, none of the publishes
+                # were created.
+                failures.extend(
+                    (publish["path"], e) for publish in registered)
+                registered = []
+
+        # dependencies can reference the publishes just created as well as
+        # existing publishes, which are looked up in a single query.
+        publishes_by_path = {}
+        for (publish, sg_publish) in zip(registered, publishes):
+            publishes_by_path[_normalize_path(publish["path"])] = sg_publish
+
+        external_paths = set()
+        for publish in registered:
+            for path in publish["dependency_paths"]:
+                if _normalize_path(path) not in publishes_by_path:
+                    external_paths.add(path)
+
+        if external_paths:
+            for (path, sg_publish) in sgtk.util.find_publish(
+                    self._app.sgtk, list(external_paths)).items():
+                publishes_by_path[_normalize_path(path)] = sg_publish
+
+        dependency_data = []
+        for (publish, sg_publish) in zip(registered, publishes):
+            for path in publish["dependency_paths"]:
+                dependency = publishes_by_path.get(_normalize_path(path))
+                if not dependency:
+                    self._app.log_debug(
+                        "Skipping unpublished dependency '%s' of '%s'." %
+                        (path, publish["path"]))
+                    continue
+
+                dependency_data.append({
+                    "request_type": "create",
+                    "entity_type": "PublishedFileDependency",
+                    "data": {
+                        "published_file": {
+                            "type": "PublishedFile", "id": sg_publish["id"]},
+                        "dependent_published_file": {
+                            "type": "PublishedFile", "id": dependency["id"]},
+                    },
+                })
+
+        if dependency_data:
+            try:
+                self._app.shotgun.batch(dependency_data)
+            except Exception as e:
+                failures.append(("dependency links", e))
+                dependency_data = []
+
+        self._app.log_debug(
+            "Registered %d of %d publishes with %d dependencies in %.2fs." %
+            (len(publishes), len(pending), len(dependency_data),
+             time.time() - start_time)
+        )
+
+        for (path, error) in failures:
+            self._app.log_warning(
+                "Failed to register publish for '%s': %s" % (path, error))
+
+        return publishes
+
+    def _get_publish_data(self, publish):
+        """Build the PublishedFile creation data for a queued publish.
+
+        :param dict publish: The queued publish.
+
+        """
+
+        path = publish["path"]
+        if not path:
+            raise sgtk.TankError("No path to publish.")
+
+        context = self._app.context
+
+        # let tk-core build the data, without creating anything. The type is
+        # set afterwards from the cached types, since tk-core looks it up for
+        # every publish.
+        data = sgtk.util.register_publish(
+            self._app.sgtk,
+            context,
+            path,
+            publish["name"],
+            publish["version_number"],
+            created_by=context.user,
+            dry_run=True,
+        )
+        data.pop("type", None)
+
+        data["published_file_type"] = self._get_publish_type(
+            publish["published_file_type"])
+
+        return data
+
+    def _get_publish_type(self, type_name):
+        """Return the published file type entity for the supplied name.
+
+        The type is created if it doesn't exist yet.
+
+        :param str type_name: The published file type name.
+
+        """
+
+        if type_name not in self._publish_types:
+            filters = [["code", "is", type_name]]
+            publish_type = self._app.shotgun.find_one(
+                "PublishedFileType", filters)
+
+            if not publish_type:
+                publish_type = self._app.shotgun.create(
+                    "PublishedFileType", {"code": type_name})
+
+            self._publish_types[type_name] = {
+                "type": "PublishedFileType", "id": publish_type["id"]}
+
+        return self._publish_types[type_name]
+
+
+def _normalize_path(path):
+    """Normalize a path for comparison."""
+
+    return os.path.normcase(os.path.normpath(path))
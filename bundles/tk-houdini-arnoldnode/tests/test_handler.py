@@ -0,0 +1,208 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import importlib
+import os
+import sys
+import types
+import unittest
+
+PACKAGE_NAME = "tk_houdini_arnoldnode"
+PACKAGE_PATH = os.path.join(os.path.dirname(__file__), "..", "python", PACKAGE_NAME)
+
+
+class FakeParm(object):
+    def __init__(self, value):
+        self.value = value
+        self.sets = 0
+
+    def eval(self):
+        return self.value
+
+    def evalAsInt(self):
+        return int(self.value)
+
+    def evalAsString(self):
+        return str(self.value)
+
+    def unexpandedString(self):
+        return self.value
+
+    def set(self, value):
+        self.sets += 1
+        self.value = value
+
+    def lock(self, locked):
+        pass
+
+    def menuLabels(self):
+        return ["Arnold"]
+
+
+class FakeNode(object):
+    def __init__(self, name, **parms):
+        self._name = name
+        self._parms = dict((key, FakeParm(value)) for key, value in parms.items())
+        self.callbacks = []
+
+    def name(self):
+        return self._name
+
+    def sessionId(self):
+        return id(self)
+
+    def parm(self, name):
+        return self._parms.get(name)
+
+    def addEventCallback(self, event_types, callback):
+        self.callbacks.append((event_types, callback))
+
+
+class FakeTemplate(object):
+    def __init__(self, name):
+        self.name = name
+        self.applied = 0
+
+    def apply_fields(self, fields):
+        self.applied += 1
+        return "/renders/%(RenderLayer)s/v%(version)03d/%(aov_name)s.exr" % fields
+
+
+class FakeApp(object):
+    def __init__(self, template):
+        self.template = template
+        self.context = types.SimpleNamespace(as_template_fields=lambda template: {})
+
+    def get_setting(self, name, default=None):
+        return [{"name": "Arnold", "output_render_template": "render"}]
+
+    def get_template(self, name):
+        return types.SimpleNamespace(
+            validate=lambda path: True, get_fields=lambda path: {"name": "shot"}
+        )
+
+    def get_template_by_name(self, name):
+        return self.template
+
+    def log_debug(self, message):
+        pass
+
+    def log_warning(self, message):
+        pass
+
+
+def _make_hou():
+    hou = types.ModuleType("hou")
+    hou.nodeEventType = types.SimpleNamespace(BeingDeleted="BeingDeleted")
+    hou.hipFileEventType = types.SimpleNamespace(AfterClear="AfterClear")
+    hou.hipFile = types.SimpleNamespace(
+        path=lambda: "/work/shot.hip", addEventCallback=lambda callback: None
+    )
+    hou.isUIAvailable = lambda: True
+    return hou
+
+
+def _make_sgtk():
+    sgtk = types.ModuleType("sgtk")
+    sgtk.TankError = type("TankError", (Exception,), {})
+    frameworks = {
+        "backup_snapshots": types.SimpleNamespace(
+            BackupSnapshotWriter=lambda app: None
+        ),
+        "scene_references": types.SimpleNamespace(SceneReferenceIndex=lambda: None),
+        "parm_values": types.SimpleNamespace(),
+    }
+    sgtk.platform = types.SimpleNamespace(
+        import_framework=lambda name, module: frameworks[module]
+    )
+    return sgtk
+
+
+class TestComputeAndSet(unittest.TestCase):
+    def setUp(self):
+        self.modules = dict(sys.modules)
+        sys.modules["hou"] = _make_hou()
+        sys.modules["sgtk"] = _make_sgtk()
+        package = types.ModuleType(PACKAGE_NAME)
+        package.__path__ = [PACKAGE_PATH]
+        sys.modules[PACKAGE_NAME] = package
+        handler = importlib.import_module(PACKAGE_NAME + ".handler")
+
+        self.template = FakeTemplate("render")
+        self.handler = handler.TkArnoldNodeHandler(FakeApp(self.template))
+        self.node = FakeNode(
+            "beauty_layer",
+            trange=0,
+            ver=1,
+            camera="/obj/cam_main",
+            sgtk_output_profile=0,
+            sgtk_ar_filename="",
+        )
+
+    def tearDown(self):
+        sys.modules.clear()
+        sys.modules.update(self.modules)
+
+    def compute_and_set(self):
+        return self.handler._compute_and_set(
+            self.node, "sgtk_ar_filename", "output_render_template"
+        )
+
+    def test_unchanged_inputs(self):
+        """
+        Ensures the path is only computed and set again when its inputs or the
+        parm value changed.
+        """
+        parm = self.node.parm("sgtk_ar_filename")
+
+        self.assertTrue(self.compute_and_set())
+        self.assertEqual(parm.value, "/renders/beautylayer/v001/RGBA.exr")
+        self.assertEqual((self.template.applied, parm.sets), (1, 1))
+
+        for _ in range(10):
+            self.assertFalse(self.compute_and_set())
+        self.assertEqual((self.template.applied, parm.sets), (1, 1))
+
+        self.node.parm("ver").value = 2
+        self.assertTrue(self.compute_and_set())
+        self.assertEqual(parm.value, "/renders/beautylayer/v002/RGBA.exr")
+        self.assertEqual((self.template.applied, parm.sets), (2, 2))
+
+        # the parm was edited by hand
+        parm.value = "/tmp/out.exr"
+        self.assertTrue(self.compute_and_set())
+        self.assertEqual(parm.value, "/renders/beautylayer/v002/RGBA.exr")
+
+    def test_deleted_node(self):
+        """
+        Ensures the synced paths of a node are dropped once it is deleted and
+        the delete callback is only added once.
+        """
+        self.compute_and_set()
+        self.compute_and_set()
+        self.assertIn(self.node.sessionId(), self.handler._synced_paths)
+        self.assertEqual(len(self.node.callbacks), 1)
+
+        (event_types, callback) = self.node.callbacks[0]
+        self.assertEqual(event_types, ("BeingDeleted",))
+        callback(event_type="BeingDeleted", node=self.node)
+        self.assertNotIn(self.node.sessionId(), self.handler._synced_paths)
+
+    def test_scene_cleared(self):
+        """
+        Ensures all synced paths are dropped when the scene is cleared.
+        """
+        self.compute_and_set()
+        self.handler._on_hip_file_event("AfterClear")
+        self.assertEqual(self.handler._synced_paths, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
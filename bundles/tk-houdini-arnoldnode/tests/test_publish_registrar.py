@@ -0,0 +1,115 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import importlib.util
+import os
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+from unittest.mock import Mock, patch
+
+import sgtk
+
+
+def _import_module(name):
+    """
+    Imports a module of the app without its package, which needs Houdini.
+    """
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "python", "tk_houdini_arnoldnode", name + ".py"
+    )
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestPublishRegistrar(TankTestBase):
+    def setUp(self):
+        super().setUp()
+        self.PublishRegistrar = _import_module("publish_registrar").PublishRegistrar
+
+        context = self.tk.context_from_entity("Project", self.project["id"])
+        self.app = Mock(sgtk=self.tk, shotgun=self.mockgun, context=context)
+
+        render_folder = os.path.join(self.project_root, "render")
+        self.backup_path = os.path.join(render_folder, "scene_v001.hip")
+        self.beauty_path = os.path.join(render_folder, "beauty.%04d.exr")
+        self.aov_path = os.path.join(render_folder, "diffuse.%04d.exr")
+
+    def _add_publishes(self, registrar):
+        registrar.add(self.backup_path, "node", "Backup File", 1)
+        registrar.add(
+            self.beauty_path,
+            "node",
+            "Rendered Image Beauty",
+            1,
+            dependency_paths=[self.backup_path],
+        )
+        registrar.add(
+            self.aov_path,
+            "node",
+            "Rendered Image AOV",
+            1,
+            dependency_paths=[self.backup_path],
+        )
+
+    def test_batched_registration(self):
+        """
+        Ensures the publishes and their dependencies are created in two
+        batches and can be found by path.
+        """
+        registrar = self.PublishRegistrar(self.app)
+        self._add_publishes(registrar)
+
+        with patch.object(
+            self.mockgun, "batch", wraps=self.mockgun.batch
+        ) as batch, patch.object(
+            self.mockgun, "create", wraps=self.mockgun.create
+        ) as create:
+            publishes = registrar.register()
+
+            self.assertEqual(batch.call_count, 2)
+            # only the missing published file types are created one by one.
+            self.assertEqual(
+                [c[0][0] for c in create.call_args_list], ["PublishedFileType"] * 3
+            )
+
+        self.assertEqual(len(publishes), 3)
+
+        # the publishes have a path cache, so they can be found by path.
+        paths = [self.backup_path, self.beauty_path, self.aov_path]
+        found = sgtk.util.find_publish(self.tk, paths)
+        self.assertEqual(sorted(found), sorted(paths))
+
+        dependencies = self.mockgun.find(
+            "PublishedFileDependency", [], ["dependent_published_file"]
+        )
+        self.assertEqual(
+            [d["dependent_published_file"]["id"] for d in dependencies],
+            [found[self.backup_path]["id"]] * 2,
+        )
+
+    def test_failed_batch(self):
+        """
+        Ensures a failed batch is reported and doesn't leave publishes queued.
+        """
+        registrar = self.PublishRegistrar(self.app)
+        self._add_publishes(registrar)
+
+        with patch.object(
+            self.mockgun, "batch", side_effect=sgtk.TankError("Batch failed")
+        ) as batch:
+            self.assertEqual(registrar.register(), [])
+            self.assertEqual(self.app.log_warning.call_count, 3)
+
+            # nothing is left to register.
+            self.assertEqual(registrar.register(), [])
+            self.assertEqual(batch.call_count, 1)
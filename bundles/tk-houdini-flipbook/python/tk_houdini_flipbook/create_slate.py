@@ -20,17 +20,35 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import atexit
+import json
 import os
 import subprocess
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
 import hou
 import sgtk
 
+# prefix of the protocol lines written by the slate worker, see slate.py
+PROTOCOL_PREFIX = "SLATE_WORKER:"
+
+# running slate workers, keyed by nuke executable and slate script
+_slate_workers = {}
+_slate_workers_lock = threading.Lock()
+
 
 class CreateSlate(object):
     def __init__(self, app):
         # initialize and set paths
         self.app = app
         self.nukePath = "%s" % (app.get_setting("nuke_path"))
+        self.workerTimeout = app.get_setting("slate_worker_timeout")
 
         # set slate script path
         __location__ = os.path.realpath(
@@ -38,15 +56,11 @@ class CreateSlate(object):
         )
         self.slatePath = os.path.join(__location__, "slate.py")
 
-    def runSlate(self, inputFile, outputFile, settings):
+    def runSlate(self, inputFile, outputFile, settings, progressCallback=None):
         # setup environment
         custom_env = os.environ.copy()
-
-        if custom_env["PYTHONPATH"] != None:
-            del custom_env["PYTHONPATH"]
-
-        if custom_env["PYTHONHOME"] != None:
-            del custom_env["PYTHONHOME"]
+        custom_env.pop("PYTHONPATH", None)
+        custom_env.pop("PYTHONHOME", None)
 
         # setup arguments for call
         context = self.app.context
@@ -74,36 +88,290 @@ class CreateSlate(object):
             settings["resolution"][0],
         )
 
-        # call subprocess of nuke and convert
-        process = subprocess.Popen(
-            [
-                self.nukePath,
-                "-t",
-                self.slatePath,
-                inputFile,
-                outputFile,
-                project_name,
-                file_name,
-                str(first_frame),
-                str(last_frame),
-                appPath,
-                str(version),
-                resolution,
-                user_name,
-                task_name,
-                str(fps),
-            ],
-            shell=True,
+        job = {
+            "input_path": inputFile,
+            "output_path": outputFile,
+            "project_name": project_name,
+            "file_name": file_name,
+            "first_frame": first_frame,
+            "last_frame": last_frame,
+            "app_path": appPath,
+            "version": version,
+            "resolution": resolution,
+            "user_name": user_name,
+            "task_name": task_name,
+            "fps": fps,
+        }
+
+        # send the job to the nuke slate worker, which is kept running between
+        # flipbooks so nuke's startup is only paid once
+        worker = get_slate_worker(
+            self.nukePath, self.slatePath, custom_env, self.workerTimeout, self.app.logger
+        )
+
+        try:
+            worker.run(job, progressCallback)
+        except SlateWorkerError as e:
+            raise Exception(
+                "Could not correctly render file. Used Nuke version %s: %s"
+                % (self.nukePath, e)
+            )
+
+
+class SlateWorkerError(Exception):
+    pass
+
+
+class SlateWorker(object):
+    """
+    A long running nuke process rendering slates.
+
+    Jobs are sent to the worker as json lines on its stdin. The worker answers
+    with json lines on its stdout reporting when a job started, the frames it
+    rendered and whether the job succeeded. The process is stopped after
+    being idle for the given number of seconds.
+    """
+
+    # seconds to wait for nuke to start and load the slate script
+    STARTUP_TIMEOUT = 300
+
+    # seconds to wait for a message of the worker while rendering a job before
+    # giving up on it
+    JOB_TIMEOUT = 600
+
+    # seconds to wait for the worker to exit when stopping it
+    STOP_TIMEOUT = 30
+
+    def __init__(self, executable, script_path, env, idle_timeout, logger):
+        self.executable = executable
+        self.script_path = script_path
+        self.env = env
+        self.idle_timeout = idle_timeout
+        self.logger = logger
+
+        self.stats = {"jobs": 0, "startups": 0, "startup_time": 0.0, "job_time": 0.0}
+
+        self._process = None
+        self._messages = None
+        self._job_id = 0
+        self._idle_timer = None
+        self._idle_token = 0
+        self._lock = threading.RLock()
+
+    def run(self, job, progress_callback=None):
+        # render a slate job, blocking until the worker reports it is done
+        with self._lock:
+            self._cancel_idle_stop()
+
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+
+            self._job_id += 1
+            job = dict(job, id=self._job_id)
+
+            start_time = time.time()
+            try:
+                self._process.stdin.write(json.dumps(job) + "\n")
+                self._process.stdin.flush()
+                self._wait_for_job(job["id"], progress_callback)
+            except (IOError, OSError) as e:
+                self.stop()
+                raise SlateWorkerError("Lost connection to the slate worker: %s" % (e,))
+            except SlateWorkerError:
+                # only restart the worker if it died, a failed job leaves it usable
+                if self._process is not None and self._process.poll() is not None:
+                    self.stop()
+                raise
+            finally:
+                if self._process is not None:
+                    self._schedule_idle_stop()
+
+            job_time = time.time() - start_time
+            self.stats["jobs"] += 1
+            self.stats["job_time"] += job_time
+            self.logger.debug(
+                "Slate rendered in %.2fs. %s"
+                % (job_time, self.stats)
+            )
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        # stop the worker process, it is started again by the next job. the
+        # process is killed if it doesn't exit within the timeout
+        with self._lock:
+            self._cancel_idle_stop()
+
+            process = self._process
+            self._process = None
+            if process is None:
+                return
+
+            try:
+                process.stdin.close()
+            except (IOError, OSError):
+                pass
+
+            stop_deadline = time.time() + timeout
+            while process.poll() is None and time.time() < stop_deadline:
+                time.sleep(0.1)
+
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+            self.logger.debug("Stopped slate worker %s" % (process.pid,))
+
+    def _start(self):
+        # start the worker process and wait until it is ready for jobs
+        start_time = time.time()
+
+        self._process = subprocess.Popen(
+            [self.executable, "-t", self.script_path, "--worker"],
+            stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            env=custom_env,
+            env=self.env,
+            universal_newlines=True,
+            bufsize=1,
+        )
+        self._messages = queue.Queue()
+
+        for (stream, handler) in (
+            (self._process.stdout, self._read_stdout),
+            (self._process.stderr, self._read_stderr),
+        ):
+            reader = threading.Thread(target=handler, args=(stream, self._messages))
+            reader.daemon = True
+            reader.start()
+
+        message = self._get_message(self.STARTUP_TIMEOUT)
+        if message.get("status") != "ready":
+            self.stop()
+            raise SlateWorkerError(
+                "Slate worker failed to start: %s" % (message.get("message"),)
+            )
+
+        startup_time = time.time() - start_time
+        self.stats["startups"] += 1
+        self.stats["startup_time"] += startup_time
+        self.logger.debug(
+            "Started slate worker %s in %.2fs" % (self._process.pid, startup_time)
         )
 
-        stdout, stderr = process.communicate()
-        self.app.logger.debug(stdout)
-        
-        if stderr:
-            self.app.logger.error(stderr)
+    def _wait_for_job(self, job_id, progress_callback):
+        # process the worker messages until the job is done
+        while True:
+            try:
+                message = self._get_message(self.JOB_TIMEOUT)
+            except SlateWorkerError:
+                # a hung nuke can't take any other job, kill it
+                if self._process.poll() is None:
+                    self.stop(timeout=0)
+                raise
+
+            status = message.get("status")
+
+            # errors without an id are about jobs the worker couldn't read
+            if message.get("id") is None and status == "error":
+                raise SlateWorkerError(message.get("message"))
+
+            if message.get("id") != job_id:
+                continue
+
+            if status == "progress":
+                if progress_callback:
+                    progress_callback(message.get("frame"))
+            elif status == "error":
+                raise SlateWorkerError(message.get("message"))
+            elif status == "done":
+                return
+
+    def _get_message(self, timeout=None):
+        # get the next message sent by the worker
+        try:
+            message = self._messages.get(timeout=timeout)
+        except queue.Empty:
+            raise SlateWorkerError("Timed out waiting for the slate worker.")
+
+        if message is None:
+            # stdout is closed as the worker exits, wait for its exit code
+            exit_deadline = time.time() + self.STOP_TIMEOUT
+            while self._process.poll() is None and time.time() < exit_deadline:
+                time.sleep(0.1)
+
+            raise SlateWorkerError(
+                "Slate worker exited with code %s." % (self._process.poll(),)
+            )
+
+        return message
+
+    def _read_stdout(self, stream, messages):
+        # parse the protocol messages written by the worker
+        for line in iter(stream.readline, ""):
+            line = line.strip()
+            if line.startswith(PROTOCOL_PREFIX):
+                try:
+                    messages.put(json.loads(line[len(PROTOCOL_PREFIX):]))
+                    continue
+                except ValueError:
+                    pass
+
+            if line:
+                self.logger.debug(line)
+
+        # let the client know the worker has exited
+        messages.put(None)
+
+    def _read_stderr(self, stream, messages):
+        # log whatever nuke writes to stderr
+        for line in iter(stream.readline, ""):
+            line = line.strip()
+            if line:
+                self.logger.debug(line)
+
+    def _schedule_idle_stop(self):
+        # stop the worker if it doesn't get a new job in time
+        self._idle_token += 1
+        self._idle_timer = threading.Timer(
+            self.idle_timeout, self._on_idle, args=(self._idle_token,)
+        )
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _cancel_idle_stop(self):
+        self._idle_token += 1
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _on_idle(self, token):
+        with self._lock:
+            # a job was started since this timer was scheduled
+            if token != self._idle_token:
+                return
+
+            self.logger.debug("Slate worker idle for %ss." % (self.idle_timeout,))
+            self.stop()
+
+
+def get_slate_worker(executable, script_path, env, idle_timeout, logger):
+    # return the slate worker for the supplied nuke executable, shared between
+    # all flipbook dialogs of the session
+    key = (executable, script_path)
+
+    with _slate_workers_lock:
+        worker = _slate_workers.get(key)
+        if worker is None:
+            worker = SlateWorker(executable, script_path, env, idle_timeout, logger)
+            _slate_workers[key] = worker
+        else:
+            worker.idle_timeout = idle_timeout
+
+    return worker
+
 
-        if stderr:
-            raise Exception("Could not correctly render file. Used Nuke version %s" % (self.nukePath))
+@atexit.register
+def _stop_slate_workers():
+    # make sure no nuke process outlives the session
+    with _slate_workers_lock:
+        for worker in _slate_workers.values():
+            worker.stop()
@@ -218,12 +218,27 @@ class FlipbookDialog(QtWidgets.QDialog):
                 operation.updateLongProgress(
                     0.25, "Rendering to Nuke, please sit tight."
                 )
+                firstFrame, lastFrame = inputSettings["frameRange"]
+                frameCount = max(float(lastFrame) - float(firstFrame) + 2, 1)
+
+                # the slate frame is rendered first, one frame before the range
+                def reportSlateProgress(frame):
+                    done = (float(frame) - float(firstFrame) + 2) / frameCount
+                    operation.updateLongProgress(
+                        0.25 + 0.25 * min(max(done, 0), 1),
+                        "Rendering to Nuke, frame %s" % (frame,),
+                    )
+
                 self.slate.runSlate(
                     outputPath["inputTempFile"],
                     outputPath["finFile"],
                     inputSettings,
+                    reportSlateProgress,
                 )
                 operation.updateLongProgress(0.5, "Uploading to Shotgun")
+                submit.progressCallback = lambda progress: operation.updateLongProgress(
+                    0.5 + 0.25 * progress, "Uploading to Shotgun"
+                )
                 submit.submit_version()
                 operation.updateLongProgress(0.75, "Saving")
                 self.saveNewVersion()
@@ -22,46 +22,25 @@
 
 import nuke
 import sys
-import datetime
+import json
 import time
 import os
 
-inputPath = sys.argv[1]
-outputPath = sys.argv[2]
-project_name = sys.argv[3]
-file_name = sys.argv[4]
-first_frame = int(float(sys.argv[5]))
-last_frame = int(float(sys.argv[6]))
-appPath = sys.argv[7]
-version = int(sys.argv[8])
-resolution = sys.argv[9]
-user_name = sys.argv[10]
-task_name = sys.argv[11]
-fps = float(sys.argv[12])
-
-output_node = None
+# prefix of the lines exchanged with the slate worker client, so they can be
+# told apart from anything else nuke writes to stdout.
+PROTOCOL_PREFIX = "SLATE_WORKER:"
 
 frame_padding = 3
-_burnin_nk = os.path.join(appPath, "resources", "burnin.nk")
-_font = os.path.join(appPath, "resources", "liberationsans_regular.ttf")
-
-# create group
-group = nuke.nodes.Group()
 
 # general metadata
 company_name = "NFA"
-today = datetime.date.today()
-date_formatted = time.strftime("%d/%m/%Y %H:%M")
 color_space = "Output - Rec.709"
 
-# operate in group
-group.begin()
-
 
-def __create_output_node(path):
+def __create_output_node(path, fps):
 
     # get the Write node settings we'll use for generating the Quicktime
-    wn_settings = __get_quicktime_settings()
+    wn_settings = __get_quicktime_settings(fps)
 
     node = nuke.nodes.Write(file_type=wn_settings.get("file_type"))
 
@@ -81,7 +60,7 @@ def __create_output_node(path):
     return node
 
 
-def __get_quicktime_settings():
+def __get_quicktime_settings(fps):
     settings = {}
     settings["file_type"] = "mov"
     if nuke.NUKE_VERSION_MAJOR >= 9:
@@ -114,60 +93,157 @@ def __get_quicktime_settings():
     return settings
 
 
-try:
-    # create read node
-    read = nuke.nodes.Read(
-        name="source", file_type="jpg", file=inputPath.replace(os.sep, "/")
-    )
-    read["on_error"].setValue("black")
-    read["first"].setValue(first_frame)
-    read["last"].setValue(last_frame)
-    if color_space:
-        read["colorspace"].setValue(color_space)
-
-    # now create the slate/burnin node
-    burn = nuke.nodePaste(_burnin_nk)
-    burn.setInput(0, read)
-
-    # format the burnins
-    version_padding_format = "%%0%dd" % frame_padding
-    version_str = version_padding_format % version
-
-    if task_name:
-        version_label = "%s, v%s" % (task_name, version_str)
-    else:
-        version_label = "v%s" % version_str
+def render_slate(job):
+    # render a slated movie for the supplied job dictionary
+    inputPath = job["input_path"]
+    outputPath = job["output_path"]
+    project_name = job["project_name"]
+    file_name = job["file_name"]
+    first_frame = int(float(job["first_frame"]))
+    last_frame = int(float(job["last_frame"]))
+    appPath = job["app_path"]
+    version = int(job["version"])
+    resolution = job["resolution"]
+    user_name = job["user_name"]
+    task_name = job["task_name"]
+    fps = float(job["fps"])
+
+    output_node = None
+
+    _burnin_nk = os.path.join(appPath, "resources", "burnin.nk")
+
+    date_formatted = time.strftime("%d/%m/%Y %H:%M")
+
+    # create group
+    group = nuke.nodes.Group()
+
+    # operate in group
+    group.begin()
+
+    try:
+        # create read node
+        read = nuke.nodes.Read(
+            name="source", file_type="jpg", file=inputPath.replace(os.sep, "/")
+        )
+        read["on_error"].setValue("black")
+        read["first"].setValue(first_frame)
+        read["last"].setValue(last_frame)
+        if color_space:
+            read["colorspace"].setValue(color_space)
+
+        # now create the slate/burnin node
+        burn = nuke.nodePaste(_burnin_nk)
+        burn.setInput(0, read)
+
+        # format the burnins
+        version_padding_format = "%%0%dd" % frame_padding
+        version_str = version_padding_format % version
+
+        if task_name:
+            version_label = "%s, v%s" % (task_name, version_str)
+        else:
+            version_label = "v%s" % version_str
 
-    burn.node("top_left_text")["message"].setValue(company_name)
-    burn.node("top_right_text")["message"].setValue(date_formatted)
-    burn.node("bottom_left_text")["message"].setValue(file_name)
-    burn.node("bottom_center_text")["message"].setValue(project_name)
+        burn.node("top_left_text")["message"].setValue(company_name)
+        burn.node("top_right_text")["message"].setValue(date_formatted)
+        burn.node("bottom_left_text")["message"].setValue(file_name)
+        burn.node("bottom_center_text")["message"].setValue(project_name)
 
-    # slate project info
-    burn.node("slate_projectinfo")["message"].setValue(project_name)
+        # slate project info
+        burn.node("slate_projectinfo")["message"].setValue(project_name)
 
-    slate_str = "%s\n" % file_name
-    slate_str += "%s - %s\n" % (first_frame, last_frame)
-    slate_str += "%s\n" % date_formatted
-    slate_str += "%s\n" % user_name
-    slate_str += "v%s\n \n" % version_str
-    slate_str += "%s\n" % fps
-    slate_str += "%s\n" % resolution
+        slate_str = "%s\n" % file_name
+        slate_str += "%s - %s\n" % (first_frame, last_frame)
+        slate_str += "%s\n" % date_formatted
+        slate_str += "%s\n" % user_name
+        slate_str += "v%s\n \n" % version_str
+        slate_str += "%s\n" % fps
+        slate_str += "%s\n" % resolution
 
-    burn.node("slate_info")["message"].setValue(slate_str)
+        burn.node("slate_info")["message"].setValue(slate_str)
 
-    # Create the output node
-    output_node = __create_output_node(outputPath)
-    output_node.setInput(0, burn)
+        # Create the output node
+        output_node = __create_output_node(outputPath, fps)
+        output_node.setInput(0, burn)
 
-finally:
-    group.end()
+    finally:
+        group.end()
 
-if output_node:
-    # Render the outputs, first view only
-    nuke.executeMultiple(
-        [output_node], ([first_frame - 1, last_frame, 1],), [nuke.views()[0]]
-    )
+    try:
+        if output_node:
+            # Render the outputs, first view only
+            nuke.executeMultiple(
+                [output_node], ([first_frame - 1, last_frame, 1],), [nuke.views()[0]]
+            )
+    finally:
+        # Cleanup after ourselves
+        nuke.delete(group)
+
+
+def __send(message):
+    # write a protocol message to the worker client
+    sys.stdout.write("%s%s\n" % (PROTOCOL_PREFIX, json.dumps(message)))
+    sys.stdout.flush()
+
+
+def run_worker():
+    # render the jobs sent as json lines on stdin until stdin is closed
+    current_job = {}
 
-# Cleanup after ourselves
-nuke.delete(group)
+    def __report_frame():
+        __send({"id": current_job.get("id"), "status": "progress", "frame": nuke.frame()})
+
+    nuke.addAfterFrameRender(__report_frame)
+
+    __send({"status": "ready"})
+
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break
+
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            job = json.loads(line)
+        except ValueError as e:
+            __send({"status": "error", "message": "Invalid job: %s" % (e,)})
+            continue
+
+        if not isinstance(job, dict):
+            __send({"status": "error", "message": "Invalid job: %s" % (line,)})
+            continue
+
+        current_job.clear()
+        current_job.update(job)
+
+        __send({"id": job.get("id"), "status": "started"})
+        try:
+            render_slate(job)
+        except Exception as e:
+            __send({"id": job.get("id"), "status": "error", "message": str(e)})
+        else:
+            __send({"id": job.get("id"), "status": "done"})
+
+
+if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+    run_worker()
+else:
+    render_slate(
+        {
+            "input_path": sys.argv[1],
+            "output_path": sys.argv[2],
+            "project_name": sys.argv[3],
+            "file_name": sys.argv[4],
+            "first_frame": sys.argv[5],
+            "last_frame": sys.argv[6],
+            "app_path": sys.argv[7],
+            "version": sys.argv[8],
+            "resolution": sys.argv[9],
+            "user_name": sys.argv[10],
+            "task_name": sys.argv[11],
+            "fps": sys.argv[12],
+        }
+    )
@@ -24,11 +24,13 @@ import sgtk
 import os
 from PySide2 import QtCore
 
+from .upload_manager import UploadManager, get_upload_manager
+
 
 class SubmitVersion(object):
 
     # initialize class
-    def __init__(self, app, filePath, firstFrame, lastFrame, description):
+    def __init__(self, app, filePath, firstFrame, lastFrame, description, progressCallback=None):
 
         # bind parented app class
         self.app = app
@@ -37,6 +39,8 @@ class SubmitVersion(object):
         # bind frame range
         self.frameRange = [firstFrame, lastFrame]
         self.description = description
+        # called with the upload progress, between 0 and 1
+        self.progressCallback = progressCallback
 
     # submit file to shotgun
     def submit_version(self):
@@ -75,11 +79,7 @@ class SubmitVersion(object):
         data["sg_path_to_movie"] = self.file
 
         # create the version in shotgun
-        try:
-            version = self.app.sgtk.shotgun.create("Version", data)
-        except:
-            self.app.logger.debug("This is the error.")
-        
+        version = self.app.sgtk.shotgun.create("Version", data)
         self.app.logger.debug("Created version in shotgun: %s" % str(data))
 
         # upload the movie files to shotgun
@@ -89,44 +89,67 @@ class SubmitVersion(object):
     # function to upload files to shotgun
     def __upload_version(self, version):
 
-        # create a new event loop to upload files
-        eventLoop = QtCore.QEventLoop()
+        # queue the upload with the shared upload manager and wait for it,
+        # using an event loop so the ui stays responsive
+        manager = get_upload_manager(self.app)
+        waiter = UploadWaiter(manager, self.progressCallback)
 
-        # open new thread and wait for thread to finish
-        thread = UploaderThread(self.app, version, self.file)
-        thread.finished.connect(eventLoop.quit)
-        thread.start()
-        eventLoop.exec_()
+        try:
+            waiter.uploadId = manager.submit(
+                "Version",
+                version["id"],
+                self.file,
+                "sg_uploaded_movie",
+                priority=UploadManager.PRIORITY_HIGH,
+            )
+            waiter.eventLoop.exec_()
+        finally:
+            waiter.disconnectFrom(manager)
 
-        if thread.get_errors():
-            for e in thread.get_errors():
-                self.app.logger.error(e)
+        if waiter.error:
+            raise Exception(waiter.error)
 
 
-class UploaderThread(QtCore.QThread):
+class UploadWaiter(QtCore.QObject):
 
     # initialize class
-    def __init__(self, app, version, filePath):
+    def __init__(self, manager, progressCallback=None):
 
         # initialize super class
-        QtCore.QThread.__init__(self)
+        QtCore.QObject.__init__(self)
 
-        self.app = app
-        self.version = version
-        self.file = filePath
-        self._errors = []
+        self.uploadId = None
+        self.error = None
+        self.progressCallback = progressCallback
+        self.eventLoop = QtCore.QEventLoop()
 
-    # function to retreive errors
-    def get_errors(self):
+        # the manager emits from its worker threads, the slots are called in
+        # this object's thread once the event loop runs
+        manager.uploadFinished.connect(self.onFinished)
+        manager.uploadFailed.connect(self.onFailed)
+        manager.uploadProgress.connect(self.onProgress)
 
-        return self._errors
+    def disconnectFrom(self, manager):
 
-    # run the actual thread
-    def run(self):
+        manager.uploadFinished.disconnect(self.onFinished)
+        manager.uploadFailed.disconnect(self.onFailed)
+        manager.uploadProgress.disconnect(self.onProgress)
 
-        try:
-            self.app.sgtk.shotgun.upload(
-                "Version", self.version["id"], self.file, "sg_uploaded_movie"
-            )
-        except Exception as e:
-            self._errors.append("Movie upload to Shotgun failed: %s" % e)
\ No newline at end of file
+    @QtCore.Slot(str)
+    def onFinished(self, jobId):
+
+        if jobId == self.uploadId:
+            self.eventLoop.quit()
+
+    @QtCore.Slot(str, str)
+    def onFailed(self, jobId, error):
+
+        if jobId == self.uploadId:
+            self.error = error
+            self.eventLoop.quit()
+
+    @QtCore.Slot(str, float)
+    def onProgress(self, jobId, progress):
+
+        if jobId == self.uploadId and self.progressCallback:
+            self.progressCallback(progress)
@@ -0,0 +1,347 @@
+# MIT License
+
+# Copyright (c) 2020 Netherlands Film Academy
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import errno
+import itertools
+import json
+import os
+import socket
+import sys
+import threading
+import uuid
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from PySide2 import QtCore
+
+# the upload manager shared by all flipbook submissions of the session
+_upload_manager = None
+_upload_manager_lock = threading.Lock()
+
+
+class UploadManager(QtCore.QObject):
+    """
+    A queue of uploads to Shotgun, shared by all flipbook submissions.
+
+    Uploads are run by a fixed number of worker threads, highest priority
+    first. Failed uploads are retried with an increasing delay. Pending uploads
+    are recorded on disk so the uploads interrupted by the end of a session
+    are resumed by the next one. Progress and errors are reported through
+    signals.
+
+    Each session writes its own record, named after its host and process id,
+    in the record folder. A new session only resumes the records of the
+    sessions of its host that are no longer running, and claims each of them
+    by renaming it first, so a record is never resumed twice.
+    """
+
+    # upload priorities, lower values are uploaded first
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 5
+    PRIORITY_LOW = 10
+
+    # job id, progress between 0 and 1
+    uploadProgress = QtCore.Signal(str, float)
+
+    # job id
+    uploadFinished = QtCore.Signal(str)
+
+    # job id, error message
+    uploadFailed = QtCore.Signal(str, str)
+
+    def __init__(
+        self, app, recordDir, maxUploads=2, maxAttempts=3, retryDelay=5.0, parent=None
+    ):
+        QtCore.QObject.__init__(self, parent)
+
+        self.app = app
+        self.recordDir = recordDir
+        self.recordPath = os.path.join(recordDir, "%s.json" % (_session_name(),))
+        self.maxAttempts = maxAttempts
+        self.retryDelay = retryDelay
+
+        # pending jobs keyed by job id, mirrored to the record file
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+        # entries are (priority, sequence, job id). the sequence keeps the
+        # submission order for jobs of the same priority.
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+
+        for index in range(maxUploads):
+            worker = threading.Thread(
+                target=self.__run_worker, name="FlipbookUploader%d" % (index,)
+            )
+            worker.daemon = True
+            worker.start()
+
+        self.__resume_recorded_jobs()
+
+    # queue a file to be uploaded to an entity field, returns the job id
+    def submit(self, entityType, entityId, filePath, fieldName, priority=PRIORITY_NORMAL):
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "entity_type": entityType,
+            "entity_id": entityId,
+            "path": filePath,
+            "field_name": fieldName,
+            "priority": priority,
+            "attempts": 0,
+        }
+
+        with self._lock:
+            self._jobs[job["id"]] = job
+            self.__write_record()
+
+        self.__enqueue(job)
+        self.app.logger.debug("Queued upload of %s" % (filePath,))
+
+        return job["id"]
+
+    # return the jobs that are not done yet
+    def pending(self):
+
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
+
+    def __enqueue(self, job):
+
+        self._queue.put((job["priority"], next(self._sequence), job["id"]))
+
+    def __run_worker(self):
+
+        while True:
+            (_, _, jobId) = self._queue.get()
+
+            with self._lock:
+                job = self._jobs.get(jobId)
+            if job is None:
+                continue
+
+            self.__upload(job)
+
+    def __upload(self, job):
+
+        job["attempts"] += 1
+        self.uploadProgress.emit(job["id"], 0.0)
+
+        if not os.path.isfile(job["path"]):
+            self.__fail(job, "Movie file does not exist: %s" % (job["path"],))
+            return
+
+        try:
+            self.app.sgtk.shotgun.upload(
+                job["entity_type"], job["entity_id"], job["path"], job["field_name"]
+            )
+        except Exception as e:
+            error = "Movie upload to Shotgun failed: %s" % (e,)
+
+            # retry transient failures with an exponential backoff
+            if job["attempts"] < self.maxAttempts:
+                delay = self.retryDelay * 2 ** (job["attempts"] - 1)
+                self.app.logger.warning("%s Retrying in %ss." % (error, delay))
+                with self._lock:
+                    self.__write_record()
+
+                timer = threading.Timer(delay, self.__enqueue, args=(job,))
+                timer.daemon = True
+                timer.start()
+                return
+
+            self.__fail(job, error)
+            return
+
+        self.__remove_job(job)
+        self.app.logger.debug("Uploaded %s" % (job["path"],))
+        self.uploadProgress.emit(job["id"], 1.0)
+        self.uploadFinished.emit(job["id"])
+
+    def __fail(self, job, error):
+
+        self.__remove_job(job)
+        self.app.logger.error(error)
+        self.uploadFailed.emit(job["id"], error)
+
+    def __remove_job(self, job):
+
+        with self._lock:
+            self._jobs.pop(job["id"], None)
+            self.__write_record()
+
+    def __resume_recorded_jobs(self):
+
+        try:
+            names = sorted(os.listdir(self.recordDir))
+        except (IOError, OSError):
+            return
+
+        jobs = []
+        for name in names:
+            if not _is_orphaned_record(name):
+                continue
+
+            # claim the record, only one session can rename it
+            claimPath = os.path.join(
+                self.recordDir, "%s~%s" % (_session_name(), name)
+            )
+            try:
+                os.rename(os.path.join(self.recordDir, name), claimPath)
+            except (IOError, OSError):
+                continue
+
+            try:
+                with open(claimPath, "r") as recordFile:
+                    claimedJobs = json.load(recordFile)
+            except (IOError, OSError, ValueError) as e:
+                self.app.logger.warning(
+                    "Could not read pending uploads %s: %s" % (claimPath, e)
+                )
+                continue
+
+            # resumed uploads go after the ones of the current session
+            for job in claimedJobs:
+                job["priority"] = self.PRIORITY_LOW
+                job["attempts"] = 0
+            jobs.extend(claimedJobs)
+
+            # the claimed jobs are in our record once written, the claim goes
+            with self._lock:
+                for job in claimedJobs:
+                    self._jobs[job["id"]] = job
+                self.__write_record()
+
+            try:
+                os.remove(claimPath)
+            except (IOError, OSError):
+                pass
+
+        for job in jobs:
+            self.__enqueue(job)
+
+        if jobs:
+            self.app.logger.info("Resuming %d pending uploads." % (len(jobs),))
+
+    # must be called with the lock held
+    def __write_record(self):
+
+        try:
+            if not self._jobs:
+                if os.path.exists(self.recordPath):
+                    os.remove(self.recordPath)
+                return
+
+            if not os.path.isdir(self.recordDir):
+                os.makedirs(self.recordDir)
+
+            tempPath = "%s.tmp" % (self.recordPath,)
+            with open(tempPath, "w") as recordFile:
+                json.dump(list(self._jobs.values()), recordFile)
+            _replace_file(tempPath, self.recordPath)
+        except (IOError, OSError) as e:
+            self.app.logger.warning("Could not record pending uploads: %s" % (e,))
+
+
+# name of the record of the current session
+def _session_name():
+
+    return "%s_%d" % (socket.gethostname(), os.getpid())
+
+
+# return True if a file of the record folder is the record of a session of
+# this host that is no longer running. claimed records are named after the
+# session that claimed them, followed by a ~ and the name of the record.
+def _is_orphaned_record(name):
+
+    if not name.endswith(".json"):
+        return False
+
+    owner = name[: -len(".json")].split("~", 1)[0]
+    (host, _, pid) = owner.rpartition("_")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+
+    return int(pid) != os.getpid() and not _is_process_running(int(pid))
+
+
+def _is_process_running(pid):
+
+    if sys.platform == "win32":
+        import ctypes
+
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        ERROR_ACCESS_DENIED = 5
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            # the process exists but belongs to someone else
+            return ctypes.GetLastError() == ERROR_ACCESS_DENIED
+
+        try:
+            exitCode = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exitCode))
+            return exitCode.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+
+    return True
+
+
+# replace a file atomically, os.replace doesn't exist in python 2
+def _replace_file(sourcePath, targetPath):
+
+    if hasattr(os, "replace"):
+        os.replace(sourcePath, targetPath)
+    elif sys.platform == "win32":
+        # rename doesn't overwrite on windows
+        if os.path.exists(targetPath):
+            os.remove(targetPath)
+        os.rename(sourcePath, targetPath)
+    else:
+        os.rename(sourcePath, targetPath)
+
+
+# return the upload manager shared by all flipbook submissions
+def get_upload_manager(app):
+
+    global _upload_manager
+
+    with _upload_manager_lock:
+        if _upload_manager is None:
+            _upload_manager = UploadManager(
+                app,
+                os.path.join(app.cache_location, "pending_uploads"),
+                maxUploads=app.get_setting("max_concurrent_uploads"),
+            )
+
+    return _upload_manager
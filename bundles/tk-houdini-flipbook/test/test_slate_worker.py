@@ -0,0 +1,178 @@
+# MIT License
+
+# Copyright (c) 2020 Netherlands Film Academy
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import importlib
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+import unittest
+
+PACKAGE_NAME = "tk_houdini_flipbook"
+PACKAGE_PATH = os.path.join(os.path.dirname(__file__), "..", "python", PACKAGE_NAME)
+
+# stands in for "nuke -t slate.py --worker", following the slate worker
+# protocol. jobs say how the fake worker should answer them.
+FAKE_WORKER = '''
+import json
+import sys
+import time
+
+PREFIX = "SLATE_WORKER:"
+
+
+def send(message):
+    sys.stdout.write(PREFIX + json.dumps(message) + "\\n")
+    sys.stdout.flush()
+
+
+sys.stdout.write("nuke is starting\\n")
+sys.stderr.write("some nuke warning\\n")
+send({"status": "ready"})
+
+for line in iter(sys.stdin.readline, ""):
+    job = json.loads(line)
+    if job.get("reply") == "invalid":
+        send({"status": "error", "message": "Invalid job"})
+        continue
+
+    send({"id": job["id"], "status": "started"})
+    if job.get("reply") == "hang":
+        time.sleep(60)
+    elif job.get("reply") == "exit":
+        sys.exit(3)
+    elif job.get("reply") == "error":
+        send({"id": job["id"], "status": "error", "message": "render failed"})
+    else:
+        for frame in job.get("frames", []):
+            send({"id": job["id"], "status": "progress", "frame": frame})
+        send({"id": job["id"], "status": "done"})
+'''
+
+
+def _import_create_slate():
+    """
+    Imports the create_slate module without running the package init, which
+    needs Houdini and Qt.
+    """
+    package = types.ModuleType(PACKAGE_NAME)
+    package.__path__ = [PACKAGE_PATH]
+    sys.modules[PACKAGE_NAME] = package
+    for name in ("hou", "sgtk"):
+        sys.modules.setdefault(name, types.ModuleType(name))
+    return importlib.import_module(PACKAGE_NAME + ".create_slate")
+
+
+class TestSlateWorker(unittest.TestCase):
+    def setUp(self):
+        self.create_slate = _import_create_slate()
+
+        self.folder = tempfile.mkdtemp()
+        script_path = os.path.join(self.folder, "fake_slate.py")
+        with open(script_path, "w") as script_file:
+            script_file.write(FAKE_WORKER)
+
+        # python ignores the -t flag nuke is started with
+        self.worker = self.create_slate.SlateWorker(
+            sys.executable, script_path, None, 60, logging.getLogger("test")
+        )
+
+    def tearDown(self):
+        self.worker.stop(timeout=0)
+        shutil.rmtree(self.folder)
+        for name in list(sys.modules):
+            if name.startswith(PACKAGE_NAME):
+                del sys.modules[name]
+
+    def test_jobs(self):
+        """
+        Ensures jobs are rendered by a single worker, reporting their progress,
+        and a failed job leaves the worker usable.
+        """
+        frames = []
+        self.worker.run({"frames": [1, 2, 3]}, frames.append)
+        self.assertEqual(frames, [1, 2, 3])
+
+        with self.assertRaisesRegex(self.create_slate.SlateWorkerError, "render failed"):
+            self.worker.run({"reply": "error"})
+
+        self.worker.run({})
+        self.assertEqual(self.worker.stats["jobs"], 2)
+        self.assertEqual(self.worker.stats["startups"], 1)
+
+    def test_invalid_job(self):
+        """
+        Ensures an error about a job the worker couldn't read ends the wait.
+        """
+        with self.assertRaisesRegex(self.create_slate.SlateWorkerError, "Invalid job"):
+            self.worker.run({"reply": "invalid"})
+
+        self.worker.run({})
+        self.assertEqual(self.worker.stats["startups"], 1)
+
+    def test_hung_worker(self):
+        """
+        Ensures a worker that stops answering is killed and started again by
+        the next job.
+        """
+        self.worker.JOB_TIMEOUT = 0.5
+        start_time = time.time()
+        with self.assertRaisesRegex(self.create_slate.SlateWorkerError, "Timed out"):
+            self.worker.run({"reply": "hang"})
+        self.assertLess(time.time() - start_time, 10)
+        self.assertIsNone(self.worker._process)
+
+        self.worker.run({})
+        self.assertEqual(self.worker.stats["startups"], 2)
+
+    def test_worker_exit(self):
+        """
+        Ensures a worker exiting during a job is reported and replaced.
+        """
+        with self.assertRaisesRegex(self.create_slate.SlateWorkerError, "code 3"):
+            self.worker.run({"reply": "exit"})
+
+        self.worker.run({})
+        self.assertEqual(self.worker.stats["startups"], 2)
+
+    def test_idle_stop(self):
+        """
+        Ensures the worker is stopped once idle and started again for the next
+        job.
+        """
+        self.worker.idle_timeout = 0.2
+        self.worker.run({})
+
+        deadline = time.time() + 10
+        while self.worker._process is not None and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertIsNone(self.worker._process)
+
+        self.worker.run({})
+        self.assertEqual(self.worker.stats["startups"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,8 +12,8 @@
 import base64
 import os
 import sys
+import time
 import zlib
-import shutil
 
 try:
    import cPickle as pickle
@@ -22,16 +22,20 @@ except:
 
 # houdini
 import hou
-import _alembic_hom_extensions as abc
 
 
 
 # toolkit
 import sgtk
 
-# pyseq
-sys.path.append(os.path.dirname(__file__))
-import pyseq
+from .render_outputs import RenderOutputInspector
+
+backup_snapshots = sgtk.platform.import_framework(
+    "tk-framework-houdiniutils", "backup_snapshots")
+parm_values = sgtk.platform.import_framework(
+    "tk-framework-houdiniutils", "parm_values")
+scene_references = sgtk.platform.import_framework(
+    "tk-framework-houdiniutils", "scene_references")
 
 
 class TkGeometryNodeHandler(object):
@@ -77,6 +81,14 @@ class TkGeometryNodeHandler(object):
     TK_OUTPUT_PROFILE_NAME_KEY = "tk_output_profile_name"
     """The key in the user data that stores the output profile name."""
 
+    TK_DEPENDENCY_NODE_TYPES = [
+        "abc_cam",
+        "alembicarchive",
+        "arnold_procedural",
+        "sgtk_file",
+    ]
+    """Types of the nodes whose files are published as dependencies."""
+
 
     ############################################################################
     # Class methods
@@ -106,9 +118,14 @@ class TkGeometryNodeHandler(object):
         # the tk node type we'll be converting to
         tk_node_type = TkGeometryNodeHandler.TK_GEOMETRY_NODE_TYPE
 
+        parm_kinds = {}
+        start_time = time.time()
+
         # iterate over all the geometry nodes and attempt to convert them
         for geometry_node in geometry_nodes:
 
+            node_start_time = time.time()
+
             # get the user data dictionary stored on the node
             user_dict = geometry_node.userDataDict()
 
@@ -140,8 +157,8 @@ class TkGeometryNodeHandler(object):
                     (tk_output_profile_name,))
 
             # copy over all parameter values except the output path 
-            _copy_parm_values(geometry_node, tk_geometry_node,
-                excludes=[cls.NODE_OUTPUT_PATH_PARM])
+            parm_values.copy_parm_values(geometry_node, tk_geometry_node,
+                excludes=[cls.NODE_OUTPUT_PATH_PARM], parm_kinds=parm_kinds)
 
             # copy the inputs and move the outputs
             _copy_inputs(geometry_node, tk_geometry_node)
@@ -169,8 +186,13 @@ class TkGeometryNodeHandler(object):
             tk_geometry_node.setName(geometry_node_name)
             tk_geometry_node.setPosition(geometry_node_pos)
 
-            app.log_debug("Converted: Geometry node '%s' to TK Geometry node."
-                % (geometry_node_name,))
+            app.log_debug(
+                "Converted: Geometry node '%s' to TK Geometry node. (%.3fs)"
+                % (geometry_node_name, time.time() - node_start_time)
+            )
+
+        app.log_debug("Converted %d nodes in %.3fs" %
+            (len(geometry_nodes), time.time() - start_time))
 
     @classmethod
     def convert_to_regular_geometry_nodes(cls, app):
@@ -201,9 +223,14 @@ class TkGeometryNodeHandler(object):
             app.log_debug("No Toolkit Geometry Nodes found for conversion.")
             return
 
+        parm_kinds = {}
+        start_time = time.time()
+
         # iterate over all the tk geometry nodes and attempt to convert them
         for tk_geometry_node in tk_geometry_nodes:
 
+            node_start_time = time.time()
+
             # determine the corresponding, built-in operator type
             if tk_geometry_node.type() == sop_type:
                 geometry_operator = cls.HOU_SOP_GEOMETRY_TYPE
@@ -223,8 +250,8 @@ class TkGeometryNodeHandler(object):
             geometry_node.parm(cls.NODE_OUTPUT_PATH_PARM).set(filename)
 
             # copy across knob values
-            _copy_parm_values(tk_geometry_node, geometry_node,
-                excludes=[cls.NODE_OUTPUT_PATH_PARM])
+            parm_values.copy_parm_values(tk_geometry_node, geometry_node,
+                excludes=[cls.NODE_OUTPUT_PATH_PARM], parm_kinds=parm_kinds)
 
             # store the geometry output profile name in the user data so that we
             # can retrieve it later.
@@ -257,8 +284,13 @@ class TkGeometryNodeHandler(object):
             geometry_node.setName(tk_geometry_node_name)
             geometry_node.setPosition(tk_geometry_node_pos)
 
-            app.log_debug("Converted: Tk Geometry node '%s' to Geometry node."
-                % (tk_geometry_node_name,))
+            app.log_debug(
+                "Converted: Tk Geometry node '%s' to Geometry node. (%.3fs)"
+                % (tk_geometry_node_name, time.time() - node_start_time)
+            )
+
+        app.log_debug("Converted %d nodes in %.3fs" %
+            (len(tk_geometry_nodes), time.time() - start_time))
 
     @classmethod
     def get_all_tk_geometry_nodes(cls):
@@ -320,6 +352,15 @@ class TkGeometryNodeHandler(object):
             self._app.log_debug("Caching geometry output profile: '%s'" %
                 (output_profile_name,))
 
+        # index of the files referenced in the scene, used as dependencies
+        self._scene_references = scene_references.SceneReferenceIndex()
+
+        # writes the backup hip files in the background
+        self._backup_snapshots = backup_snapshots.BackupSnapshotWriter(self._app)
+
+        # cached listings of the output directories
+        self._render_outputs = RenderOutputInspector()
+
 
     ############################################################################
     # methods and callbacks executed via the OTLs
@@ -526,16 +567,14 @@ class TkGeometryNodeHandler(object):
     def create_backup_file(self, node):
         backup_path = self._compute_backup_output_path(node)
 
-        # Create dir if it doesn't exist
-        backup_dir_path = os.path.dirname(backup_path)
-        if not os.path.exists(backup_dir_path):
-            os.makedirs(backup_dir_path)
-
         # write backup hip
         hou.hipFile.save(file_name=None, save_to_recent_files=True)
 
-        shutil.copy2(hou.hipFile.path(), backup_path)
-        self._app.log_debug("Created backup file for %s" % node.name())
+        # the saved hip file is snapshotted now and copied to the backup
+        # location in the background. auto_publish waits for the copy before
+        # registering the backup file, failed copies are logged as errors.
+        self._backup_snapshots.snapshot(hou.hipFile.path(), backup_path)
+        self._app.log_debug("Submitted backup file for %s" % node.name())
 
     def get_backup_file(self, node):
         backup_path = self._compute_backup_output_path(node)
@@ -554,28 +593,15 @@ class TkGeometryNodeHandler(object):
         publishes = sgtk.util.find_publish(self._app.sgtk, [cache_path])
         if len(publishes.keys()) == 0:
             # get caches in scene, same as in tk-multi-breakdown
-            refs = []
-
-            for n in hou.node("/obj").allSubChildren(recurse_in_locked_nodes=False):
-                hou_path = None
-                node_type = n.type().name()
-                if node_type == "alembicarchive":
-                    hou_path = n.parm("fileName").eval().replace("/", os.path.sep)
-                elif node_type == "abc_cam":
-                    hou_path = n.parm("abcFile").eval().replace("/", os.path.sep)
-                elif node_type == "sgtk_file" and n.parm('mode').evalAsString() == 'file':
-                    hou_path = n.parm("file").eval().replace("/", os.path.sep)
-                elif node_type == 'arnold_procedural':
-                    hou_path = n.parm("ar_filename").eval().replace("/", os.path.sep)
-
-                if hou_path:
-                    refs.append(hou_path)
+            refs = self._scene_references.get_references(
+                self.TK_DEPENDENCY_NODE_TYPES)
 
             # get current version
             version = node.parm('ver').evalAsInt()
 
             # Publish backup hip file
             backup_path = self._compute_backup_output_path(node)
+            self._backup_snapshots.wait(backup_path)
             sgtk.util.register_publish(self._app.sgtk, self._app.context, backup_path, self._getNodeName(node), published_file_type="Backup File", version_number=version, dependency_paths=refs, created_by=self._app.context.user)
 
             # Publish cache
@@ -663,8 +689,7 @@ class TkGeometryNodeHandler(object):
 
         return_str = None
         if '$F4' in path:
-            path = path.replace('$F4', '*')
-            sequences = pyseq.get_sequences(path)
+            sequences = self._render_outputs.get_sequences(path)
 
             if len(sequences) == 1:
                 seq = sequences[0]
@@ -681,19 +706,25 @@ class TkGeometryNodeHandler(object):
             else:
                 return_str = 'No or multiple sequences detected!'
         elif path.split('.')[-1] == 'abc':
-            if os.path.exists(path):
-                abcRange = abc.alembicTimeRange(path)
-                        
-                if abcRange:
-                    return_str = '[%s-%s] - ABC Archive' % (int(abcRange[0] * hou.fps()), int(abcRange[1] * hou.fps()))
+            if self._render_outputs.exists(path):
+                try:
+                    abcRange = self._render_outputs.get_alembic_range(path)
+                except Exception as e:
+                    self._app.log_warning(
+                        "Failed to read the Alembic time range of %s: %s" %
+                        (path, e))
+                    return_str = 'Invalid Abc!'
                 else:
-                    return_str = 'Single Abc'
+                    if abcRange:
+                        return_str = '[%s-%s] - ABC Archive' % (int(abcRange[0] * hou.fps()), int(abcRange[1] * hou.fps()))
+                    else:
+                        return_str = 'Single Abc'
                 
                 node_color = hou.Color((0.8, 0, 0))
             else:
                 return_str = 'No Cache!'
         else:
-            if os.path.exists(path):
+            if self._render_outputs.exists(path):
                 return_str = 'Single Frame'
 
                 node_color = hou.Color((0.8, 0, 0))
@@ -866,12 +897,8 @@ class TkGeometryNodeHandler(object):
             self._app.log_error(msg)
             return []
             
-        fields = output_cache_template.get_fields(file_name)
-
-        # get the actual file paths based on the template. Ignore any sequence
-        # or eye fields
-        return self._app.tank.paths_from_template(
-            output_cache_template, fields, ["SEQ", "eye"])
+        # get the actual file paths matching any frame of the sequence
+        return self._render_outputs.get_files(file_name)
 
 ################################################################################
 # Utility methods
@@ -891,56 +918,6 @@ def _copy_inputs(source_node, target_node):
         target_node.setInput(connection.inputIndex(),
             connection.inputNode())
 
-# Copy parameter values of the source node to those of the target node if a
-# parameter with the same name exists.
-def _copy_parm_values(source_node, target_node, excludes=None):
-    if not excludes:
-        excludes = []
-
-    # build a parameter list from the source node, ignoring the excludes
-    source_parms = [
-        parm for parm in source_node.parms() if parm.name() not in excludes]
-
-    for source_parm in source_parms:
-
-        source_parm_template = source_parm.parmTemplate()
-
-        # skip folder parms
-        if isinstance(source_parm_template, hou.FolderSetParmTemplate):
-            continue
-
-        target_parm = target_node.parm(source_parm.name())
-
-        # if the parm on the target node doesn't exist, skip it
-        if target_parm is None:
-            continue
-
-        # if we have keys/expressions we need to copy them all.
-        if source_parm.keyframes():
-            for key in source_parm.keyframes():
-                target_parm.setKeyframe(key)
-        else:
-            # if the parameter is a string, copy the raw string.
-            if isinstance(source_parm_template, hou.StringParmTemplate):
-                target_parm.set(source_parm.unexpandedString())
-            # copy the evaluated value
-            else:
-                try:
-                    target_parm.set(source_parm.eval())
-                except TypeError:
-                    # The pre- and post-script type comboboxes changed sometime around
-                    # 16.5.439 to being string type parms that take the name of the language
-                    # (hscript or python) instead of an integer index of the combobox item
-                    # that's selected. To support both, we try the old way (which is how our
-                    # otl is setup to work), and if that fails we then fall back on mapping
-                    # the integer index from our otl's parm over to the string language name
-                    # that the geometry node is expecting.
-                    if source_parm.name().startswith("lpre") or source_parm.name().startswith("lpost"):
-                        value_map = ["hscript", "python"]
-                        target_parm.set(value_map[source_parm.eval()])
-                    else:
-                        raise
-
 # return the menu label for the supplied parameter
 def _get_output_menu_label(parm):
     if parm.menuItems()[parm.eval()] == "sgtk":
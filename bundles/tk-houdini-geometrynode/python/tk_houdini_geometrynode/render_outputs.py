@@ -0,0 +1,232 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+# built-ins
+import fnmatch
+import os
+import re
+import time
+
+# pyseq
+from . import pyseq
+
+
+def probe_alembic_range(path):
+    """Return the time range of an Alembic archive.
+
+    This is the default Alembic probe of :class:`RenderOutputInspector`.
+
+    :param str path: Path of the Alembic archive.
+
+    :return: The start and end times in seconds, or None for a static archive.
+
+    """
+
+    # houdini
+    import _alembic_hom_extensions as abc
+
+    return abc.alembicTimeRange(path)
+
+
+class RenderOutputInspector(object):
+    """Cached view of the files written by output nodes.
+
+    Each output directory is listed once and kept in memory until its
+    modification time changes, so repeated queries for the nodes writing to
+    it don't hit the file system again. The sequences found in a directory and
+    the time ranges of Alembic archives are cached the same way, keyed by path
+    and modification time.
+
+    File systems with a coarse modification time, like many network file
+    systems, don't change the time of a directory modified again within the
+    same tick. A listing taken within :attr:`MTIME_RESOLUTION` of the
+    directory modification time is therefore not trusted, and the directory
+    is listed again on the next query.
+
+    The time ranges of Alembic archives are read by a probe function, which
+    can be replaced by a fake outside of Houdini.
+    """
+
+    FRAME_TOKEN_REGEX = re.compile(r"\$F\d*")
+    """Matches the Houdini frame variables in an output path."""
+
+    MTIME_RESOLUTION = 2.0
+    """Seconds a directory must have been left unmodified for its listing to
+    be cached."""
+
+    def __init__(self, alembic_probe=probe_alembic_range):
+        """Initialize the inspector.
+
+        :param alembic_probe: Function returning the time range of an Alembic
+            archive path.
+
+        """
+
+        self._alembic_probe = alembic_probe
+
+        # directory path -> (mtime, list of file names, set of normalized
+        # file names)
+        self._listings = {}
+
+        # file pattern -> (directory listing, list of pyseq.Sequence)
+        self._sequences = {}
+
+        # alembic path -> ((mtime, size), time range)
+        self._alembic_ranges = {}
+
+    def exists(self, path):
+        """Return True if the supplied file exists.
+
+        Files missing from the cached listing are checked on disk, so files
+        written since the directory was listed are found.
+
+        :param str path: Path of the file.
+
+        """
+
+        directory = os.path.dirname(path)
+        listing = self._list_directory(directory)
+        if listing is None:
+            return False
+
+        if os.path.normcase(os.path.basename(path)) in listing[2]:
+            return True
+
+        if os.path.exists(path):
+            # the listing is out of date
+            self._listings.pop(directory, None)
+            return True
+
+        return False
+
+    def get_files(self, path):
+        """Return the files on disk matching an output path.
+
+        :param str path: The output path, frame variables like ``$F4`` match
+            any frame number.
+
+        :return: The matching file paths, sorted.
+        :rtype: list of str
+
+        """
+
+        pattern = self.FRAME_TOKEN_REGEX.sub("*", path)
+        directory = os.path.dirname(pattern)
+
+        listing = self._list_directory(directory)
+        if listing is None:
+            return []
+
+        names = fnmatch.filter(listing[1], os.path.basename(pattern))
+        return sorted(os.path.join(directory, name) for name in names)
+
+    def get_sequences(self, path):
+        """Return the sequences of files on disk matching an output path.
+
+        Frame ranges and missing frames can be queried on the returned
+        sequences without accessing the file system.
+
+        :param str path: The output path, frame variables like ``$F4`` match
+            any frame number.
+
+        :rtype: list of pyseq.Sequence
+
+        """
+
+        listing = self._list_directory(os.path.dirname(path))
+        if listing is None:
+            return []
+
+        cached = self._sequences.get(path)
+        if cached and cached[0] is listing:
+            return cached[1]
+
+        files = self.get_files(path)
+        sequences = pyseq.get_sequences(files) if files else []
+        self._sequences[path] = (listing, sequences)
+
+        return sequences
+
+    def get_alembic_range(self, path):
+        """Return the time range of an Alembic archive.
+
+        :param str path: Path of the Alembic archive.
+
+        :return: The start and end times in seconds, or None if the archive
+            is static or doesn't exist.
+
+        :raises: The error raised by the probe if the archive can't be read.
+            Failures are not cached.
+
+        """
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        identity = (stat.st_mtime, stat.st_size)
+
+        cached = self._alembic_ranges.get(path)
+        if cached and cached[0] == identity:
+            return cached[1]
+
+        time_range = self._alembic_probe(path)
+        self._alembic_ranges[path] = (identity, time_range)
+
+        return time_range
+
+    def invalidate(self, path=None):
+        """Discard the cached data.
+
+        :param str path: Only discard the data of the directory containing
+            this path. Everything is discarded if not specified.
+
+        """
+
+        if path is None:
+            self._listings.clear()
+            self._sequences.clear()
+            self._alembic_ranges.clear()
+            return
+
+        self._listings.pop(os.path.dirname(path), None)
+
+    def _list_directory(self, directory):
+        """Return the cached listing of a directory, refreshed if modified.
+
+        :param str directory: Path of the directory.
+
+        :return: A tuple of the directory mtime, its file names and the set of
+            its file names normalized for comparison, or None if the
+            directory doesn't exist.
+
+        """
+
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            self._listings.pop(directory, None)
+            return None
+
+        listing = self._listings.get(directory)
+        if listing and listing[0] == mtime:
+            return listing
+
+        names = os.listdir(directory)
+        listing = (mtime, names, set(os.path.normcase(name) for name in names))
+
+        # the directory may still change without its mtime changing
+        if time.time() - mtime >= self.MTIME_RESOLUTION:
+            self._listings[directory] = listing
+        else:
+            self._listings.pop(directory, None)
+
+        return listing
@@ -0,0 +1,122 @@
+# Copyright (c) 2015 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+import unittest
+
+PACKAGE_NAME = "tk_houdini_geometrynode"
+PACKAGE_PATH = os.path.join(os.path.dirname(__file__), "..", "python", PACKAGE_NAME)
+
+
+def _import_render_outputs():
+    """
+    Imports the render_outputs module without running the package init,
+    which needs Houdini.
+    """
+    package = types.ModuleType(PACKAGE_NAME)
+    package.__path__ = [PACKAGE_PATH]
+    sys.modules[PACKAGE_NAME] = package
+    return importlib.import_module(PACKAGE_NAME + ".render_outputs")
+
+
+class FakeProbe(object):
+    def __init__(self):
+        self.calls = []
+        self.ranges = {}
+
+    def __call__(self, path):
+        self.calls.append(path)
+        time_range = self.ranges[os.path.basename(path)]
+        if isinstance(time_range, Exception):
+            raise time_range
+        return time_range
+
+
+class TestRenderOutputInspector(unittest.TestCase):
+    def setUp(self):
+        render_outputs = _import_render_outputs()
+        self.probe = FakeProbe()
+        self.inspector = render_outputs.RenderOutputInspector(self.probe)
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        for name in list(sys.modules):
+            if name.startswith(PACKAGE_NAME):
+                del sys.modules[name]
+        shutil.rmtree(self.folder)
+
+    def _write(self, name, content="data", age=0):
+        path = os.path.join(self.folder, name)
+        with open(path, "w") as output_file:
+            output_file.write(content)
+        if age:
+            mtime = time.time() - age
+            os.utime(path, (mtime, mtime))
+            os.utime(self.folder, (mtime, mtime))
+        return path
+
+    def test_alembic_ranges_cached_by_identity(self):
+        """
+        Ensures archives are only probed again when they change.
+        """
+        path = self._write("cache.abc", age=10)
+        self.probe.ranges["cache.abc"] = (0.0, 4.0)
+
+        self.assertEqual(self.inspector.get_alembic_range(path), (0.0, 4.0))
+        self.assertEqual(self.inspector.get_alembic_range(path), (0.0, 4.0))
+        self.assertEqual(len(self.probe.calls), 1)
+
+        self.probe.ranges["cache.abc"] = (0.0, 8.0)
+        self._write("cache.abc", content="more data")
+        self.assertEqual(self.inspector.get_alembic_range(path), (0.0, 8.0))
+        self.assertEqual(len(self.probe.calls), 2)
+
+        self.assertIsNone(
+            self.inspector.get_alembic_range(os.path.join(self.folder, "none.abc"))
+        )
+        self.assertEqual(len(self.probe.calls), 2)
+
+    def test_alembic_probe_errors_not_cached(self):
+        """
+        Ensures archives that can't be read are probed again.
+        """
+        path = self._write("broken.abc", age=10)
+        self.probe.ranges["broken.abc"] = IOError("Not an archive")
+
+        for _ in range(2):
+            with self.assertRaises(IOError):
+                self.inspector.get_alembic_range(path)
+        self.assertEqual(len(self.probe.calls), 2)
+
+    def test_exists(self):
+        """
+        Ensures files written after the directory was listed are found.
+        """
+        path = self._write("cache.abc", age=10)
+        self.assertTrue(self.inspector.exists(path))
+
+        new_path = os.path.join(self.folder, "new.abc")
+        self.assertFalse(self.inspector.exists(new_path))
+
+        # the directory mtime doesn't change, like on coarse file systems.
+        mtime = os.stat(self.folder).st_mtime
+        self._write("new.abc")
+        os.utime(self.folder, (mtime, mtime))
+        self.assertTrue(self.inspector.exists(new_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
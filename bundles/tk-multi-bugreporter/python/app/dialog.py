@@ -23,6 +23,12 @@ from .ui.dialog import Ui_Dialog
 screen_grab = sgtk.platform.import_framework("tk-framework-qtwidgets", "screen_grab")
 shotgun_fields = sgtk.platform.import_framework("tk-framework-qtwidgets", "shotgun_fields")
 
+# Default CC users, keyed by the raw "cc" setting they were resolved from so
+# that a change of the setting is picked up. Shared by all the dialogs opened
+# during the session.
+_default_cc_users = {}
+
+
 def show_dialog(app_instance):
     """
     Shows the main dialog window.
@@ -83,12 +89,7 @@ class AppDialog(QtGui.QWidget):
         """
         # Get a list of user entities from Shotgun representing the default
         # list that we'll pull from the "cc" config setting for the app.
-        raw_cc = self._app.get_setting("cc", "")
-        users = self._app.shotgun.find(
-            "HumanUser",
-            [["login", "in", re.split(r"[,\s]+", raw_cc)]],
-            fields=("id", "type", "name")
-        )
+        users = self._get_default_cc_users()
 
         # Create the widget that the user will use to view the default CC
         # list, plus enter in any additional users if the choose to do so.
@@ -103,6 +104,25 @@ class AppDialog(QtGui.QWidget):
         self._cc_widget.set_value(users)
         self.ui.cc_layout.addWidget(self._cc_widget)
 
+    def _get_default_cc_users(self):
+        """
+        Returns the user entities of the default CC list.
+
+        The users are only looked up in Shotgun the first time the dialog is
+        opened, or after the "cc" setting has changed.
+        """
+        raw_cc = self._app.get_setting("cc", "")
+
+        if raw_cc not in _default_cc_users:
+            _default_cc_users.clear()
+            _default_cc_users[raw_cc] = self._app.shotgun.find(
+                "HumanUser",
+                [["login", "in", re.split(r"[,\s]+", raw_cc)]],
+                fields=("id", "type", "name")
+            )
+
+        return [dict(user) for user in _default_cc_users[raw_cc]]
+
     def screen_grab(self):
         """
         Triggers a screen grab to be initiated.
@@ -132,19 +152,21 @@ class AppDialog(QtGui.QWidget):
         )
 
         # If we have a screenshot that was recorded, we write that to disk as a
-        # png file and then upload it to Shotgun, associating it with the Ticket
-        # entity we just created.
+        # png file and then upload it to Shotgun in the background, associating
+        # it with the Ticket entity we just created.
         if self._screenshot:
-            path = tempfile.mkstemp(suffix=".png")[1]
+            (fd, path) = tempfile.mkstemp(suffix=".png")
+            os.close(fd)
             file_obj = QtCore.QFile(path)
             file_obj.open(QtCore.QIODevice.WriteOnly)
             self._screenshot.save(file_obj, "PNG")
-            self._app.shotgun.upload(
-                "Ticket",
-                result["id"],
-                path,
-                "attachments",
+            file_obj.close()
+
+            upload_thread = threading.Thread(
+                target=_upload_attachment,
+                args=(self._app, result["id"], path),
             )
+            upload_thread.start()
 
         QtGui.QMessageBox.information(
             self,
@@ -152,5 +174,25 @@ class AppDialog(QtGui.QWidget):
             "Ticket #%s successfully submitted!" % result["id"],
         )
         self.close()
-    
-        
+
+
+def _upload_attachment(app, ticket_id, path):
+    """
+    Uploads a file as an attachment of a Ticket, then removes the file.
+
+    :param app: The bug reporter app instance.
+    :param int ticket_id: The id of the Ticket to attach the file to.
+    :param str path: Path of the file to upload.
+    """
+    try:
+        app.shotgun.upload("Ticket", ticket_id, path, "attachments")
+        app.log_debug("Attached %s to Ticket #%s" % (path, ticket_id))
+    except Exception as e:
+        app.log_error(
+            "Could not attach the screenshot to Ticket #%s: %s" % (ticket_id, e)
+        )
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
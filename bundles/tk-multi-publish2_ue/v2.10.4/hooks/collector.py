@@ -398,29 +398,24 @@ class BasicSceneCollector(HookBaseClass):
         type_display = "File"
         item_type = "file.unknown"
 
-        # keep track if a common type was identified for the extension
-        common_type_found = False
-
         icon_path = None
 
-        # look for the extension in the common file type info dict
-        for display in self.common_file_info:
-            type_info = self.common_file_info[display]
-
-            if extension in type_info["extensions"]:
-                # found the extension in the common types lookup. extract the
-                # item type, icon name.
-                type_display = display
-                item_type = type_info["item_type"]
-                icon_path = type_info["icon"]
-                common_type_found = True
-                break
-
-        if not common_type_found:
+        # look for the extension in the common file type info
+        common_type = None
+        if extension:
+            common_type = self._get_common_type(filename)
+
+        if common_type:
+            # found the extension in the common types lookup. extract the
+            # item type, icon name.
+            (type_display, type_info) = common_type
+            item_type = type_info["item_type"]
+            icon_path = type_info["icon"]
+        else:
             # no common type match. try to use the mimetype category. this will
             # be a value like "image/jpeg" or "video/mp4". we'll extract the
             # portion before the "/" and use that for display.
-            (category_type, _) = mimetypes.guess_type(filename)
+            category_type = self._guess_mimetype(filename)
 
             if category_type:
 
@@ -448,6 +443,77 @@ class BasicSceneCollector(HookBaseClass):
             icon_path=icon_path,
         )
 
+    def _get_common_type(self, filename):
+        """
+        Identify the common file type of the supplied file name.
+
+        Extensions are matched case insensitively. Extensions made of several
+        parts, like ``bgeo.sc``, are matched before their last part alone.
+
+        :param str filename: The file name to identify.
+
+        :returns: A tuple of the display name and the type info dictionary of
+            the matching :data:`common_file_info` entry, or ``None``.
+        """
+
+        if not hasattr(self, "_extension_index"):
+
+            # do this once, instead of scanning the whole common file info for
+            # each file. the first file type listing an extension wins.
+            extension_index = {}
+            for display, type_info in self.common_file_info.items():
+                for type_extension in type_info["extensions"]:
+                    extension_index.setdefault(
+                        type_extension.lstrip(".").lower(), (display, type_info)
+                    )
+
+            self._extension_index = extension_index
+            self._max_extension_parts = max(
+                [type_extension.count(".") + 1 for type_extension in extension_index]
+                or [0]
+            )
+
+        extension_parts = filename.lower().split(".")[1:]
+
+        # look for the longest extension first
+        nb_parts = min(len(extension_parts), self._max_extension_parts)
+        while nb_parts > 0:
+            common_type = self._extension_index.get(
+                ".".join(extension_parts[-nb_parts:])
+            )
+            if common_type:
+                return common_type
+            nb_parts -= 1
+
+        return None
+
+    def _guess_mimetype(self, filename):
+        """
+        Guess the mimetype of the supplied file name.
+
+        Results are cached by extension since only the extension is taken into
+        account by :func:`mimetypes.guess_type`.
+
+        :param str filename: The file name to guess the mimetype for.
+
+        :returns: The mimetype as a string, ex: "image/jpeg", or ``None``.
+        """
+
+        if not hasattr(self, "_mimetypes_by_extension"):
+            self._mimetypes_by_extension = {}
+
+        (root, extension) = os.path.splitext(filename)
+        if extension.lower() in mimetypes.encodings_map:
+            # compressed files are identified by the extension preceding the
+            # encoding one, ex: "tar" for "archive.tar.gz"
+            extension = os.path.splitext(root)[1] + extension
+
+        if extension not in self._mimetypes_by_extension:
+            (category_type, _) = mimetypes.guess_type("file%s" % (extension,))
+            self._mimetypes_by_extension[extension] = category_type
+
+        return self._mimetypes_by_extension[extension]
+
     def _get_icon_path(self, icon_name, icons_folders=None):
         """
         Helper to get the full path to an icon.
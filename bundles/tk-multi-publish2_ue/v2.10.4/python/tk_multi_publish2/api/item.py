@@ -8,21 +8,29 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
-import inspect
 import os
+import sys
 import tempfile
 
 import sgtk
 
 from .data import PublishData
 from .task import PublishTask
+from .plugins.instance_base import get_executing_hook
 
 logger = sgtk.platform.get_logger(__name__)
 
 _qt_pixmap_is_usable = None
 
+# lookup of image file identity, ie. (path, modification time, size), to the
+# result of its validation. loading an image to validate it is expensive and
+# the same images are typically validated every time files are collected.
+# only the most recently validated images are kept.
+_validated_images = OrderedDict()
+_MAX_VALIDATED_IMAGES = 1000
+
 
 def _is_qt_pixmap_usable():
     """
@@ -499,6 +507,17 @@ class PublishItem(object):
         if not _is_qt_pixmap_usable():
             return path
 
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            # not a file on disk, this could be a Qt resource path.
+            image_key = None
+        else:
+            image_key = (path, stat_result.st_mtime_ns, stat_result.st_size)
+            if image_key in _validated_images:
+                _validated_images.move_to_end(image_key)
+                return path if _validated_images[image_key] else None
+
         # defer import until needed and to avoid issues when running without UI
         from sgtk.platform.qt import QtGui
 
@@ -507,8 +526,14 @@ class PublishItem(object):
         except Exception as e:
             logger.warning("%r: Could not load icon '%s': %s" % (self, path, e))
             return None
-        else:
-            return None if icon.isNull() else path
+
+        is_valid = not icon.isNull()
+        if image_key:
+            _validated_images[image_key] = is_valid
+            while len(_validated_images) > _MAX_VALIDATED_IMAGES:
+                _validated_images.popitem(last=False)
+
+        return path if is_valid else None
 
     @property
     def active(self):
@@ -1023,19 +1048,25 @@ class PublishItem(object):
         """
         Return properties local to the currently executing publish plugin.
 
-        This is done by walking up the call stack to find a caller that is a
-        Hook. This method will raise if no caller in the stack is a hook.
+        The plugin instances register their hook while the publisher runs one
+        of its methods, so the plugin is usually known without any lookup.
+        When accessed from outside such a call, this falls back to walking up
+        the call stack to find a caller that is a Hook. This method will raise
+        if no hook can be found.
         """
 
-        hook_object = None
+        hook_object = get_executing_hook()
 
-        for frame_record in inspect.stack():
-            frame_object = frame_record[0]
-            if frame_object:
+        if hook_object is None:
+            # only the raw frames are needed here. inspect.stack() would also
+            # build the source context for every frame, which is very slow.
+            frame_object = sys._getframe(1)
+            while frame_object:
                 calling_object = frame_object.f_locals.get("self")
                 if calling_object and isinstance(calling_object, sgtk.hook.Hook):
                     hook_object = calling_object
                     break
+                frame_object = frame_object.f_back
 
         if not hook_object:
             raise AttributeError(
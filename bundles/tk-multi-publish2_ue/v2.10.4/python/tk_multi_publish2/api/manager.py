@@ -8,12 +8,18 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
-import fnmatch
+from collections import Counter
+import hashlib
+import json
 
 import sgtk
 
 from .tree import PublishTree
-from .plugins import CollectorPluginInstance, PublishPluginInstance
+from .plugins import (
+    CollectorPluginInstance,
+    PublishPluginIndex,
+    PublishPluginInstance,
+)
 
 logger = sgtk.platform.get_logger(__name__)
 
@@ -29,6 +35,8 @@ class PublishManager(object):
         "_tree",
         "_collector_instance",
         "_processed_contexts",
+        "_plugin_indexes",
+        "_plugin_cache_stats",
         "_post_phase_hook",
     ]
 
@@ -74,9 +82,17 @@ class PublishManager(object):
         # collector instance for this context
         self._collector_instance = None
 
-        # a lookup of context to publish plugins.
+        # a lookup of context to the dispatch index of its publish plugins.
         self._processed_contexts = {}
 
+        # a lookup of plugin settings fingerprint to the dispatch index of the
+        # plugins created for these settings. contexts resolving to the same
+        # settings share the same plugin instances.
+        self._plugin_indexes = {}
+
+        # hit/miss counts for the caches above.
+        self._plugin_cache_stats = Counter()
+
         # initialize the collector plugin
         logger.debug("Loading collector plugin...")
         self._load_collector()
@@ -437,23 +453,20 @@ class PublishManager(object):
 
             item_context = item.context
 
-            context_plugins = self._load_publish_plugins(item_context)
+            plugin_index = self._get_plugin_index(item_context)
             logger.debug(
                 "Offering %s plugins for context: %s"
-                % (len(context_plugins), item_context)
+                % (len(plugin_index.plugins), item_context)
             )
 
-            for context_plugin in context_plugins:
-
-                logger.debug("Checking plugin: %s" % (context_plugin,))
-
-                if not self._item_filters_match(item, context_plugin):
-                    continue
+            # only the plugins with item filters matching the item's type are
+            # considered. the index caches this per type.
+            for context_plugin in plugin_index.get_candidate_plugins(item.type_spec):
 
-                logger.debug("Running plugin acceptance method...")
+                logger.debug("Running plugin acceptance method: %s" % (context_plugin,))
 
                 # item/filters matched. now see if the plugin accepts
-                accept_data = context_plugin.run_accept(item)
+                accept_data = plugin_index.run_accept(context_plugin, item)
 
                 if accept_data.get("accepted"):
                     logger.debug("Plugin accepted the item.")
@@ -464,31 +477,6 @@ class PublishManager(object):
                 else:
                     logger.debug("Plugin did not accept the item.")
 
-    def _item_filters_match(self, item, publish_plugin):
-        """
-        Returns ``True`` if the supplied item's type specification matches
-        the publish plugin's item filters.
-
-        :param item: The item to compare
-        :param publish_plugin: The publish plugin instance to compare
-        """
-
-        for item_filter in publish_plugin.item_filters:
-            if fnmatch.fnmatch(item.type_spec, item_filter):
-                # there is a match!
-                logger.debug(
-                    "Item %s with spec '%s' matches plugin filters: '%s'"
-                    % (item, item.type_spec, item_filter)
-                )
-                return True
-
-        # no filters match the item's type
-        logger.debug(
-            "Item %s with spec '%s' does not match any plugin filters: '%s'"
-            % (item, item.type_spec, publish_plugin.item_filters)
-        )
-        return False
-
     def _load_collector(self):
         """
         Load the collector plugin for the current bundle configuration/context.
@@ -501,59 +489,126 @@ class PublishManager(object):
             collector_hook_path, collector_settings, self.logger
         )
 
+    def _get_plugin_index(self, context):
+        """
+        Given a context, returns the dispatch index of the corresponding,
+        configured publish plugins.
+
+        Plugin instances are shared between all contexts resolving to the same
+        publish plugin settings.
+
+        :returns: A :class:`PublishPluginIndex` instance.
+        """
+
+        # return the cached index if the context has already been processed
+        if context in self._processed_contexts:
+            self._plugin_cache_stats["context_hits"] += 1
+            return self._processed_contexts[context]
+
+        self._plugin_cache_stats["context_misses"] += 1
+
+        plugin_settings = self._get_plugin_settings(context)
+        settings_fingerprint = self._get_settings_fingerprint(plugin_settings)
+
+        plugin_index = self._plugin_indexes.get(settings_fingerprint)
+        if plugin_index is None:
+            self._plugin_cache_stats["settings_misses"] += 1
+            plugin_index = PublishPluginIndex(
+                self._create_publish_plugins(plugin_settings)
+            )
+            self._plugin_indexes[settings_fingerprint] = plugin_index
+        else:
+            self._plugin_cache_stats["settings_hits"] += 1
+            logger.debug(
+                "Reusing publish plugins with identical settings for context: %s"
+                % (context,)
+            )
+
+        self._processed_contexts[context] = plugin_index
+
+        logger.debug(
+            "Publish plugin cache stats: %s" % (dict(self._plugin_cache_stats),)
+        )
+
+        return plugin_index
+
     def _load_publish_plugins(self, context):
         """
         Given a context, this method load the corresponding, configured publish
         plugins.
         """
+        return self._get_plugin_index(context).plugins
 
-        # return the cached plugins if the context has already been processed
-        if context in self._processed_contexts:
-            return self._processed_contexts[context]
+    def _get_plugin_settings(self, context):
+        """
+        Given a context, returns the publish plugin definitions configured for
+        it.
 
-        engine = self._bundle.engine
+        :returns: A list of publish plugin definition dictionaries.
+        """
 
         if context == self._bundle.context:
             # if the context matches the bundle, we don't need to do any extra
             # work since the settings are already accessible
             logger.debug("Finding publish plugin settings for context: %s" % (context,))
-            plugin_settings = self._bundle.get_setting(self.CONFIG_PLUGIN_DEFINITIONS)
-        else:
-            # load the plugins from the supplied context. this means executing
-            # the pick environment hook and reading from disk. this is why we
-            # cache the plugins.
-            logger.debug(
-                "Finding publish plugin settings via pick_environment for context: %s"
-                % (context,)
-            )
-            context_settings = sgtk.platform.engine.find_app_settings(
-                engine.name,
-                self._bundle.name,
-                self._bundle.sgtk,
-                context,
-                engine_instance_name=engine.instance_name,
-            )
+            return self._bundle.get_setting(self.CONFIG_PLUGIN_DEFINITIONS)
 
-            app_settings = None
-            if len(context_settings) > 1:
-                # There's more than one instance of that app for the engine
-                # instance, so we'll need to deterministically pick one. We'll
-                # pick the one with the same application instance name as the
-                # current app instance.
-                for settings in context_settings:
-                    if settings.get("app_instance") == self._bundle.instance_name:
-                        app_settings = settings.get("settings")
-            elif len(context_settings) == 1:
-                app_settings = context_settings[0].get("settings")
-
-            if app_settings:
-                plugin_settings = app_settings[self.CONFIG_PLUGIN_DEFINITIONS]
-            else:
-                logger.debug(
-                    "Could not find publish plugin settings for context: %s"
-                    % (context,)
-                )
-                plugin_settings = []
+        # load the settings from the supplied context. this means executing
+        # the pick environment hook and reading from disk. the environment's
+        # includes and the validation of the settings depend on the context,
+        # so this can't be shared between contexts. the plugins created from
+        # the settings are, see _get_plugin_index.
+        logger.debug(
+            "Finding publish plugin settings via pick_environment for context: %s"
+            % (context,)
+        )
+        engine = self._bundle.engine
+        context_settings = sgtk.platform.engine.find_app_settings(
+            engine.name,
+            self._bundle.name,
+            self._bundle.sgtk,
+            context,
+            engine_instance_name=engine.instance_name,
+        )
+
+        app_settings = None
+        if len(context_settings) > 1:
+            # There's more than one instance of that app for the engine
+            # instance, so we'll need to deterministically pick one. We'll
+            # pick the one with the same application instance name as the
+            # current app instance.
+            for settings in context_settings:
+                if settings.get("app_instance") == self._bundle.instance_name:
+                    app_settings = settings.get("settings")
+        elif len(context_settings) == 1:
+            app_settings = context_settings[0].get("settings")
+
+        if app_settings:
+            return app_settings[self.CONFIG_PLUGIN_DEFINITIONS]
+
+        logger.debug(
+            "Could not find publish plugin settings for context: %s" % (context,)
+        )
+        return []
+
+    def _get_settings_fingerprint(self, plugin_settings):
+        """
+        Returns a string uniquely identifying the supplied publish plugin
+        definitions.
+
+        :param list plugin_settings: A list of publish plugin definitions.
+        """
+        serialized_settings = json.dumps(plugin_settings, sort_keys=True, default=str)
+        return hashlib.sha1(serialized_settings.encode("utf-8")).hexdigest()
+
+    def _create_publish_plugins(self, plugin_settings):
+        """
+        Creates the publish plugin instances for the supplied plugin
+        definitions.
+
+        :param list plugin_settings: A list of publish plugin definitions.
+        :returns: A list of :class:`PublishPluginInstance` objects.
+        """
 
         # build up a list of all configured publish plugins here
         plugins = []
@@ -576,9 +631,6 @@ class PublishManager(object):
             plugins.append(plugin_instance)
             logger.debug("Created publish plugin: %s" % (plugin_instance,))
 
-        # ensure the plugins are cached
-        self._processed_contexts[context] = plugins
-
         return plugins
 
     def _path_already_collected(self, file_path):
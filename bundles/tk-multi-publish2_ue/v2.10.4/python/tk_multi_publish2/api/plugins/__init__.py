@@ -10,4 +10,5 @@
 
 from .collector_instance import CollectorPluginInstance  # noqa
 from .publish_plugin_instance import PublishPluginInstance  # noqa
+from .plugin_index import PublishPluginIndex  # noqa
 from .setting import PluginSetting  # noqa
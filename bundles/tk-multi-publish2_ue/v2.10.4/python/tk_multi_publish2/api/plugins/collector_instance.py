@@ -47,14 +47,15 @@ class CollectorPluginInstance(PluginInstanceBase):
         :returns: None (item creation handles parenting)
         """
         try:
-            if hasattr(self._hook_instance.__class__, "settings"):
-                # this hook has a 'settings' property defined. it is expecting
-                # 'settings' to be passed to the processing method.
-                return self._hook_instance.process_file(self.settings, item, path)
-            else:
-                # the hook hasn't been updated to handle collector settings.
-                # call the method without a settings argument
-                return self._hook_instance.process_file(item, path)
+            with self._executing_hook():
+                if hasattr(self._hook_instance.__class__, "settings"):
+                    # this hook has a 'settings' property defined. it is
+                    # expecting 'settings' to be passed to the processing method.
+                    return self._hook_instance.process_file(self.settings, item, path)
+                else:
+                    # the hook hasn't been updated to handle collector settings.
+                    # call the method without a settings argument
+                    return self._hook_instance.process_file(item, path)
         except Exception:
             error_msg = traceback.format_exc()
             logger.error("Error running process_file for %s. %s" % (self, error_msg))
@@ -68,14 +69,17 @@ class CollectorPluginInstance(PluginInstanceBase):
         :returns: None (item creation handles parenting)
         """
         try:
-            if hasattr(self._hook_instance.__class__, "settings"):
-                # this hook has a 'settings' property defined. it is expecting
-                # 'settings' to be passed to the processing method.
-                return self._hook_instance.process_current_session(self.settings, item)
-            else:
-                # the hook hasn't been updated to handle collector settings.
-                # call the method without a settings argument
-                return self._hook_instance.process_current_session(item)
+            with self._executing_hook():
+                if hasattr(self._hook_instance.__class__, "settings"):
+                    # this hook has a 'settings' property defined. it is
+                    # expecting 'settings' to be passed to the processing method.
+                    return self._hook_instance.process_current_session(
+                        self.settings, item
+                    )
+                else:
+                    # the hook hasn't been updated to handle collector settings.
+                    # call the method without a settings argument
+                    return self._hook_instance.process_current_session(item)
         except Exception:
             error_msg = traceback.format_exc()
             logger.error(
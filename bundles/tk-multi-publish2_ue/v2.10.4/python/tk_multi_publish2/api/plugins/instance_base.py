@@ -8,11 +8,33 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import threading
+from contextlib import contextmanager
+
 import sgtk
 from .setting import PluginSetting
 
 logger = sgtk.platform.get_logger(__name__)
 
+# per-thread stack of the hook instances currently being executed through a
+# plugin instance. this lets items look up the running plugin directly instead
+# of inspecting the call stack every time local properties are accessed.
+_execution_state = threading.local()
+
+
+def get_executing_hook():
+    """
+    Returns the hook instance currently being executed by a plugin instance
+    on this thread.
+
+    :returns: The innermost executing hook instance or ``None`` if no plugin
+        method is being run.
+    """
+    hook_stack = getattr(_execution_state, "hook_stack", None)
+    if hook_stack:
+        return hook_stack[-1]
+    return None
+
 
 class PluginInstanceBase(object):
     """
@@ -67,6 +89,25 @@ class PluginInstanceBase(object):
         """
         return "<%s: %s>" % (self.__class__.__name__, self._path)
 
+    @contextmanager
+    def _executing_hook(self):
+        """
+        Creates a scope during which this plugin's hook is registered as the
+        currently executing hook for the calling thread.
+
+        Scopes can be nested, the innermost hook being the one reported by
+        :func:`get_executing_hook`.
+        """
+        hook_stack = getattr(_execution_state, "hook_stack", None)
+        if hook_stack is None:
+            hook_stack = _execution_state.hook_stack = []
+
+        hook_stack.append(self._hook_instance)
+        try:
+            yield
+        finally:
+            hook_stack.pop()
+
     def _validate_and_resolve_config(self):
         """
         Init helper method.
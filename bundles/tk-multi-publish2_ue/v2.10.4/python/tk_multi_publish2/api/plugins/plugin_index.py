@@ -0,0 +1,126 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import fnmatch
+import os
+import re
+
+import sgtk
+
+logger = sgtk.platform.get_logger(__name__)
+
+
+class PublishPluginIndex(object):
+    """
+    Dispatch index for a set of publish plugin instances.
+
+    The item filters of each plugin are compiled once when the index is built
+    and the plugins matching a given item type are remembered, so attaching
+    many items of the same type does not match every filter of every plugin
+    over and over again.
+    """
+
+    __slots__ = [
+        "_plugins",
+        "_filter_regexes",
+        "_candidates_by_type",
+        "_accept_results",
+    ]
+
+    def __init__(self, plugins):
+        """
+        :param list plugins: The :class:`PublishPluginInstance` objects to index.
+        """
+        self._plugins = plugins
+
+        # one compiled expression per plugin, matching any of its filters.
+        self._filter_regexes = [
+            self._compile_item_filters(plugin.item_filters) for plugin in plugins
+        ]
+
+        # lookup of item type to the list of plugins with a matching filter
+        self._candidates_by_type = {}
+
+        # lookup of (plugin, item type) to accept results, for plugins that
+        # declared their acceptance to only depend on the item type.
+        self._accept_results = {}
+
+    @property
+    def plugins(self):
+        """
+        The list of indexed publish plugin instances.
+        """
+        return self._plugins
+
+    def get_candidate_plugins(self, type_spec):
+        """
+        Returns the plugins whose item filters match the supplied item type.
+
+        :param str type_spec: The item type to match.
+        :returns: A list of publish plugin instances, in configuration order.
+        """
+        candidates = self._candidates_by_type.get(type_spec)
+
+        if candidates is None:
+            normalized_type_spec = os.path.normcase(type_spec)
+            candidates = [
+                plugin
+                for (plugin, filter_regex) in zip(self._plugins, self._filter_regexes)
+                if filter_regex and filter_regex.match(normalized_type_spec)
+            ]
+            logger.debug(
+                "Plugins matching item type '%s': %s" % (type_spec, candidates)
+            )
+            self._candidates_by_type[type_spec] = candidates
+
+        return candidates
+
+    def run_accept(self, plugin, item):
+        """
+        Runs the plugin's acceptance logic for the supplied item.
+
+        The result is reused for other items of the same type if the plugin
+        declared its acceptance as cacheable.
+
+        :param plugin: The publish plugin instance to run.
+        :param item: The item to accept.
+        :returns: dictionary with boolean keys accepted/visible/enabled/checked
+        """
+        if not plugin.accept_cacheable:
+            return plugin.run_accept(item)
+
+        key = (plugin, item.type_spec)
+        if key not in self._accept_results:
+            self._accept_results[key] = plugin.run_accept(item)
+        else:
+            logger.debug("Reusing acceptance result of %s for %s" % (plugin, item))
+
+        return self._accept_results[key]
+
+    def _compile_item_filters(self, item_filters):
+        """
+        Compiles a list of item filters into a single regular expression.
+
+        Matching follows the rules of :func:`fnmatch.fnmatch`, including the
+        case normalization of the current platform.
+
+        :param list item_filters: A list of item type wildcard strings.
+        :returns: A compiled regular expression or ``None`` if there are no
+            filters.
+        """
+        if not item_filters:
+            return None
+
+        return re.compile(
+            "|".join(
+                "(?:%s)" % fnmatch.translate(os.path.normcase(item_filter))
+                for item_filter in item_filters
+            )
+        )
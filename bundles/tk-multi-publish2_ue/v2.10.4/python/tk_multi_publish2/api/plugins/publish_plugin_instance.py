@@ -118,6 +118,20 @@ class PublishPluginInstance(PluginInstanceBase):
         except AttributeError:
             return []
 
+    @property
+    def accept_cacheable(self):
+        """
+        ``True`` if the plugin declared that its acceptance of an item only
+        depends on the item's type, ``False`` otherwise.
+        """
+        value = False
+        try:
+            value = self._hook_instance.accept_cacheable
+        except AttributeError:
+            pass
+
+        return value is True
+
     @property
     def has_custom_ui(self):
         """
@@ -147,7 +161,8 @@ class PublishPluginInstance(PluginInstanceBase):
         """
 
         try:
-            return self._hook_instance.accept(self.settings, item)
+            with self._executing_hook():
+                return self._hook_instance.accept(self.settings, item)
         except Exception:
             error_msg = traceback.format_exc()
             self._logger.error(
@@ -303,7 +318,8 @@ class PublishPluginInstance(PluginInstanceBase):
         try:
             # Execute's the code inside the with statement. Any errors will be
             # caught and logged and the events will be processed
-            yield
+            with self._executing_hook():
+                yield
         except Exception as e:
             exception_msg = traceback.format_exc()
             self._logger.error(
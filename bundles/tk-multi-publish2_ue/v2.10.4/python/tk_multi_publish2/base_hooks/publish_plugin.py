@@ -220,6 +220,19 @@ class PublishPlugin(HookBaseClass):
         """
         raise NotImplementedError
 
+    @property
+    def accept_cacheable(self):
+        """
+        A :class:`bool` indicating if the result of :meth:`accept` only depends
+        on the item's type.
+
+        When ``True``, the publisher will call :meth:`accept` once per item
+        type and reuse the result for every other item of that type, whatever
+        its context or properties. Plugins that inspect the item or modify it
+        in :meth:`accept` must leave this to ``False``, which is the default.
+        """
+        return False
+
     ############################################################################
     # Publish processing methods
 
@@ -0,0 +1,217 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import hashlib
+import os
+
+import sgtk
+
+logger = sgtk.platform.get_logger(__name__)
+
+
+class ThumbnailCache(object):
+    """
+    A size bounded, on disk cache of generated thumbnails.
+
+    Thumbnails are stored as jpeg files named after the identity of their
+    source file, ie. its path, modification time and size. Any change to the
+    source file therefore results in a new entry. Thumbnails with an alpha
+    channel are stored as png files instead, since jpeg files can't hold the
+    alpha channel. When the cache grows over its maximum size, the least
+    recently used thumbnails are removed.
+    """
+
+    # default maximum size of the cache on disk, in bytes.
+    DEFAULT_MAX_SIZE = 200 * 1024 * 1024
+
+    # extensions and file formats of the thumbnails, for opaque thumbnails
+    # and thumbnails with an alpha channel.
+    THUMBNAIL_FORMATS = {".jpg": "JPG", ".png": "PNG"}
+    OPAQUE_EXTENSION = ".jpg"
+    ALPHA_EXTENSION = ".png"
+
+    def __init__(self, cache_folder, max_size=DEFAULT_MAX_SIZE):
+        """
+        :param str cache_folder: The folder to store the thumbnails in.
+        :param int max_size: The maximum size of the cache on disk, in bytes.
+        """
+        self._cache_folder = cache_folder
+        self._max_size = max_size
+
+        # total size of the cached thumbnails. computed on first addition.
+        self._total_size = None
+
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @property
+    def cache_folder(self):
+        """
+        The folder the thumbnails are stored in.
+        """
+        return self._cache_folder
+
+    @property
+    def stats(self):
+        """
+        A dictionary with the number of cache hits, misses and evictions.
+        """
+        return dict(self._stats)
+
+    def get(self, source_path):
+        """
+        Returns the path to the cached thumbnail of the supplied file.
+
+        :param str source_path: Path to the file the thumbnail was generated
+            from.
+
+        :returns: The path to the cached thumbnail or ``None`` if the file has
+            no thumbnail in the cache.
+        """
+        thumbnail_base_path = self._get_thumbnail_base_path(source_path)
+
+        thumbnail_path = None
+        if thumbnail_base_path is not None:
+            for extension in self.THUMBNAIL_FORMATS:
+                if os.path.isfile(thumbnail_base_path + extension):
+                    thumbnail_path = thumbnail_base_path + extension
+                    break
+
+        if thumbnail_path is None:
+            self._stats["misses"] += 1
+            logger.debug("Thumbnail cache miss for %s" % (source_path,))
+            return None
+
+        self._stats["hits"] += 1
+        logger.debug("Thumbnail cache hit for %s" % (source_path,))
+
+        # bump the modification time, which is used to find the least recently
+        # used thumbnails when evicting.
+        try:
+            os.utime(thumbnail_path, None)
+        except OSError:
+            pass
+
+        return thumbnail_path
+
+    def add(self, source_path, pixmap):
+        """
+        Stores the thumbnail generated for the supplied file.
+
+        :param str source_path: Path to the file the thumbnail was generated
+            from.
+        :param pixmap: The thumbnail to store.
+        :type pixmap: :class:`QtGui.QPixmap`
+
+        :returns: The path to the cached thumbnail or ``None`` if it could not
+            be stored.
+        """
+        thumbnail_base_path = self._get_thumbnail_base_path(source_path)
+        if thumbnail_base_path is None or pixmap is None or pixmap.isNull():
+            return None
+
+        if pixmap.hasAlphaChannel():
+            extension = self.ALPHA_EXTENSION
+        else:
+            extension = self.OPAQUE_EXTENSION
+        thumbnail_path = thumbnail_base_path + extension
+
+        try:
+            sgtk.util.filesystem.ensure_folder_exists(self._cache_folder)
+        except Exception as e:
+            logger.warning(
+                "Could not create thumbnail cache folder %s: %s"
+                % (self._cache_folder, e)
+            )
+            return None
+
+        if self._total_size is None:
+            self._total_size = sum(
+                size for (_, _, size) in self._get_cached_thumbnails()
+            )
+
+        if not pixmap.save(thumbnail_path, self.THUMBNAIL_FORMATS[extension]):
+            logger.warning("Could not cache thumbnail for %s" % (source_path,))
+            return None
+
+        self._total_size += os.path.getsize(thumbnail_path)
+        if self._total_size > self._max_size:
+            self._evict(keep_path=thumbnail_path)
+
+        return thumbnail_path
+
+    def _get_thumbnail_base_path(self, source_path):
+        """
+        Returns the path, without extension, the thumbnail of the supplied file
+        is cached at.
+
+        :param str source_path: Path to the file the thumbnail was generated
+            from.
+
+        :returns: A path or ``None`` if the file can't be accessed.
+        """
+        try:
+            stat_result = os.stat(source_path)
+        except OSError:
+            return None
+
+        identity = "%s|%d|%d" % (
+            os.path.normcase(os.path.abspath(source_path)),
+            stat_result.st_mtime_ns,
+            stat_result.st_size,
+        )
+        return os.path.join(
+            self._cache_folder, hashlib.sha1(identity.encode("utf-8")).hexdigest()
+        )
+
+    def _get_cached_thumbnails(self):
+        """
+        Lists the thumbnails currently in the cache.
+
+        :returns: A list of (path, modification time, size) tuples.
+        """
+        thumbnails = []
+        try:
+            entries = list(os.scandir(self._cache_folder))
+        except OSError:
+            return thumbnails
+
+        for entry in entries:
+            if os.path.splitext(entry.name)[1] not in self.THUMBNAIL_FORMATS:
+                continue
+            try:
+                stat_result = entry.stat()
+            except OSError:
+                continue
+            thumbnails.append((entry.path, stat_result.st_mtime, stat_result.st_size))
+
+        return thumbnails
+
+    def _evict(self, keep_path=None):
+        """
+        Removes the least recently used thumbnails until the cache fits in its
+        maximum size.
+
+        :param str keep_path: Path of a thumbnail that should not be removed.
+        """
+        thumbnails = sorted(self._get_cached_thumbnails(), key=lambda t: t[1])
+        self._total_size = sum(size for (_, _, size) in thumbnails)
+
+        for thumbnail_path, _, size in thumbnails:
+            if self._total_size <= self._max_size:
+                break
+            if thumbnail_path == keep_path:
+                continue
+            try:
+                os.remove(thumbnail_path)
+            except OSError as e:
+                logger.debug("Could not evict thumbnail %s: %s" % (thumbnail_path, e))
+                continue
+            self._total_size -= size
+            self._stats["evictions"] += 1
@@ -13,9 +13,14 @@ import pprint
 
 import sgtk
 
+from .thumbnail_cache import ThumbnailCache
+
 # create a logger to use throughout
 logger = sgtk.platform.get_logger(__name__)
 
+# the cache of generated thumbnails, created on first use
+_thumbnail_cache = None
+
 
 # ---- file/path util functions
 
@@ -402,15 +407,55 @@ def get_thumbnail(path, context):
     :param context: The context to help determine engine software locations in order to
         discover thumbnail extraction tools.
 
+    Generated thumbnails are cached on disk, keyed by the path, modification
+    time and size of the file. The thumbnail generator hook is not executed if
+    the file already has a thumbnail in the cache.
+
     :return: The generated thumbnail.
     :rtype: QtGui.QPixmap
     """
 
+    publisher = sgtk.platform.current_bundle()
+    thumbnail_cache = get_thumbnail_cache()
+
+    cached_thumbnail_path = thumbnail_cache.get(path)
+    if cached_thumbnail_path:
+        # defer import until needed and to avoid issues when running without UI
+        from sgtk.platform.qt import QtGui
+
+        return QtGui.QPixmap(cached_thumbnail_path)
+
     # the logic for this method lives in a hook that can be overridden by
     # clients. exposing the method here in the publish utils api prevents
     # clients from having to call other hooks directly in their
     # collector/publisher hook implementations.
-    publisher = sgtk.platform.current_bundle()
-    return publisher.execute_hook_method(
+    thumbnail = publisher.execute_hook_method(
         "thumbnail_generator", "generate_thumbnail", input_path=path, context=context
     )
+
+    if thumbnail is not None:
+        thumbnail_cache.add(path, thumbnail)
+
+    logger.debug("Thumbnail cache stats: %s" % (thumbnail_cache.stats,))
+
+    return thumbnail
+
+
+def get_thumbnail_cache():
+    """
+    Returns the cache of generated thumbnails used by :func:`get_thumbnail`.
+
+    The thumbnails are stored in the ``thumbnails`` folder of the publisher's
+    cache location.
+
+    :rtype: :class:`ThumbnailCache`
+    """
+    global _thumbnail_cache
+
+    if _thumbnail_cache is None:
+        publisher = sgtk.platform.current_bundle()
+        _thumbnail_cache = ThumbnailCache(
+            os.path.join(publisher.cache_location, "thumbnails")
+        )
+
+    return _thumbnail_cache
@@ -0,0 +1,67 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import mimetypes
+import os
+from unittest import mock
+
+from publish_api_test_base import PublishApiTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+
+class TestBasicCollector(PublishApiTestBase):
+    def _create_hook(self):
+        # We'll be coming from the fixtures' hooks dir, `REPO_ROOT/tests/fixtures/config/hooks`,
+        # so we'll need to go up 4 levels.
+        rel_repo_root = os.path.join(*("..",) * 4)
+        return self.engine.create_hook_instance(
+            os.path.join(rel_repo_root, "hooks", "collector"),
+            base_class=self.app.base_hooks.CollectorPlugin,
+        )
+
+    def test_get_item_info(self):
+        """
+        Ensures files are identified through the common file info, whatever
+        the case or number of parts of their extension.
+        """
+        hook_instance = self._create_hook()
+        hook_instance.common_file_info["Houdini Geometry"] = {
+            "extensions": ["bgeo.sc"],
+            "icon": hook_instance._get_icon_path("houdini.png"),
+            "item_type": "file.houdini.geometry",
+        }
+
+        for file_name, item_type in [
+            ("render.exr", "file.image"),
+            ("render.0001.EXR", "file.image"),
+            ("scene.Ma", "file.maya"),
+            ("geo.0001.bgeo.sc", "file.houdini.geometry"),
+        ]:
+            item_info = hook_instance._get_item_info(
+                os.path.join(self.tank_temp, file_name)
+            )
+            self.assertEqual(item_info["item_type"], item_type)
+
+    def test_mimetype_fallback(self):
+        """
+        Ensures the mimetype of an extension is only guessed once.
+        """
+        hook_instance = self._create_hook()
+
+        with mock.patch(
+            "mimetypes.guess_type", wraps=mimetypes.guess_type
+        ) as guess_type:
+            for file_name in ["a.jpg", "b.jpg", "c.0001.jpg"]:
+                item_info = hook_instance._get_item_info(
+                    os.path.join(self.tank_temp, file_name)
+                )
+                self.assertEqual(item_info["item_type"], "file.image")
+
+            self.assertEqual(guess_type.call_count, 1)
@@ -10,6 +10,7 @@
 
 import os
 import tempfile
+import time
 
 from publish_api_test_base import PublishApiTestBase
 from tank_test.tank_test_base import temp_env_var
@@ -144,6 +145,51 @@ class TestPublishItem(PublishApiTestBase):
         # Instantiating the class will run the rest defined above.
         PropertyTesting()
 
+    def test_local_properties_during_plugin_execution(self):
+        """
+        Ensures local properties resolve to the plugin currently run by the
+        publisher, without requiring a Hook in the call stack.
+        """
+        test = self
+        item = self.PublishItem("test", "test", "test")
+        nb_accesses = 10000
+
+        def accept(settings, accepted_item):
+            accepted_item.local_properties["test"] = accepted_item.name
+            test.assertEqual(accepted_item.local_properties["test"], "test")
+
+            start = time.perf_counter()
+            for _ in range(nb_accesses):
+                accepted_item.local_properties
+            elapsed = time.perf_counter() - start
+            logger.info(
+                "local_properties access: %.3f usec per access"
+                % (elapsed * 1e6 / nb_accesses)
+            )
+            return {"accepted": True}
+
+        with patch.object(
+            self.PublishPluginInstance, "_create_hook_instance"
+        ) as create_hook_instance:
+            create_hook_instance.return_value = MagicMock(id="plugin_a", accept=accept)
+            plugin_a = self.PublishPluginInstance("plugin a", None, {}, logger)
+            create_hook_instance.return_value = MagicMock(id="plugin_b", accept=accept)
+            plugin_b = self.PublishPluginInstance("plugin b", None, {}, logger)
+
+        self.assertEqual(plugin_a.run_accept(item), {"accepted": True})
+        self.assertEqual(plugin_b.run_accept(item), {"accepted": True})
+
+        # Each plugin got its own set of local properties.
+        self.assertEqual(item._local_properties["plugin_a"]["test"], "test")
+        self.assertEqual(item._local_properties["plugin_b"]["test"], "test")
+
+        # Once the plugin is done executing, local properties are not
+        # accessible anymore.
+        with self.assertRaisesRegex(
+            AttributeError, "Could not determine the current publish plugin when"
+        ):
+            item.local_properties["test"]
+
     def test_item_lifescope(self):
         """
         Ensures items can be added and removed properly.
@@ -13,7 +13,9 @@ import os
 from publish_api_test_base import PublishApiTestBase
 from tank_test.tank_test_base import setUpModule  # noqa
 
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
+
+import sgtk
 
 
 class TestManager(PublishApiTestBase):
@@ -139,3 +141,90 @@ class TestManager(PublishApiTestBase):
 
         with self.assertRaisesRegex(Exception, "Test error!"):
             self.manager.publish(test_nodes())
+
+    def test_plugin_index_dispatch(self):
+        """
+        Ensures the plugin index matches item filters like fnmatch and only
+        runs cacheable accept methods once per item type.
+        """
+        maya_plugin = MagicMock(
+            item_filters=["maya.*", "file.maya"],
+            accept_cacheable=True,
+            run_accept=Mock(return_value={"accepted": True}),
+        )
+        file_plugin = MagicMock(
+            item_filters=["file.*"],
+            accept_cacheable=False,
+            run_accept=Mock(return_value={"accepted": False}),
+        )
+        no_filter_plugin = MagicMock(item_filters=[], accept_cacheable=False)
+
+        plugin_index = self.api.plugins.PublishPluginIndex(
+            [maya_plugin, file_plugin, no_filter_plugin]
+        )
+
+        self.assertEqual(
+            plugin_index.get_candidate_plugins("maya.session"), [maya_plugin]
+        )
+        self.assertEqual(
+            plugin_index.get_candidate_plugins("file.maya"),
+            [maya_plugin, file_plugin],
+        )
+        self.assertEqual(
+            plugin_index.get_candidate_plugins("file.image"), [file_plugin]
+        )
+        self.assertEqual(plugin_index.get_candidate_plugins("nuke.session"), [])
+
+        items = [
+            self.PublishItem("item %d" % i, "maya.session", "Maya Session")
+            for i in range(100)
+        ]
+        for item in items:
+            self.assertEqual(
+                plugin_index.run_accept(maya_plugin, item), {"accepted": True}
+            )
+            self.assertEqual(
+                plugin_index.run_accept(file_plugin, item), {"accepted": False}
+            )
+
+        # Only the cacheable plugin had its accept method memoized.
+        maya_plugin.run_accept.assert_called_once_with(items[0])
+        self.assertEqual(file_plugin.run_accept.call_count, len(items))
+
+    def test_plugins_shared_between_contexts(self):
+        """
+        Ensures contexts resolving to the same publish plugin settings share
+        their publish plugins, and settings are only looked up once per context.
+        """
+        shots = [
+            {"type": "Shot", "id": shot_id, "code": "shot_%d" % shot_id}
+            for shot_id in (1, 2)
+        ]
+        for shot in shots:
+            shot["project"] = self.project
+        self.add_to_sg_mock_db(shots)
+
+        contexts = [
+            self.tk.context_from_entity(shot["type"], shot["id"]) for shot in shots
+        ]
+
+        with patch.object(
+            sgtk.platform.engine,
+            "find_app_settings",
+            wraps=sgtk.platform.engine.find_app_settings,
+        ) as find_app_settings:
+            plugins = [self.manager._load_publish_plugins(c) for c in contexts]
+
+            # Known contexts are returned directly.
+            self.assertIs(self.manager._load_publish_plugins(contexts[0]), plugins[0])
+
+            # The settings are validated against each context.
+            self.assertEqual(find_app_settings.call_count, len(contexts))
+            for call, context in zip(find_app_settings.call_args_list, contexts):
+                self.assertIs(call[0][3], context)
+
+        # Both contexts get the same plugin instances.
+        self.assertIs(plugins[0], plugins[1])
+
+        stats = self.manager._plugin_cache_stats
+        self.assertEqual(stats["context_hits"], 1)
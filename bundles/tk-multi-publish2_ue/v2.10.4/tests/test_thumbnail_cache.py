@@ -0,0 +1,109 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import shutil
+
+from publish_api_test_base import PublishApiTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+from unittest.mock import patch
+
+
+class TestThumbnailCache(PublishApiTestBase):
+    def setUp(self):
+        super().setUp()
+        tk_multi_publish2 = self.app.import_module("tk_multi_publish2")
+        self.ThumbnailCache = tk_multi_publish2.thumbnail_cache.ThumbnailCache
+        self.util = tk_multi_publish2.util
+        self.cache_folder = os.path.join(self.tank_temp, "thumbnail_cache")
+
+    def _copy_source(self, name):
+        source_path = os.path.join(self.tank_temp, name)
+        shutil.copy(self.image_path, source_path)
+        return source_path
+
+    def test_hit_and_miss(self):
+        """
+        Ensures thumbnails are served from the cache until the source changes.
+        """
+        cache = self.ThumbnailCache(self.cache_folder)
+        source_path = self._copy_source("source.png")
+
+        self.assertIsNone(cache.get(source_path))
+        cached_path = cache.add(source_path, self.image)
+        self.assertTrue(os.path.isfile(cached_path))
+        self.assertEqual(cache.get(source_path), cached_path)
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1, "evictions": 0})
+
+        # Modifying the source invalidates the cached thumbnail.
+        with open(source_path, "ab") as source_file:
+            source_file.write(b"modified")
+        self.assertIsNone(cache.get(source_path))
+
+    def test_eviction(self):
+        """
+        Ensures the least recently used thumbnails are evicted when the cache
+        is full.
+        """
+        source_paths = [self._copy_source("source_%d.png" % i) for i in range(3)]
+
+        cache = self.ThumbnailCache(self.cache_folder)
+        cached_path = cache.add(source_paths[0], self.image)
+        thumbnail_size = os.path.getsize(cached_path)
+
+        # Only leave room for two thumbnails.
+        cache = self.ThumbnailCache(self.cache_folder, max_size=thumbnail_size * 2)
+        cache.add(source_paths[1], self.image)
+        os.utime(cached_path, (0, 0))
+        cache.add(source_paths[2], self.image)
+
+        self.assertIsNone(cache.get(source_paths[0]))
+        self.assertIsNotNone(cache.get(source_paths[1]))
+        self.assertIsNotNone(cache.get(source_paths[2]))
+        self.assertEqual(cache.stats["evictions"], 1)
+
+    def test_get_thumbnail_uses_cache(self):
+        """
+        Ensures the thumbnail generator hook is not run for cached thumbnails.
+        """
+        source_path = self._copy_source("source.wire")
+
+        with patch("sgtk.platform.current_bundle", return_value=self.app), patch.object(
+            self.util, "_thumbnail_cache", self.ThumbnailCache(self.cache_folder)
+        ), patch.object(
+            self.app, "execute_hook_method", return_value=self.image
+        ) as execute_hook_method:
+            for _ in range(3):
+                thumbnail = self.util.get_thumbnail(source_path, self.app.context)
+                self.assertFalse(thumbnail.isNull())
+
+            self.assertEqual(execute_hook_method.call_count, 1)
+
+    def test_alpha_channel(self):
+        """
+        Ensures thumbnails with an alpha channel keep it in the cache.
+        """
+        from sgtk.platform.qt import QtCore, QtGui
+
+        cache = self.ThumbnailCache(self.cache_folder)
+
+        opaque = QtGui.QPixmap(16, 16)
+        opaque.fill(QtCore.Qt.red)
+        opaque_path = cache.add(self._copy_source("opaque.png"), opaque)
+        self.assertTrue(opaque_path.endswith(".jpg"))
+
+        transparent = QtGui.QPixmap(16, 16)
+        transparent.fill(QtCore.Qt.transparent)
+        source_path = self._copy_source("transparent.png")
+        transparent_path = cache.add(source_path, transparent)
+        self.assertTrue(transparent_path.endswith(".png"))
+
+        self.assertEqual(cache.get(source_path), transparent_path)
+        self.assertTrue(QtGui.QPixmap(transparent_path).hasAlphaChannel())
@@ -1,83 +1,162 @@
+import time
 import nuke
 
+# Read node whose colorspace renders are checked against
+REFERENCE_READ = "Read1"
 
+# Tile color of the Write nodes rendering to a different colorspace
+MISMATCH_COLOR = 4278190335
+
+# Profiles that may render to a different colorspace than the Read
+MISMATCH_PROFILES = frozenset(['IMAGE_PLANE', 'ALPHA', 'TECH_PRECOMP', 'MATTE_PAINT'])
+
+# Tile color of the Write nodes by profile
+PROFILE_COLORS = {
+    'PRECOMP': 13724671,
+    'TECH_PRECOMP': 146854399,
+    'ALPHA': 1790247167,
+    'IMAGE_PLANE': 1563800064,
+    'Render 16bits': 2911437567,
+    'MATTE_PAINT': 645572863,
+}
+DEFAULT_COLOR = 2911437567
+
+# name of the check -> [number of calls, total seconds, seconds of the last call]
+callTimes = {}
+
+# reference Read node, by script
+referenceReads = {}
+
+
+# Record the duration of each call of the decorated check
+def timed(function):
+    def wrapper(*args, **kwargs):
+        start = time.time()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            duration = time.time() - start
+            times = callTimes.setdefault(function.__name__, [0, 0.0, 0.0])
+            times[0] += 1
+            times[1] += duration
+            times[2] = duration
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    return wrapper
+
+
+def getCallTimes():
+    return dict((name, list(times)) for name, times in callTimes.items())
+
+
+# Return the colorspace of a colorspace knob, without the "default (...)"
+# around the default colorspace
+def getColorspace(knob):
+    if knob.getValue() == 0:
+        return knob.value()[9:-1]
+    return knob.value()
+
+
+# Return the reference Read of the script, None if there is no reference
+# Read. The node is cached until a Read is created, renamed or deleted.
+def getReferenceRead():
+    script = nuke.root().name()
+    if script not in referenceReads:
+        referenceReads[script] = nuke.toNode(REFERENCE_READ)
+    return referenceReads[script]
+
+
+# Return the colorspace of the reference Read of the script, None if there is
+# no reference Read. The colorspace is read on every call, as the default
+# colorspace depends on the file and the color management of the root.
+def getReferenceColorspace():
+    topnode = getReferenceRead()
+    if topnode is None:
+        return None
+    return getColorspace(topnode.knob('colorspace'))
+
+
+def clearReferenceRead():
+    referenceReads.clear()
+
+
+def onReadKnobChanged():
+    knob = nuke.thisKnob()
+    if knob is not None and knob.name() == 'name':
+        clearReferenceRead()
+
+
+def onReadDestroyed():
+    if nuke.thisNode().name() == REFERENCE_READ:
+        clearReferenceRead()
+
+
+# Return the tile color of a Write node rendering a profile, None to keep its
+# current color
+def getProfileColor(profile, writecolor, colorspace, profileColors=PROFILE_COLORS, defaultColor=DEFAULT_COLOR):
+    if writecolor != colorspace:
+        if profile not in MISMATCH_PROFILES:
+            return MISMATCH_COLOR
+        return None
+    return profileColors.get(profile, defaultColor)
+
+
+# Ask to fix the colorspace of a Write node rendering to a different
+# colorspace than the reference Read
+def resolveColorspace(n, writecolor, colorspace):
+    mensajecolor = "El espacio de color del render es distinto al del Read" + "\n" + "Read: " + colorspace + " " + "\n" + "Write: " + writecolor
+    nuke.message(mensajecolor)
+    SetsPanel = nuke.Panel("Resolver discrepancias en los settings del render?")
+    SetsPanel.addBooleanCheckBox("Resolver espacio de color", True)
+    ret = SetsPanel.show()
+    if ret:
+        if SetsPanel.value("Resolver espacio de color") == 1:
+            n.knob('colorspace').setValue(colorspace)
+    else:
+        raise ValueError("Render Cancelado")
+
+
+@timed
 def checkSets():
     if nuke.GUI:
 
         n = nuke.thisNode()
-        group = ''.join(nuke.thisNode().fullName().split('.')[:-1])
-        groupNode = nuke.toNode(group)
-
-        topnode = nuke.toNode("Read1")
-        if topnode:
-            ###Comprobaciones de espacio de color
-            if topnode.knob('colorspace').getValue() == 0:
-                colorspace = topnode.knob('colorspace').value()[9:-1]
-            else:
-                colorspace = topnode.knob('colorspace').value()
+        groupNode = nuke.thisParent()
 
+        ###Comprobaciones de espacio de color
+        colorspace = getReferenceColorspace()
+        if colorspace is not None:
             ##Settings del nodo Write
-            if n.knob('colorspace').getValue() == 0:
-                writecolor = n.knob('colorspace').value()[9:-1]
-            else:
-                writecolor = n.knob('colorspace').value()
+            writecolor = getColorspace(n.knob('colorspace'))
 
             ###Acciones
-            oldColor = n.knob('tile_color').value()
-            if writecolor != colorspace:
-                if groupNode.knob('tk_profile_list').value() not in ['IMAGE_PLANE', 'ALPHA', 'TECH_PRECOMP', 'MATTE_PAINT']:
-                    groupNode.knob('tile_color').setValue(4278190335)
-            else:
-                if groupNode.knob('tk_profile_list').value() == 'PRECOMP':
-                    groupNode.knob('tile_color').setValue(13724671)
-                elif groupNode.knob('tk_profile_list').value() == 'TECH_PRECOMP':
-                    groupNode.knob('tile_color').setValue(146854399)
-                elif groupNode.knob('tk_profile_list').value() == 'ALPHA':
-                    groupNode.knob('tile_color').setValue(1790247167)
-                elif groupNode.knob('tk_profile_list').value() == 'IMAGE_PLANE':
-                    groupNode.knob('tile_color').setValue(1563800064)
-                elif groupNode.knob('tk_profile_list').value() == 'Render 16bits':
-                    groupNode.knob('tile_color').setValue(2911437567)
-                elif groupNode.knob('tk_profile_list').value() == 'MATTE_PAINT':
-                    groupNode.knob('tile_color').setValue(645572863)
-                else:
-                    groupNode.knob('tile_color').setValue(2911437567)
+            profile = groupNode.knob('tk_profile_list').value()
+            color = getProfileColor(profile, writecolor, colorspace)
+            if color is not None:
+                groupNode.knob('tile_color').setValue(color)
 
 
+@timed
 def RenderSets():
     if nuke.GUI:
         n = nuke.thisNode()
-        group = ''.join(nuke.thisNode().fullName().split('.')[:-1])
-        groupNode = nuke.toNode(group)
+        groupNode = nuke.thisParent()
 
-        topnode = nuke.toNode("Read1")
-
-        if topnode:
-            ###Comprobaciones de espacio de color
-            if topnode.knob('colorspace').getValue() == 0:
-                colorspace = topnode.knob('colorspace').value()[9:-1]
-            else:
-                colorspace = topnode.knob('colorspace').value()
+        ###Comprobaciones de espacio de color
+        colorspace = getReferenceColorspace()
+        if colorspace is not None:
             ###Settings del nodo Write
-            if n.knob('colorspace').getValue() == 0:
-                writecolor = n.knob('colorspace').value()[9:-1]
-            else:
-                writecolor = n.knob('colorspace').value()
+            writecolor = getColorspace(n.knob('colorspace'))
 
             ###Mensaje y acciones
-
             if writecolor != colorspace:
-                if 'IMAGE_PLANE' not in groupNode.knob('tk_profile_list').value() and 'ALPHA' not in groupNode.knob('tk_profile_list').value() and 'TECH_PRECOMP' not in groupNode.knob('tk_profile_list').value() and 'MATTE_PAINT' not in groupNode.knob('tk_profile_list').value():
-                    mensajecolor = "El espacio de color del render es distinto al del Read" + "\n" + "Read: " + colorspace + " " + "\n" + "Write: " + writecolor
-                    nuke.message(mensajecolor)
-                    SetsPanel = nuke.Panel("Resolver discrepancias en los settings del render?")
-                    SetsPanel.addBooleanCheckBox("Resolver espacio de color", True)
-                    ret = SetsPanel.show()
-                    if ret:
-                        if SetsPanel.value("Resolver espacio de color") == 1:
-                            n.knob('colorspace').setValue(colorspace)
-                    else:
-                        raise ValueError("Render Cancelado")
-
+                profile = groupNode.knob('tk_profile_list').value()
+                if not any(mismatchProfile in profile for mismatchProfile in MISMATCH_PROFILES):
+                    resolveColorspace(n, writecolor, colorspace)
 
 
+nuke.addKnobChanged(onReadKnobChanged, nodeClass='Read')
+nuke.addOnDestroy(onReadDestroyed, nodeClass='Read')
+nuke.addOnCreate(clearReferenceRead, nodeClass='Read')
+nuke.addOnScriptLoad(clearReferenceRead)
+nuke.addOnScriptClose(clearReferenceRead)
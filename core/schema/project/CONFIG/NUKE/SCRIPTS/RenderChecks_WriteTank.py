@@ -1,64 +1,51 @@
 import nuke
 
+from RenderChecks import timed, getColorspace, getReferenceColorspace, getProfileColor, resolveColorspace, MISMATCH_PROFILES
 
+# Tile color of the Tank Write nodes by profile, other profiles keep their
+# color
+PROFILE_COLORS_WT = {
+    'PRECOMP': 13724671,
+    'Render 16bits': 2911437567,
+    'TECH_PRECOMP': 146854399,
+}
+
+
+@timed
 def checkSetsWT():
     if nuke.GUI:
 
         if nuke.thisNode():
             try:
                 n = nuke.thisNode()
-                topnode = nuke.toNode("Read1")
 
-                if topnode:
-                    ###Comprobaciones de espacio de color
-                    colorspace = topnode.knob('colorspace').value()
-                    writecolor = n.knob('colorspace').value()
+                ###Comprobaciones de espacio de color
+                colorspace = getReferenceColorspace()
+                if colorspace is not None:
+                    writecolor = getColorspace(n.knob('colorspace'))
 
                     ###Acciones
-                    oldColor = n.knob('tile_color').value()
-                    if writecolor != colorspace:
-                        if n.knob('tk_profile_list').value() not in ['IMAGE_PLANE','ALPHA', 'TECH_PRECOMP', 'MATTE_PAINT']:
-                            n.knob('tile_color').setValue(4278190335)
-                    else:
-                        if n.knob('tk_profile_list').value() == 'PRECOMP':
-                            n.knob('tile_color').setValue(13724671)
-                        elif n.knob('tk_profile_list').value() == 'Render 16bits':
-                            n.knob('tile_color').setValue(2911437567)
-                        elif n.knob('tk_profile_list').value() == 'TECH_PRECOMP':
-                            n.knob('tile_color').setValue(146854399)
+                    profile = n.knob('tk_profile_list').value()
+                    color = getProfileColor(profile, writecolor, colorspace, PROFILE_COLORS_WT, None)
+                    if color is not None:
+                        n.knob('tile_color').setValue(color)
             except:
                 print("Could not catch the node to check color settings")
 
 
+@timed
 def RenderSetsWT():
     if nuke.GUI:
 
         if nuke.thisNode():
             n = nuke.thisNode()
-            topnode = nuke.toNode("Read1")
 
-            if topnode:
-                ###Comprobaciones de espacio de color
-                if topnode.knob('colorspace').getValue() == 0:
-                    colorspace = topnode.knob('colorspace').value()[9:-1]
-                else:
-                    colorspace = topnode.knob('colorspace').value()
+            ###Comprobaciones de espacio de color
+            colorspace = getReferenceColorspace()
+            if colorspace is not None:
                 ###Settings del nodo Write
-                if n.knob('colorspace').getValue() == 0:
-                    writecolor = n.knob('colorspace').value()[9:-1]
-                else:
-                    writecolor = n.knob('colorspace').value()
+                writecolor = getColorspace(n.knob('colorspace'))
 
                 ###Mensaje y acciones
-
-                if writecolor != colorspace and n.knob('tk_profile_list').value() is not 'IMAGE_PLANE' and n.knob('tk_profile_list').value() is not 'ALPHA' and n.knob('tk_profile_list').value() is not 'TECH_PRECOMP' and n.knob('tk_profile_list').value() is not 'MATTE_PAINT':
-                    mensajecolor = "El espacio de color del render es distinto al del Read" + "\n" + "Read: " + colorspace + " " + "\n" + "Write: " + writecolor
-                    nuke.message(mensajecolor)
-                    SetsPanel = nuke.Panel("Resolver discrepancias en los settings del render?")
-                    SetsPanel.addBooleanCheckBox("Resolver espacio de color", True)
-                    ret = SetsPanel.show()
-                    if ret:
-                        if SetsPanel.value("Resolver espacio de color") == 1:
-                            n.knob('colorspace').setValue(colorspace)
-                    else:
-                        raise ValueError("Render Cancelado")
+                if writecolor != colorspace and n.knob('tk_profile_list').value() not in MISMATCH_PROFILES:
+                    resolveColorspace(n, writecolor, colorspace)
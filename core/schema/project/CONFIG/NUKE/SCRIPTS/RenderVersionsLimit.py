@@ -1,13 +1,159 @@
 import shutil
 import os
+import re
 import threading
 import nuke
 
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+# Number of render versions kept in the images folder
+KEEP_VERSIONS = 4
+
+versionRegex = re.compile(r"^(.*?)(\d+)$")
+
+
+# Split a render folder name into its base name and version number,
+# returns (None, None) for names without a version
+def ParseVersion(folderName):
+    match = versionRegex.match(folderName)
+    if not match:
+        return None, None
+    return match.group(1), int(match.group(2))
+
+
+# Return the versions of a render in the images folder as (version, path)
+# tuples, oldest first
+def GetVersions(imagesFolder, renderFolder):
+    baseName, _ = ParseVersion(renderFolder)
+    if baseName is None:
+        return []
+
+    versions = []
+    for folderName in os.listdir(imagesFolder):
+        folderBase, version = ParseVersion(folderName)
+        if folderBase != baseName:
+            continue
+
+        path = os.path.join(imagesFolder, folderName)
+        if os.path.isdir(path):
+            versions.append((version, path))
+
+    versions.sort()
+    return versions
+
+
+# Return the versions to delete to keep only the newest ones
+def GetSurplusVersions(versions, keep=KEEP_VERSIONS):
+    if len(versions) <= keep:
+        return []
+    return versions[:len(versions) - keep]
+
+
+def GetFolderSize(folder):
+    size = 0
+    for root, dirs, files in os.walk(folder):
+        for fileName in files:
+            try:
+                size += os.path.getsize(os.path.join(root, fileName))
+            except OSError:
+                pass
+    return size
+
+
+# Deletes folders in a background thread, one after the other. The queue is
+# bounded so that a render waits for the deletions instead of queueing more
+# folders than can be deleted.
+class VersionDeleter(object):
+    def __init__(self, maxQueued=16):
+        self.queue = queue.Queue(maxQueued)
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.reclaimedBytes = 0
+        self.deletedFolders = []
+
+        worker = threading.Thread(target=self.run, name="RenderVersionDeleter")
+        worker.daemon = True
+        worker.start()
+
+    def submit(self, folder):
+        with self.lock:
+            if folder in self.pending:
+                return
+            self.pending.add(folder)
+
+        self.queue.put(folder)
+
+    # wait for the queued folders to be deleted
+    def wait(self):
+        self.queue.join()
+
+    def run(self):
+        while True:
+            folder = self.queue.get()
+            try:
+                self.delete(folder)
+            finally:
+                with self.lock:
+                    self.pending.discard(folder)
+                self.queue.task_done()
+
+    def delete(self, folder):
+        if not os.path.isdir(folder):
+            return
+
+        size = GetFolderSize(folder)
+        try:
+            shutil.rmtree(folder)
+        except (IOError, OSError) as e:
+            print("Could not delete old render version %s: %s" % (folder, e))
+            return
+
+        with self.lock:
+            self.reclaimedBytes += size
+            self.deletedFolders.append(folder)
+
+        print("%s was deleted, %.1f MB reclaimed." % (folder, size / (1024.0 * 1024.0)))
+
+
+versionDeleter = None
+versionDeleterLock = threading.Lock()
+
+
+def GetVersionDeleter():
+    global versionDeleter
+
+    with versionDeleterLock:
+        if versionDeleter is None:
+            versionDeleter = VersionDeleter()
+
+    return versionDeleter
+
+
+# Queue the deletion of the versions older than the newest ones, returns the
+# folders queued for deletion
+def PurgeVersions(imagesFolder, renderFolder, keep=KEEP_VERSIONS):
+    versions = GetVersions(imagesFolder, renderFolder)
+    currentFolder = os.path.join(imagesFolder, renderFolder)
+
+    deleter = GetVersionDeleter()
+    surplus = []
+    for version, path in GetSurplusVersions(versions, keep):
+        # never delete the version being rendered
+        if path == currentFolder:
+            continue
+        deleter.submit(path)
+        surplus.append(path)
+
+    return surplus
+
 
 def DeleteOldVersions():
     ###Resolve Images Folder
     filename = nuke.thisNode()['file'].evaluate()
-    local = nuke.toNode("preferences").knob("localCachePath").evaluate()
     proj = os.environ['PROJECT']
     index = filename.lower().find(proj.lower())
     unidad = os.environ['MOUNT']
@@ -16,19 +162,8 @@ def DeleteOldVersions():
     pathsep = normalizedpath.split(os.sep)
     imagesFolder = os.path.join(*pathsep[:-2])
     renderFolder = os.path.join(*pathsep[-2:-1])
-    olderVersionsList = []
-    for renderVersion in os.listdir(imagesFolder):
-        if renderFolder[:-3] in renderVersion:
-            olderVersionsList.append(renderVersion)
-
-
-    def DeleteVersions():
-        if len(olderVersionsList) > 4:
-            oldFolder = os.path.join(imagesFolder, olderVersionsList[0])
-            mens = oldFolder + " was deleted."
-            shutil.rmtree(oldFolder)
-
-
-    threading.Thread( None, DeleteVersions ).start()
 
+    if not os.path.isdir(imagesFolder):
+        return []
 
+    return PurgeVersions(imagesFolder, renderFolder)
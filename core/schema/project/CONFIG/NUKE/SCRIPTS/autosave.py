@@ -3,6 +3,7 @@ import glob
 import time
 import os
 import shutil
+import threading
 
 ### Example that implements a rolling autosave using the autoSaveFilter callbacks
 ###
@@ -11,30 +12,114 @@ import shutil
 ## To use just add 'import nukescripts.autosave' in your init.py
 
 
-def onAutoSave(filename):
+# number of the last autosave written for each script, so the autosave
+# files are only globbed the first time a script is autosaved
+autoSaveNumbers = {}
+
+
+# Copies autosaves to the local mirror in a background thread. Only the
+# latest autosave waiting to be copied is kept: a copy that hasn't started
+# yet when the next autosave happens is replaced by the newer one.
+class AutoSaveMirror(object):
+
+  def __init__(self):
+    self.condition = threading.Condition()
+    self.pending = None
+    self.copied = 0
+    self.skipped = 0
+    self.busy = False
+
+    worker = threading.Thread(target=self.run, name="AutoSaveMirror")
+    worker.daemon = True
+    worker.start()
+
+  def submit(self, source, target, local):
+    with self.condition:
+      if self.pending is not None:
+        self.skipped += 1
+      self.pending = (source, target, local)
+      self.condition.notify()
+
+  # wait for the pending copies to be done, returns False on timeout
+  def wait(self, timeout=None):
+    end = None if timeout is None else time.time() + timeout
+    with self.condition:
+      while self.pending is not None or self.busy:
+        remaining = None if end is None else end - time.time()
+        if remaining is not None and remaining <= 0:
+          return False
+        self.condition.wait(remaining)
+    return True
+
+  def run(self):
+    while True:
+      with self.condition:
+        while self.pending is None:
+          self.condition.wait()
+        source, target, local = self.pending
+        self.pending = None
+        self.busy = True
 
-  ## ignore untiled autosave
-  if nuke.root().name() == 'Root':
-    return filename
+      try:
+        self.copy(source, target, local)
+      finally:
+        with self.condition:
+          self.busy = False
+          self.condition.notify_all()
 
-  fileNo = 0
-  files = getAutoSaveFiles(filename)
+  def copy(self, source, target, local):
+    directory = os.path.dirname(target)
+    try:
+      if os.path.exists(local):
+        if not os.path.exists(directory):
+          os.makedirs(directory)
+        shutil.copy(source, target)
+        self.copied += 1
+        print("file copied to")
+        print(target)
+    except (IOError, OSError) as e:
+      print("Could not copy autosave to %s: %s" % (target, e))
 
-  if len(files) > 0 :
-    lastFile = files[-1]
-    # get the last file number
 
-    if len(lastFile) > 0:
-      try:
-        fileNo = int(lastFile[-1:])
-      except:
-        pass
+autoSaveMirror = AutoSaveMirror()
+
+
+def getNextAutoSaveNumber(filename):
+
+  fileNo = autoSaveNumbers.get(filename)
+
+  if fileNo is None:
+    fileNo = 0
+    files = getAutoSaveFiles(filename)
+
+    if len(files) > 0 :
+      lastFile = files[-1]
+      # get the last file number
 
-      fileNo = fileNo + 1
+      if len(lastFile) > 0:
+        try:
+          fileNo = int(lastFile[-1:])
+        except:
+          pass
+
+        fileNo = fileNo + 1
+  else:
+    fileNo = fileNo + 1
 
   if ( fileNo > 5 ):
     fileNo = 0
 
+  autoSaveNumbers[filename] = fileNo
+  return fileNo
+
+
+def onAutoSave(filename):
+
+  ## ignore untiled autosave
+  if nuke.root().name() == 'Root':
+    return filename
+
+  fileNo = getNextAutoSaveNumber(filename)
 
   if ( fileNo != 0 ):
 
@@ -49,16 +134,7 @@ def onAutoSave(filename):
     raiz = local.split('/')[0] + '\\'
     filenameCopy = os.path.join(raiz, "autosave", filenamec[3:])
     print(filename)
-    directory = os.path.dirname(filenameCopy)
-    if os.path.exists(local):
-      if not os.path.exists(directory):
-        os.makedirs(directory)
-      shutil.copy(filenamec, filenameCopy)
-      print("file copied to")
-      print(filenameCopy)
-  
-
-
+    autoSaveMirror.submit(filenamec, filenameCopy, local)
 
   return filename
 
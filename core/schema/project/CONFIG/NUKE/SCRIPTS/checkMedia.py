@@ -1,134 +1,136 @@
 ###Carlos Cantalapiedra FYM 2018
 import nuke
 import os
+import re
 
-def checkMediaUI():
-    # try:
-    #     shot = str(os.environ['SHOT'])
-    # except:
-    #     shot = str(os.environ['ASSET'])
-    shot = str(os.environ['PROJECT_PATH']).replace("\\", "/")
-    shot = shot.replace('//dps.tv/dps', 'P:')
-    unidad = os.environ['MOUNT']
-    if 'V' in unidad:
-        mac_path = shot.replace(unidad, '/Volumes/PROYECTOS-1').replace('\\', '/')
-    else:
-        mac_path = shot.replace(unidad, '/Volumes/PROYECTOS').replace('\\', '/')
-    i = nuke.thisNode()
-    file = i["file"].value()
-    if "../" in file:
-        i.knob("tile_color").setValue(4278247679)
-        i.knob("note_font_color").setValue(4294967295)
-    elif shot not in file and mac_path not in file:
-        i.knob("tile_color").setValue(4278190335)
-        i.knob("note_font_color").setValue(4294967295)
-    else:
-        if "/SOURCE/" in file:
-            i.knob("tile_color").setValue(949013503)
-        if "/VREF/" in file:
-            i.knob("tile_color").setValue(4246527)
-        elif "/PRECOMP/" in file:
-            i.knob("tile_color").setValue(13724671)
-        elif "/LAYERS/" in file:
-            i.knob("tile_color").setValue(15891711)
-        elif "/LGT/" in file:
-            i.knob("tile_color").setValue(973127679)
-        elif "/DMP/" in file:
-            i.knob("tile_color").setValue(4278219519)
-        elif "/REFERENCIAS/" in file:
-            i.knob("tile_color").setValue(24529407)
-        elif "/MEDIA/" in file:
-            i.knob("tile_color").setValue(1148596479)
-        elif "_CMP_v" in file:
-            i.knob("tile_color").setValue(2911437567)
-        elif "_ALPHA_v" in file:
-            i.knob("tile_color").setValue(1790247167)
-        elif "_IMP_v" in file:
-            i.knob("tile_color").setValue(1563800064)
-        elif "_IPL_v" in file:
-            i.knob("tile_color").setValue(2483467007)
+WHITE = 4294967295
 
-def checkMedia():
-    lista = []
+# Colors of the Read nodes that are not part of the project
+RELATIVE_COLOR = 4278247679
+OUTSIDE_COLOR = 4278190335
+
+# Colors of the Read nodes of the project by type of media, the first rule
+# matching the file path wins
+MEDIA_RULES = [
+    (re.compile(r"/VREF/"), 4246527),
+    (re.compile(r"/PRECOMP/"), 13724671),
+    (re.compile(r"/LAYERS/"), 15891711),
+    (re.compile(r"/LGT/"), 973127679),
+    (re.compile(r"/DMP/"), 4278219519),
+    (re.compile(r"/REFERENCIAS/"), 24529407),
+    (re.compile(r"/MEDIA/"), 1148596479),
+    (re.compile(r"_CMP_v"), 2911437567),
+    (re.compile(r"_ALPHA_v"), 1790247167),
+    (re.compile(r"_IMP_v"), 1563800064),
+    (re.compile(r"_IPL_v"), 2483467007),
+    (re.compile(r"/SOURCE/"), 949013503),
+]
 
-    preshot = nuke.root().name()
-    baseshot = os.path.basename(preshot)[:-12]
+# Kinds of media
+RELATIVE = "relative"
+OUTSIDE = "outside"
+PROJECT = "project"
+
+
+def getProjectPaths():
     # try:
     #     shot = str(os.environ['SHOT'])
     # except:
     #     shot = str(os.environ['ASSET'])
     shot = str(os.environ['PROJECT_PATH']).replace("\\", "/")
     shot = shot.replace('//dps.tv/dps', 'P:')
-    print (shot)
     unidad = os.environ['MOUNT']
     if 'V' in unidad:
         mac_path = shot.replace(unidad, '/Volumes/PROYECTOS-1').replace('\\', '/')
     else:
         mac_path = shot.replace(unidad, '/Volumes/PROYECTOS').replace('\\', '/')
-    for i in nuke.allNodes("Read"):
-        file = i["file"].value()
+    return shot, mac_path
+
+
+# Classifies the media of the Read nodes. Each file path is only classified
+# once, the nodes themselves are read from the script on every check so
+# files set from Python or by loading a script are always seen.
+class MediaAudit(object):
+    def __init__(self):
+        self.projectPaths = None
+        self.classifications = {}
+
+    # return the kind of media and the tile color of a file path
+    def classify(self, file):
+        projectPaths = getProjectPaths()
+        if projectPaths != self.projectPaths:
+            self.projectPaths = projectPaths
+            self.classifications = {}
+
+        classification = self.classifications.get(file)
+        if classification is None:
+            classification = self.classifyPath(file, *projectPaths)
+            self.classifications[file] = classification
+        return classification
+
+    def classifyPath(self, file, shot, mac_path):
         if "../" in file:
-            i.knob("tile_color").setValue(4278247679)
-            i.knob("note_font_color").setValue(4294967295)
-        elif shot not in file and mac_path not in file:
-            i.knob("tile_color").setValue(4278190335)
-            i.knob("note_font_color").setValue(4294967295)
-            lista.append(i.knob("name").getValue())
-        else:
-            if "/SOURCE/" in file:
-                i.knob("tile_color").setValue(949013503)
-            if "/VREF/" in file:
-                i.knob("tile_color").setValue(4246527)
-            elif "/PRECOMP/" in file:
-                i.knob("tile_color").setValue(13724671)
-            elif "/LAYERS/" in file:
-                i.knob("tile_color").setValue(15891711)
-            elif "/LGT/" in file:
-                i.knob("tile_color").setValue(973127679)
-            elif "/DMP/" in file:
-                i.knob("tile_color").setValue(4278219519)
-            elif "/REFERENCIAS/" in file:
-                i.knob("tile_color").setValue(24529407)
-            elif "/MEDIA/" in file:
-                i.knob("tile_color").setValue(1148596479)
-            elif "_CMP_v" in file:
-                i.knob("tile_color").setValue(2911437567)
-            elif "_ALPHA_v" in file:
-                i.knob("tile_color").setValue(1790247167)
-            elif "_IMP_v" in file:
-                i.knob("tile_color").setValue(1563800064)
-            elif "_IPL_v" in file:
-                i.knob("tile_color").setValue(2483467007)
+            return RELATIVE, RELATIVE_COLOR
+        if shot not in file and mac_path not in file:
+            return OUTSIDE, OUTSIDE_COLOR
+        for rule, color in MEDIA_RULES:
+            if rule.search(file):
+                return PROJECT, color
+        return PROJECT, None
 
-    if len(lista)>0:
-        text = "Material fuera de pipeline en:" + str(lista)
-        nuke.message(text)
-        return False
-    else:
-        return True
+    # classify the media of a Read node and color it accordingly
+    def checkNode(self, node):
+        kind, color = self.classify(node["file"].value())
 
-def checkMediaMessage():
-    lista = []
+        if color is not None:
+            node.knob("tile_color").setValue(color)
+        if kind != PROJECT:
+            node.knob("note_font_color").setValue(WHITE)
+
+        return kind
+
+    # color all the Read nodes and return the names of the ones reading media
+    # from outside of the project
+    def audit(self):
+        names = []
+        for node in nuke.allNodes("Read"):
+            if self.checkNode(node) == OUTSIDE:
+                names.append(node.knob("name").getValue())
+        return names
+
+    # return the names of the Read nodes reading media from outside of the
+    # project
+    def getOutsideNodes(self):
+        names = []
+        for node in nuke.allNodes("Read"):
+            kind, color = self.classify(node["file"].value())
+            if kind == OUTSIDE:
+                names.append(node.knob("name").getValue())
+        return names
+
+    def reset(self):
+        self.projectPaths = None
+        self.classifications = {}
 
-    preshot = nuke.root().name()
-    baseshot = os.path.basename(preshot)[:-12]
-    # try:
-    #     shot = str(os.environ['SHOT'])
-    # except:
-    #     shot = str(os.environ['ASSET'])
-    shot = str(os.environ['PROJECT_PATH']).replace("\\", "/")
-    shot = shot.replace('//dps.tv/dps', 'P:')
-    unidad = os.environ['MOUNT']
-    if 'V' in unidad:
-        mac_path = shot.replace(unidad, '/Volumes/PROYECTOS-1').replace('\\', '/')
-    else:
-        mac_path = shot.replace(unidad, '/Volumes/PROYECTOS').replace('\\', '/')
-    for i in nuke.allNodes("Read"):
-        file = i["file"].value()
-        if shot not in file and "../" not in file and mac_path not in file:
-            lista.append(i.knob("name").getValue())
 
+mediaAudit = MediaAudit()
 
+
+def checkMediaUI():
+    mediaAudit.checkNode(nuke.thisNode())
+
+
+def checkMediaKnobChanged():
+    knob = nuke.thisKnob()
+    if knob is not None and knob.name() == "file":
+        mediaAudit.checkNode(nuke.thisNode())
+
+
+def checkMediaClose():
+    mediaAudit.reset()
+
+
+def showOutsideNodes(lista):
     if len(lista)>0:
         text = "Material fuera de pipeline en:" + str(lista)
         print(lista)
@@ -136,4 +138,12 @@ def checkMediaMessage():
         return False
     else:
         return True
- 
+
+
+def checkMedia():
+    mediaAudit.reset()
+    return showOutsideNodes(mediaAudit.audit())
+
+
+def checkMediaMessage():
+    return showOutsideNodes(mediaAudit.getOutsideNodes())
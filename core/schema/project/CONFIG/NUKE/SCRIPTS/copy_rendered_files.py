@@ -1,4 +1,137 @@
-import nuke, os, shutil, threading, platform, subprocess
+import nuke, os, shutil, threading, time, atexit
+
+try:
+	import queue
+except ImportError:
+	import Queue as queue
+
+
+# Copies the frames cached locally to the server in background threads, so the
+# render thread only has to queue each frame. The queue is bounded: when the
+# copies can't keep up with the render, queueing a frame blocks until a worker
+# is free.
+class frameWriteBack:
+	def __init__(self, workers=4, maxQueued=32, retries=3, retryDelay=1.0):
+		self.retries = retries
+		self.retryDelay = retryDelay
+
+		self.queue = queue.Queue(maxQueued)
+		self.lock = threading.Lock()
+		self.failed = []
+		self.stats = self.newStats()
+
+		for i in range(workers):
+			worker = threading.Thread(target=self.run, name="FrameWriteBack%d" % i)
+			worker.daemon = True
+			worker.start()
+
+	# queue a frame to be copied to the target path, the source is removed once copied
+	def submit(self, source, target):
+		start = time.time()
+		self.queue.put((source, target))
+
+		with self.lock:
+			self.stats["queued"] += 1
+			self.stats["maxDepth"] = max(self.stats["maxDepth"], self.queue.qsize())
+			self.stats["submitTime"] += time.time() - start
+
+	# wait for all the queued frames to be copied, returns the frames that failed
+	def drain(self):
+		self.queue.join()
+
+		with self.lock:
+			failed = self.failed
+			self.failed = []
+
+		for (source, target, error) in failed:
+			nuke.tprint("Could not copy %s to %s: %s" % (source, target, error))
+
+		return failed
+
+	# return the stats gathered since the last call and start new ones
+	def takeStats(self):
+		with self.lock:
+			stats = self.stats
+			self.stats = self.newStats()
+
+		return stats
+
+	def newStats(self):
+		return {"queued": 0, "copied": 0, "failed": 0, "retried": 0, "maxDepth": 0, "submitTime": 0.0}
+
+	def run(self):
+		while True:
+			(source, target) = self.queue.get()
+			try:
+				self.copy(source, target)
+			finally:
+				self.queue.task_done()
+
+	def copy(self, source, target):
+		for attempt in range(self.retries + 1):
+			try:
+				targetDir = os.path.dirname(target)
+				if not os.path.isdir(targetDir):
+					try:
+						os.makedirs(targetDir)
+					except OSError:
+						# created by another worker in the meantime
+						if not os.path.isdir(targetDir):
+							raise
+
+				shutil.copyfile(source, target)
+
+				# verify the copy before removing the cached frame
+				if os.path.getsize(target) != os.path.getsize(source):
+					raise IOError("Size of the copy does not match the rendered frame")
+
+				os.remove(source)
+			except (IOError, OSError) as error:
+				if attempt < self.retries:
+					with self.lock:
+						self.stats["retried"] += 1
+					time.sleep(self.retryDelay * (attempt + 1))
+					continue
+
+				with self.lock:
+					self.stats["failed"] += 1
+					self.failed.append((source, target, error))
+				return
+
+			with self.lock:
+				self.stats["copied"] += 1
+			return
+
+
+writeBack = None
+writeBackLock = threading.Lock()
+
+
+# return the write back service shared by all the write nodes of the session
+def getWriteBack():
+	global writeBack
+
+	with writeBackLock:
+		if writeBack is None:
+			writeBack = frameWriteBack()
+
+	return writeBack
+
+
+# wait for the frames of the render to be copied, called when a render ends
+def drainWriteBack():
+	if writeBack is None:
+		return
+
+	writeBack.drain()
+	stats = writeBack.takeStats()
+	if stats["queued"]:
+		print("Frame write back: %d queued, %d copied, %d failed, max queue depth %d, %.4fs per frame to queue" % (
+			stats["queued"], stats["copied"], stats["failed"], stats["maxDepth"], stats["submitTime"] / stats["queued"]))
+
+
+nuke.addAfterRender(drainWriteBack)
+atexit.register(drainWriteBack)
 
 class cacheAndCopy:
 	def cacheFiles(self):
@@ -39,10 +172,6 @@ class cacheAndCopy:
 		self.filename = nuke.thisNode()['file'].evaluate()
 		print("copyFiles_filename" + os.path.normpath(self.filename))
 
-		if platform.system() == 'Windows':
-			copyCommand = 'copy '
-		else:
-			copyCommand = 'cp '
 		# local = nuke.toNode("preferences").knob("localCachePath").evaluate()
 		# print("toke local:")
 		# print (local)
@@ -53,11 +182,9 @@ class cacheAndCopy:
 		print("copyFiles_serverfile" + os.path.normpath(serverFile))
 		serverFileNorm = os.path.normpath(serverFile)
 		filenameNorm = os.path.normpath(self.filename)
-		copystring = copyCommand + filenameNorm + ' ' + serverFileNorm
-		print (copystring)
 
-		subprocess.call(copystring, shell=True)
-		os.remove(self.filename)
+		# copied and removed in the background, see frameWriteBack
+		getWriteBack().submit(filenameNorm, serverFileNorm)
 
 
 
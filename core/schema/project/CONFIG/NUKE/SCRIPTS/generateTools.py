@@ -1,27 +1,130 @@
 import nuke
 import os
-def GenerateTools(projectMenu):
-    # Build menu for custom shot templates automatically searching for nk files in template folder
-    # buildTemplatesMenu.buildTemplatesMenu()
+import json
+import sys
+import tempfile
+import threading
 
-    projectMenu.removeItem('Tools')
+# Local cache of the templates found in the tools folders, so the menu can be
+# built at startup without listing the folders on the network
+ManifestPath = os.path.join(os.path.expanduser('~'), '.nuke', 'templates_manifest.json')
+ManifestLock = threading.Lock()
 
-    ToolsMenu = projectMenu.addMenu('Tools', index= 1)
-    ToolsFolder = os.path.join(os.environ['PROJECT_PATH'], 'CONFIG', 'NUKE', 'TEMPLATES')
+
+def GetToolsFolder():
+    return os.path.join(os.environ['PROJECT_PATH'], 'CONFIG', 'NUKE', 'TEMPLATES')
+
+
+def LoadManifest():
+    try:
+        with open(ManifestPath, 'r') as manifestFile:
+            return json.load(manifestFile)
+    except (IOError, OSError, ValueError):
+        return {}
 
 
+# Replace the target file with the source one, os.replace isn't available in
+# python 2 and os.rename doesn't overwrite files on windows
+def ReplaceFile(sourcePath, targetPath):
+    if hasattr(os, 'replace'):
+        os.replace(sourcePath, targetPath)
+    else:
+        if sys.platform == 'win32' and os.path.exists(targetPath):
+            os.remove(targetPath)
+        os.rename(sourcePath, targetPath)
 
 
-    for tool in os.listdir(ToolsFolder):
+# The manifest is written to a temporary file next to it first, so other Nuke
+# sessions never read a partly written manifest
+def SaveManifest(manifest):
+    tempPath = None
+    try:
+        manifestDir = os.path.dirname(ManifestPath)
+        if not os.path.isdir(manifestDir):
+            os.makedirs(manifestDir)
+
+        tempFile, tempPath = tempfile.mkstemp(
+            prefix='templates_manifest.', suffix='.tmp', dir=manifestDir)
+        with os.fdopen(tempFile, 'w') as manifestFile:
+            json.dump(manifest, manifestFile)
+        ReplaceFile(tempPath, ManifestPath)
+    except (IOError, OSError, TypeError, ValueError) as e:
+        print("Could not save the templates manifest: %s" % e)
+        if tempPath is not None and os.path.exists(tempPath):
+            os.remove(tempPath)
+
+
+# Return the (name, path) of the templates in the tools folder
+def ListTools(ToolsFolder):
+    tools = []
+    for tool in sorted(os.listdir(ToolsFolder)):
         test = os.path.join(ToolsFolder, tool).replace('\\', '/')
 
         if os.path.isfile(os.path.join(ToolsFolder, tool)) and os.path.splitext(ToolsFolder + '/' + tool)[1] == ".nk":
 
             toolName = tool.split('.')[0]
-            toolCmd = 'nuke.nodePaste('+'"' + test + '"' + ")"
+            tools.append((toolName, test))
+    return tools
+
 
+def BuildToolsMenu(projectMenu, tools):
+    projectMenu.removeItem('Tools')
+
+    ToolsMenu = projectMenu.addMenu('Tools', index= 1)
 
-            ToolsMenu.addCommand(toolName, toolCmd)
+    for toolName, test in tools:
+        toolCmd = 'nuke.nodePaste('+'"' + test + '"' + ")"
+        ToolsMenu.addCommand(toolName, toolCmd)
 
     ToolsMenu.addSeparator()
-    ToolsMenu.addCommand('Update Templates', lambda: GenerateTools(projectMenu))
+    ToolsMenu.addCommand('Update Templates', lambda: RefreshTools(projectMenu, force=True))
+
+
+# List the tools folder in a background thread and rebuild the menu if the
+# folder changed since it was cached
+def RefreshTools(projectMenu, force=False):
+    ToolsFolder = GetToolsFolder()
+
+    def refresh():
+        try:
+            mtime = os.stat(ToolsFolder).st_mtime
+        except OSError as e:
+            print("Could not read the templates folder: %s" % e)
+            return
+
+        with ManifestLock:
+            manifest = LoadManifest()
+            cached = manifest.get(ToolsFolder)
+            if not force and cached and cached.get('mtime') == mtime:
+                return
+
+            try:
+                tools = ListTools(ToolsFolder)
+            except OSError as e:
+                print("Could not list the templates folder: %s" % e)
+                return
+
+            manifest[ToolsFolder] = {'mtime': mtime, 'tools': tools}
+            SaveManifest(manifest)
+
+        nuke.executeInMainThread(BuildToolsMenu, args=(projectMenu, tools))
+
+    thread = threading.Thread(target=refresh, name="RefreshTools")
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+def GenerateTools(projectMenu):
+    # Build menu for custom shot templates automatically searching for nk files in template folder
+    # buildTemplatesMenu.buildTemplatesMenu()
+
+    # build the menu from the cached templates, then check the folder for
+    # changes in the background
+    with ManifestLock:
+        cached = LoadManifest().get(GetToolsFolder())
+    tools = cached.get('tools', []) if cached else []
+
+    BuildToolsMenu(projectMenu, tools)
+
+    return RefreshTools(projectMenu)
@@ -1,24 +1,115 @@
 import os
+import re
+import time
 import nuke
-import nukescripts
+
+try:
+    from os import scandir
+except ImportError:
+    scandir = None
+
+
+# Frame numbers of the renders are padded to at least 3 digits ({SEQ} and
+# {SEQ3} in the templates) and separated from the name by a dot or an
+# underscore, so a name ending in a version like name_v003.exr isn't read as
+# a frame
+MIN_FRAME_DIGITS = 3
+
+versionRegex = re.compile(r"(\d+)$")
+frameRegex = re.compile(r"^(.*[._])(\d{%d,})(\.[^.]+)$" % MIN_FRAME_DIGITS)
+
+# Seconds a folder must have been left unmodified for its lookups to be cached
+MTIME_RESOLUTION = 2.0
+
+# directory path -> (mtime, result) for each lookup
+renderDirCache = {}
+sequenceCache = {}
+
+
+# Return the (name, isDir) of the entries of a directory in a single pass
+def listEntries(folder):
+    if scandir is not None:
+        return [(entry.name, entry.is_dir()) for entry in scandir(folder)]
+    return [(name, os.path.isdir(os.path.join(folder, name))) for name in os.listdir(folder)]
+
+
+# Return the cached result of a lookup in a folder, computed again when the
+# folder changes. File systems with a coarse modification time, like many
+# network file systems, don't change the time of a folder modified again
+# within the same tick, so a lookup done within MTIME_RESOLUTION seconds of
+# the folder modification time isn't cached.
+def cachedLookup(cache, folder, lookup):
+    mtime = os.stat(folder).st_mtime
+    cached = cache.get(folder)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    result = lookup(folder)
+    if time.time() - mtime >= MTIME_RESOLUTION:
+        cache[folder] = (mtime, result)
+    else:
+        cache.pop(folder, None)
+    return result
+
+
+# Return the name of the render folder with the highest version number
+def findLastRenderDir(renderDir):
+    def lookup(folder):
+        versions = []
+        for name, isDir in listEntries(folder):
+            match = versionRegex.search(name)
+            if isDir and match:
+                versions.append((int(match.group(1)), name))
+        if not versions:
+            return None
+        return max(versions)[1]
+
+    return cachedLookup(renderDirCache, renderDir, lookup)
+
+
+# Return the sequences of a render folder as Read file values, e.g.
+# "/path/name.%04d.exr 1001-1100"
+def getRenderSequences(folder):
+    def lookup(folder):
+        sequences = {}
+        singles = []
+        for name, isDir in listEntries(folder):
+            if isDir:
+                continue
+            match = frameRegex.match(name)
+            if not match:
+                singles.append(name)
+                continue
+            head, frame, tail = match.groups()
+            sequences.setdefault((head, tail), []).append(frame)
+
+        fileValues = []
+        for (head, tail), frames in sorted(sequences.items()):
+            # frames are padded to the length of the shortest one, so frames
+            # 001 to 1200 are read with %03d
+            frameFormat = "%%0%dd" % min(len(frame) for frame in frames)
+            path = os.path.join(folder, head + frameFormat + tail)
+            numbers = [int(frame) for frame in frames]
+            fileValues.append("%s %d-%d" % (path, min(numbers), max(numbers)))
+        for name in sorted(singles):
+            fileValues.append(os.path.join(folder, name))
+        return fileValues
+
+    return cachedLookup(sequenceCache, folder, lookup)
 
 
 def openLastRender():
     workDir = os.path.dirname(os.path.dirname(nuke.root().name()))
     renderDir = os.path.normpath(os.path.join(workDir, "IMAGES"))
-    scriptVersion = os.path.splitext(os.path.basename(nuke.root().name()))[0][-3:]
-    renderList = os.listdir(renderDir)
-    lastDir = renderList[len(renderList) - 1]
+    lastDir = findLastRenderDir(renderDir)
+    if lastDir is None:
+        nuke.message("No renders found in %s" % renderDir)
+        return
+
     folder = os.path.normpath(os.path.join(renderDir, lastDir))
-    files = nuke.getFileNameList(folder)
 
-    for file in files:
-        fileValue = os.path.join(folder, file)
-        fileValue = nukescripts.replaceHashes(fileValue).replace('%01d', '%04d')
+    for fileValue in getRenderSequences(folder):
         # fileString = "file " + fileValue
         # readNode = nuke.createNode('Read', fileString)
         readNode = nuke.nodes.Read()
         readNode.knob('file').fromUserText(fileValue)
-
-
-
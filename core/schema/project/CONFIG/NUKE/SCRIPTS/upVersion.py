@@ -1,29 +1,7 @@
 import os
-import shutil
-import threading
-import subprocess
-from subprocess import call
 import nuke
 
-
-def upVersionCopy(renderDir, lastDir, lastVersion, scriptVersion, newDir):
-    amount = len(os.listdir(os.path.join(renderDir, lastDir)))
-    task = nuke.ProgressTask("UpVerison")
-    count = 0
-    for file in os.listdir(os.path.join(renderDir, lastDir)):
-        if task.isCancelled():
-            break
-        task.setMessage("Step %s of %d" % (count + 1, amount))
-
-        oldCopy = os.path.join(os.path.join(renderDir, lastDir), file)
-        newFile = file.replace('_v' + str('{:0>3}'.format(lastVersion)), '_v' + str(scriptVersion))
-        newCopy = os.path.join(os.path.join(renderDir, newDir), newFile)
-
-        copystring = 'copy ' + oldCopy + ' ' + newCopy
-        os.popen(copystring)
-        count += 1
-        percent = int(100 * (float(count) / (amount)))
-        task.setProgress(percent)
+from upVersion_v02 import upVersionCopy
 
 
 def upVersionBase():
@@ -62,7 +40,7 @@ def upVersionBase():
             runCopy = False
             nuke.message("UpVersion was cancelled")
     if runCopy == True:
-        threading.Thread(None, upVersionCopy(renderDir, lastDir, lastVersion, scriptVersion, newDir)).start()
+        upVersionCopy(renderDir, lastDir, lastVersion, scriptVersion, newDir)
 
 
 
@@ -1,30 +1,85 @@
 import os
 import shutil
 import threading
-import subprocess
-from subprocess import call
 import nuke
 
-
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+# Number of files copied at the same time
+COPY_WORKERS = 4
+
+
+# Return the (source, target) paths of the files to copy from the last render
+# folder to the new one
+def planUpVersionCopies(root, lastDir, lastVersion, scriptVersion, newDir):
+    copies = []
+    for file in sorted(os.listdir(os.path.join(root, lastDir))):
+        oldCopy = os.path.join(root, lastDir, file)
+        if not os.path.isfile(oldCopy):
+            continue
+        newFile = file.replace('_v' + str('{:0>3}'.format(lastVersion)), '_v' + str(scriptVersion))
+        newCopy = os.path.join(root, newDir, newFile)
+        copies.append((oldCopy, newCopy))
+    return copies
+
+
+# Copy the planned files with a pool of worker threads, reporting the progress
+# in a Nuke progress task. Returns the copies that failed.
+def runUpVersionCopies(copies, workers=COPY_WORKERS):
+    amount = len(copies)
+    task = nuke.ProgressTask("UpVerison")
+    lock = threading.Lock()
+    progress = {"count": 0}
+    failed = []
+
+    pending = queue.Queue()
+    for copy in copies:
+        pending.put(copy)
+
+    def copyFiles():
+        while not task.isCancelled():
+            try:
+                oldCopy, newCopy = pending.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                shutil.copy2(oldCopy, newCopy)
+            except (IOError, OSError) as e:
+                with lock:
+                    failed.append((oldCopy, newCopy, e))
+
+            with lock:
+                progress["count"] += 1
+                count = progress["count"]
+                task.setMessage("Step %s of %d" % (count, amount))
+                task.setProgress(int(100 * (float(count) / (amount))))
+
+    threads = [threading.Thread(target=copyFiles) for i in range(min(workers, amount))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for oldCopy, newCopy, e in failed:
+        print("UpVersion could not copy %s to %s: %s" % (oldCopy, newCopy, e))
+    if failed:
+        nuke.executeInMainThread(nuke.message, args=("UpVersion could not copy %d files, see the script editor." % len(failed),))
+
+    return failed
+
+
+# Start copying the last render folder to the new version in the background,
+# returns the thread running the copies
 def upVersionCopy(root, lastDir, lastVersion, scriptVersion, newDir):
-        amount = len(os.listdir(os.path.join(root, lastDir)))
-        task = nuke.ProgressTask("UpVerison")
-        count = 0
-        for file in os.listdir(os.path.join(root, lastDir)):
-            if task.isCancelled():
-                break
-            task.setMessage("Step %s of %d" % (count + 1, amount))
-
-            oldCopy = os.path.join(os.path.join(root.replace("/", "\\"), lastDir), file)
-            newFile = file.replace('_v' + str('{:0>3}'.format(lastVersion)), '_v' + str(scriptVersion))
-            newCopy = os.path.join(os.path.join(root.replace("/", "\\"), newDir), newFile)
-
-
-            copystring = 'copy ' + oldCopy + ' ' + newCopy
-            os.popen(copystring)
-            count += 1
-            percent = int(100 * (float(count) / (amount)))
-            task.setProgress(percent)
+    copies = planUpVersionCopies(root, lastDir, lastVersion, scriptVersion, newDir)
+    thread = threading.Thread(target=runUpVersionCopies, args=(copies,), name="UpVersionCopy")
+    thread.start()
+    return thread
 
 
 def upVersionBase():
@@ -77,7 +132,7 @@ def upVersionBase():
 
 
         if runCopy == True:
-            threading.Thread(None, upVersionCopy(root, lastDir, lastVersion, scriptVersion, newDir)).start()
+            upVersionCopy(root, lastDir, lastVersion, scriptVersion, newDir)
 
 
 
@@ -41,8 +41,10 @@ ScriptsMenu.addCommand('Open last Render', lambda: openLastRender.openLastRender
 
 
 nuke.addOnCreate(checkMedia.checkMediaUI, nodeClass="Read")
+nuke.addKnobChanged(checkMedia.checkMediaKnobChanged, nodeClass="Read")
 nuke.addOnScriptLoad(checkMedia.checkMedia)
 nuke.addOnScriptSave(checkMedia.checkMediaMessage)
+nuke.addOnScriptClose(checkMedia.checkMediaClose)
 
 
 
@@ -11,15 +11,33 @@
 import sgtk
 import os
 import sys
+import json
+import atexit
 import nuke
 import shutil
+import tempfile
+import threading
+import subprocess
 from datetime import date
 import time
 
 from tank_vendor import six
+from tank_vendor.six.moves import queue
 
 HookBaseClass = sgtk.get_hook_baseclass()
 
+# prefix of the protocol lines written by the render worker, see render_worker.py
+PROTOCOL_PREFIX = "REVIEW_WORKER:"
+
+# environment variable turning on the render worker. It holds a Nuke licence
+# of its own while running, so review movies are rendered in the session
+# unless it is set to 1
+RENDER_WORKER_ENV = "REVIEW_RENDER_WORKER"
+
+# the render worker shared by all the review submissions of the session
+_render_worker = None
+_render_worker_lock = threading.Lock()
+
 
 class RenderMedia(HookBaseClass):
     """
@@ -204,22 +222,85 @@ class RenderMedia(HookBaseClass):
             # Make sure the output folder exists
             output_folder = os.path.dirname(output_path)
             self.__app.ensure_folder_exists(output_folder)
-            read['reload'].execute()
-            time.sleep(5)
-            nuke.executeMultiple(
-                    [output_node], ([first_frame - 1, last_frame, 1],), [nuke.views()[0]]
-                )
-            if farm is not True:
-                shutil.copy(localPath, serverPath)
-                os.remove(localPath)
-                output_node.knob('file').setValue(serverPath)
-
+            if farm is not True and use_render_worker():
+                self.__render_in_worker(group, output_node, first_frame, last_frame)
+            else:
+                read['reload'].execute()
+                nuke.executeMultiple(
+                        [output_node], ([first_frame - 1, last_frame, 1],), [nuke.views()[0]]
+                    )
 
         # Cleanup after ourselves
         nuke.delete(group)
 
+        # the submitter uploads output_path as soon as we return, so the movie
+        # has to be on the server by then
+        if output_node and farm is not True:
+            self.__copy_to_server(localPath, serverPath)
+
         return output_path
 
+    def __render_in_worker(self, group, output_node, first_frame, last_frame):
+        """
+        Render the review group in the render worker.
+
+        The group and the root settings of the session are saved to a temporary
+        script the worker pastes and renders, so the session's graph and
+        colour management are used. Nuke waits for the render behind a progress
+        bar, cancelling it stops the worker.
+
+        :param group:               Group holding the review nodes
+        :param output_node:         Write node of the group
+        :param int first_frame:     The first frame of the sequence of frames.
+        :param int last_frame:      The last frame of the sequence of frames.
+        """
+        (handle, script_path) = tempfile.mkstemp(prefix="review_", suffix=".nk")
+        os.close(handle)
+
+        try:
+            for node in nuke.selectedNodes():
+                node.setSelected(False)
+            group.setSelected(True)
+            nuke.nodeCopy(script_path)
+            group.setSelected(False)
+
+            job = {
+                "script": script_path.replace(os.sep, "/"),
+                "root_knobs": nuke.root().writeKnobs(
+                    nuke.WRITE_NON_DEFAULT_ONLY | nuke.TO_SCRIPT
+                ),
+                "write": output_node.fullName(),
+                "first_frame": first_frame,
+                "last_frame": last_frame,
+            }
+
+            worker = get_render_worker(self.__app.logger)
+            progress = nuke.ProgressTask("Rendering review movie")
+            try:
+                worker.run(job, progress)
+            except RenderWorkerError as e:
+                raise sgtk.TankError("Could not render the review movie: %s" % (e,))
+            finally:
+                # the progress bar is closed when the task is deleted
+                del progress
+        finally:
+            os.remove(script_path)
+
+    def __copy_to_server(self, local_path, server_path):
+        """
+        Copy the movie rendered to the local cache to the server.
+
+        :param str local_path:      Path of the movie in the local cache
+        :param str server_path:     Path of the movie on the server
+        """
+        try:
+            shutil.copy(local_path, server_path)
+            os.remove(local_path)
+        except (IOError, OSError) as e:
+            raise sgtk.TankError(
+                "Could not copy the review movie to %s: %s" % (server_path, e)
+            )
+
     def __create_scale_node(self, width, height):
         """
         Create the Nuke scale node to resize the content.
@@ -325,3 +406,281 @@ class RenderMedia(HookBaseClass):
                 settings["format"] = "MOV format (mov)"
 
         return settings
+
+
+class RenderWorkerError(Exception):
+    pass
+
+
+class RenderWorker(object):
+    """
+    A long running ``nuke -t`` process rendering review movies.
+
+    Jobs are sent to the worker as json lines on its stdin and the worker
+    answers with json lines on its stdout when a job started, for each frame
+    rendered and when it is done or failed, so the client waits for the render
+    explicitly. The process is stopped after being idle for ``idle_timeout``
+    seconds.
+    """
+
+    # seconds to wait for nuke to start and load the worker script
+    STARTUP_TIMEOUT = 300
+
+    # seconds to wait for a message of the worker while rendering a job
+    # before giving up on it
+    JOB_TIMEOUT = 600
+
+    # seconds between two checks of the progress task while waiting for a job
+    POLL_INTERVAL = 0.2
+
+    # seconds to wait for the worker to exit when stopping it
+    STOP_TIMEOUT = 30
+
+    def __init__(self, command, logger, idle_timeout=600):
+        self.command = command
+        self.logger = logger
+        self.idle_timeout = idle_timeout
+
+        self.stats = {"jobs": 0, "startups": 0, "startup_time": 0.0, "job_time": 0.0}
+
+        self._process = None
+        self._messages = None
+        self._job_id = 0
+        self._idle_timer = None
+        self._idle_token = 0
+        self._lock = threading.RLock()
+
+    def run(self, job, progress=None):
+        """
+        Render a job, blocking until the worker reports it is done.
+
+        :param dict job: The job to render.
+        :param progress: Optional ``nuke.ProgressTask`` showing the progress of
+            the job. The worker is stopped if the task is cancelled.
+        """
+        with self._lock:
+            self._cancel_idle_stop()
+
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+
+            self._job_id += 1
+            job = dict(job, id=self._job_id)
+
+            start_time = time.time()
+            try:
+                self._process.stdin.write(json.dumps(job) + "\n")
+                self._process.stdin.flush()
+                self._wait_for_job(job, progress)
+            except (IOError, OSError) as e:
+                self.stop()
+                raise RenderWorkerError("Lost connection to the render worker: %s" % (e,))
+            except RenderWorkerError:
+                # only restart the worker if it died, a failed job leaves it usable
+                if self._process is not None and self._process.poll() is not None:
+                    self.stop()
+                raise
+            finally:
+                if self._process is not None:
+                    self._schedule_idle_stop()
+
+            job_time = time.time() - start_time
+            self.stats["jobs"] += 1
+            self.stats["job_time"] += job_time
+            self.logger.debug("Review movie rendered in %.2fs. %s" % (job_time, self.stats))
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """
+        Stop the worker process, it is started again by the next job.
+
+        :param float timeout: Seconds to wait for the worker to exit before
+            killing it.
+        """
+        with self._lock:
+            self._cancel_idle_stop()
+
+            process = self._process
+            self._process = None
+            if process is None:
+                return
+
+            try:
+                process.stdin.close()
+            except (IOError, OSError):
+                pass
+
+            stop_deadline = time.time() + timeout
+            while process.poll() is None and time.time() < stop_deadline:
+                time.sleep(0.1)
+
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+            self.logger.debug("Stopped review render worker %s" % (process.pid,))
+
+    def _start(self):
+        start_time = time.time()
+
+        self._process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            bufsize=1,
+        )
+        self._messages = queue.Queue()
+
+        reader = threading.Thread(
+            target=self._read_stdout, args=(self._process.stdout, self._messages)
+        )
+        reader.daemon = True
+        reader.start()
+
+        message = self._get_message(self.STARTUP_TIMEOUT)
+        if message.get("status") != "ready":
+            self.stop()
+            raise RenderWorkerError(
+                "Render worker failed to start: %s" % (message.get("message"),)
+            )
+
+        startup_time = time.time() - start_time
+        self.stats["startups"] += 1
+        self.stats["startup_time"] += startup_time
+        self.logger.debug(
+            "Started review render worker %s in %.2fs" % (self._process.pid, startup_time)
+        )
+
+    def _wait_for_job(self, job, progress=None):
+        frame_count = job["last_frame"] - job["first_frame"] + 2
+        frames = 0
+        deadline = time.time() + self.JOB_TIMEOUT
+
+        while True:
+            if progress is not None and progress.isCancelled():
+                # the worker can't be interrupted while rendering
+                self.stop(timeout=0)
+                raise RenderWorkerError("Render cancelled.")
+
+            try:
+                message = self._messages.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                if time.time() > deadline:
+                    self.stop(timeout=0)
+                    raise RenderWorkerError(
+                        "Render worker sent nothing for %s seconds." % (self.JOB_TIMEOUT,)
+                    )
+                continue
+
+            if message is None:
+                raise self._exit_error()
+
+            deadline = time.time() + self.JOB_TIMEOUT
+
+            status = message.get("status")
+
+            # errors without an id are about jobs the worker couldn't read
+            if message.get("id") is None and status == "error":
+                raise RenderWorkerError(message.get("message"))
+
+            if message.get("id") != job["id"]:
+                continue
+
+            if status == "error":
+                raise RenderWorkerError(message.get("message"))
+            elif status == "done":
+                return
+            elif status == "frame" and progress is not None:
+                frames += 1
+                progress.setMessage("Frame %s" % (message.get("frame"),))
+                progress.setProgress(min(100, int(frames * 100 / frame_count)))
+
+    def _get_message(self, timeout=None):
+        try:
+            message = self._messages.get(timeout=timeout)
+        except queue.Empty:
+            raise RenderWorkerError("Timed out waiting for the render worker.")
+
+        if message is None:
+            raise self._exit_error()
+
+        return message
+
+    def _exit_error(self):
+        # stdout is closed as the worker exits, wait for its exit code
+        exit_deadline = time.time() + self.STOP_TIMEOUT
+        while self._process.poll() is None and time.time() < exit_deadline:
+            time.sleep(0.1)
+
+        return RenderWorkerError(
+            "Render worker exited with code %s." % (self._process.poll(),)
+        )
+
+    def _read_stdout(self, stream, messages):
+        for line in iter(stream.readline, ""):
+            line = line.strip()
+            if line.startswith(PROTOCOL_PREFIX):
+                try:
+                    messages.put(json.loads(line[len(PROTOCOL_PREFIX):]))
+                    continue
+                except ValueError:
+                    pass
+
+            if line:
+                self.logger.debug(line)
+
+        # let the client know the worker has exited
+        messages.put(None)
+
+    def _schedule_idle_stop(self):
+        self._idle_token += 1
+        self._idle_timer = threading.Timer(
+            self.idle_timeout, self._on_idle, args=(self._idle_token,)
+        )
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _cancel_idle_stop(self):
+        self._idle_token += 1
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _on_idle(self, token):
+        with self._lock:
+            # a job was started since this timer was scheduled
+            if token != self._idle_token:
+                return
+            self.stop()
+
+
+def use_render_worker():
+    """
+    Return True if review movies are rendered in the render worker.
+    """
+    return os.environ.get(RENDER_WORKER_ENV) == "1"
+
+
+def get_render_worker(logger):
+    """
+    Return the review render worker shared by all the submissions of the session.
+    """
+    global _render_worker
+
+    with _render_worker_lock:
+        if _render_worker is None:
+            worker_script = os.path.join(os.path.dirname(__file__), "render_worker.py")
+            _render_worker = RenderWorker(
+                [sys.executable, "-t", worker_script], logger
+            )
+
+    return _render_worker
+
+
+@atexit.register
+def _stop_render_worker():
+    # make sure no nuke process outlives the session
+    with _render_worker_lock:
+        if _render_worker is not None:
+            _render_worker.stop()
@@ -0,0 +1,115 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Review render worker, run by the render_media hook with ``nuke -t``.
+
+Jobs are read as json lines on stdin. Each job points to a Nuke script holding
+the review group to render and the root settings of the artist's session.
+Replies are json lines on stdout prefixed with ``REVIEW_WORKER:``, with a
+status of ``ready``, ``started``, ``frame``, ``done`` or ``error``.
+"""
+
+import json
+import sys
+
+# prefix of the protocol lines written by the worker
+PROTOCOL_PREFIX = "REVIEW_WORKER:"
+
+
+def render_job(job, frame_rendered):
+    """
+    Render the movie of a review job.
+
+    :param dict job: The job, with the ``script`` holding the review group,
+        the ``root_knobs`` of the session, the full name of the ``write`` node
+        in the group and the ``first_frame`` and ``last_frame`` to render.
+    :param frame_rendered: Function called with each frame rendered.
+    """
+    import nuke
+
+    nuke.scriptClear()
+    nuke.root().readKnobs(job["root_knobs"])
+    nuke.nodePaste(job["script"])
+
+    output_node = nuke.toNode(job["write"])
+    if output_node is None:
+        raise RuntimeError("Write node %s not found in %s" % (job["write"], job["script"]))
+
+    def after_frame_render():
+        frame_rendered(nuke.frame())
+
+    nuke.addAfterFrameRender(after_frame_render, nodeClass="Write")
+    try:
+        nuke.executeMultiple(
+            [output_node],
+            ([job["first_frame"] - 1, job["last_frame"], 1],),
+            [nuke.views()[0]],
+        )
+    finally:
+        nuke.removeAfterFrameRender(after_frame_render, nodeClass="Write")
+
+
+def send(message, stdout=None):
+    """
+    Write a protocol message for the client.
+    """
+    if stdout is None:
+        stdout = sys.stdout
+    stdout.write(PROTOCOL_PREFIX + json.dumps(message) + "\n")
+    stdout.flush()
+
+
+def run_worker(render=render_job, stdin=None, stdout=None):
+    """
+    Render the jobs sent as json lines on stdin until stdin is closed.
+
+    :param render: Function rendering a job, called with the job and a
+        function to call with each frame rendered.
+    """
+    if stdin is None:
+        stdin = sys.stdin
+
+    send({"status": "ready"}, stdout)
+
+    while True:
+        line = stdin.readline()
+        if not line:
+            break
+
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            job = json.loads(line)
+        except ValueError as e:
+            send({"status": "error", "message": "Invalid job: %s" % (e,)}, stdout)
+            continue
+
+        if not isinstance(job, dict):
+            send({"status": "error", "message": "Invalid job: %s" % (line,)}, stdout)
+            continue
+
+        job_id = job.get("id")
+        send({"id": job_id, "status": "started"}, stdout)
+        try:
+            render(
+                job,
+                lambda frame: send({"id": job_id, "status": "frame", "frame": frame}, stdout),
+            )
+        except Exception as e:
+            send({"id": job_id, "status": "error", "message": str(e)}, stdout)
+        else:
+            send({"id": job_id, "status": "done"}, stdout)
+
+
+if __name__ == "__main__":
+    run_worker()
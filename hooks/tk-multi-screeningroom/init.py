@@ -9,9 +9,19 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 import sgtk
 import os
+import threading
 
 HookBaseClass = sgtk.get_hook_baseclass()
 
+# Shotgun fields of the Project holding its display settings
+PROJECT_DISPLAY_FIELDS = ["sg_espacio___color", "sg_formato___ratio"]
+
+# display environment of each project, keyed by project id. Hook instances
+# are created for each call, so the cache lives in the module, which is loaded
+# again when the engine is restarted
+_project_display_settings = {}
+_project_display_settings_lock = threading.Lock()
+
 
 class ScreeningroomInit(HookBaseClass):
     """
@@ -40,26 +50,71 @@ class ScreeningroomInit(HookBaseClass):
         current_context = rv_launch.context
 
         ## Definir variables generales para su posible uso posterior dentro de las aplicaciones
-        os.environ["PROJECT"] = str(current_context.project["name"])
-        project_path = self.parent.tank.roots.get("primary")
-        os.environ["PROJECT_PATH"] = project_path
-        rawMount = os.path.normpath(project_path)
-        Mount = rawMount.split(os.sep)[0]
-        os.environ["MOUNT"] = Mount
-        ocio_path = os.path.join(
-            project_path, "CONFIG", "COLOR", "ACES", "studio-config-v1.0.0_aces-v1.3_ocio-v2.1.ocio"
-        )
-        os.environ["OCIO"] = ocio_path
+        os.environ.update(self.get_project_display_settings(current_context.project))
+
+    def get_project_display_settings(self, project):
+        """
+        Returns the display environment variables of a project.
+
+        The project's colour space and mask ratio are fetched from Shotgun in a
+        single query the first time and then cached until the engine is
+        restarted, see :meth:`invalidate_project_display_settings`.
+
+        :param dict project: The Project entity of the current context
+        :returns: The environment variables to set for RV
+        :rtype: dict
+        :raises TankError: If the project can't be found in Shotgun
+        """
+        with _project_display_settings_lock:
+            settings = _project_display_settings.get(project["id"])
+            if settings is not None:
+                return settings
+
+            project_path = self.parent.tank.roots.get("primary")
+            rawMount = os.path.normpath(project_path)
+            Mount = rawMount.split(os.sep)[0]
+            ocio_path = os.path.join(
+                project_path, "CONFIG", "COLOR", "ACES", "studio-config-v1.0.0_aces-v1.3_ocio-v2.1.ocio"
+            )
+
+            sg_project = self.parent.shotgun.find_one(
+                "Project", [["id", "is", project["id"]]], PROJECT_DISPLAY_FIELDS
+            )
+            if sg_project is None:
+                raise sgtk.TankError(
+                    "Could not find the Project %s (id %s) in Shotgun to read "
+                    "its display settings." % (project["name"], project["id"])
+                )
 
-        # filters = [["code" "is" ]]
-        getColor = sgtk.platform.current_engine().shotgun.find_one("Project", [
-            ["name", "is", str(current_context.project["name"])]], ["sg_espacio___color"])
+            settings = {
+                "PROJECT": str(project["name"]),
+                "PROJECT_PATH": project_path,
+                "MOUNT": Mount,
+                "OCIO": ocio_path,
+                "PROJECTCOLORSPACE": str(sg_project["sg_espacio___color"]),
+                "PROJECTMASK": str(sg_project["sg_formato___ratio"]),
+                "RV_SUPPORT_PATH": os.path.join(project_path, "CONFIG", "COLOR", "RV"),
+            }
 
-        os.environ["PROJECTCOLORSPACE"] = str(getColor["sg_espacio___color"])
+            _project_display_settings[project["id"]] = settings
+            return settings
 
-        getMask = sgtk.platform.current_engine().shotgun.find_one("Project", [
-            ["name", "is", str(current_context.project["name"])]], ["sg_formato___ratio"])
+    def invalidate_project_display_settings(self, project_id=None):
+        """
+        Discards the cached display settings, so they are fetched again at the
+        next RV launch.
+
+        Can be called from outside the hook with::
 
-        os.environ["PROJECTMASK"] = str(getMask["sg_formato___ratio"])
+            app.execute_hook_method(
+                "init_hook", "invalidate_project_display_settings", project_id=123
+            )
 
-        os.environ["RV_SUPPORT_PATH"] = os.path.join(project_path, "CONFIG", "COLOR", "RV")
+        :param int project_id: Only discard the settings of this project. All
+            the cached settings are discarded if not specified.
+        """
+        with _project_display_settings_lock:
+            if project_id is None:
+                _project_display_settings.clear()
+            else:
+                _project_display_settings.pop(project_id, None)
@@ -0,0 +1,116 @@
+"""
+Tests of the screening room init hook, run against a fake sgtk module and a
+call-counting fake Shotgun.
+"""
+
+import importlib.util
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+HOOK_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "hooks", "tk-multi-screeningroom",
+    "init.py"
+)
+
+
+class FakeShotgun(object):
+    def __init__(self, projects):
+        self.projects = projects
+        self.calls = []
+
+    def find_one(self, entity_type, filters, fields):
+        self.calls.append((entity_type, filters, fields))
+        return self.projects.get(filters[0][2])
+
+
+def _make_sgtk():
+    sgtk = types.ModuleType("sgtk")
+    sgtk.TankError = type("TankError", (Exception,), {})
+    sgtk.get_hook_baseclass = lambda: object
+    return sgtk
+
+
+def _load_hook():
+    spec = importlib.util.spec_from_file_location("screeningroom_init", HOOK_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestProjectDisplaySettings(unittest.TestCase):
+    def setUp(self):
+        self.sgtk = _make_sgtk()
+        sys.modules["sgtk"] = self.sgtk
+        self.hook_module = _load_hook()
+
+        self.shotgun = FakeShotgun({
+            70: {"sg_espacio___color": "ACEScg", "sg_formato___ratio": "2.39"},
+        })
+        self.project = {"type": "Project", "id": 70, "name": "Lumen"}
+        self.app = types.SimpleNamespace(
+            shotgun=self.shotgun,
+            tank=types.SimpleNamespace(roots={"primary": "/mnt/projects/Lumen"}),
+            context=types.SimpleNamespace(project=self.project),
+        )
+
+    def tearDown(self):
+        del sys.modules["sgtk"]
+
+    def make_hook(self):
+        # hooks are instantiated again for each call
+        hook = self.hook_module.ScreeningroomInit()
+        hook.parent = self.app
+        return hook
+
+    def launch(self):
+        with mock.patch.dict(os.environ):
+            self.make_hook().before_rv_launch("/usr/local/bin/rv")
+            return dict(os.environ)
+
+    def test_cached_between_launches(self):
+        """
+        Ensures the project is only queried once across launches and again
+        after the cache is invalidated.
+        """
+        for _ in range(5):
+            environ = self.launch()
+
+        self.assertEqual(len(self.shotgun.calls), 1)
+        self.assertEqual(environ["PROJECT"], "Lumen")
+        self.assertEqual(environ["PROJECTCOLORSPACE"], "ACEScg")
+        self.assertEqual(environ["PROJECTMASK"], "2.39")
+
+        self.make_hook().invalidate_project_display_settings(project_id=70)
+        self.launch()
+        self.launch()
+        self.assertEqual(len(self.shotgun.calls), 2)
+
+        self.make_hook().invalidate_project_display_settings()
+        self.launch()
+        self.assertEqual(len(self.shotgun.calls), 3)
+
+    def test_other_project_kept(self):
+        """
+        Ensures invalidating another project keeps the cached settings.
+        """
+        self.launch()
+        self.make_hook().invalidate_project_display_settings(project_id=71)
+        self.launch()
+        self.assertEqual(len(self.shotgun.calls), 1)
+
+    def test_missing_project(self):
+        """
+        Ensures a project missing from Shotgun raises and isn't cached.
+        """
+        self.project["id"] = 71
+        for _ in range(2):
+            with self.assertRaises(self.sgtk.TankError):
+                self.launch()
+        self.assertEqual(len(self.shotgun.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
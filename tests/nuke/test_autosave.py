@@ -0,0 +1,170 @@
+"""
+Headless tests of the rolling autosave callbacks, run against a fake nuke
+module in a temporary folder.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+import unittest
+from unittest import mock
+
+SCRIPTS_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "core", "schema", "project",
+    "CONFIG", "NUKE", "SCRIPTS"
+)
+
+# the callback is run by Nuke's autosave timer and must not hold the UI
+MAX_CALLBACK_TIME = 0.05
+
+
+class FakeNode(object):
+    def __init__(self, name, **knobs):
+        self._name = name
+        self.knobs = knobs
+
+    def name(self):
+        return self._name
+
+    def knob(self, name):
+        return types.SimpleNamespace(evaluate=lambda: self.knobs[name])
+
+
+def _make_nuke(root, preferences):
+    nuke = types.ModuleType("nuke")
+    nuke.root = lambda: root
+    nuke.toNode = lambda name: preferences
+    for callback in ("addAutoSaveFilter", "addAutoSaveRestoreFilter",
+                     "addAutoSaveDeleteFilter"):
+        setattr(nuke, callback, lambda *args, **kwargs: None)
+    return nuke
+
+
+class TestAutoSave(unittest.TestCase):
+    def setUp(self):
+        # the callbacks build Windows paths on the mapped drives, which are
+        # relative paths under the temporary folder here
+        self.cwd = os.getcwd()
+        self.folder = tempfile.mkdtemp()
+        os.chdir(self.folder)
+        os.makedirs("L:/cache")
+        os.makedirs("P:/shots")
+        self.filename = "P:/shots/shot_v001.nk.autosave"
+
+        self.root = FakeNode("P:/shots/shot_v001.nk")
+        preferences = FakeNode("preferences", localCachePath="L:/cache")
+        self.nuke = _make_nuke(self.root, preferences)
+        sys.modules["nuke"] = self.nuke
+        sys.path.insert(0, SCRIPTS_PATH)
+        sys.modules.pop("autosave", None)
+        import autosave
+
+        self.autosave = autosave
+
+    def tearDown(self):
+        self.autosave.autoSaveMirror.wait(timeout=5)
+        sys.path.pop(0)
+        del sys.modules["nuke"]
+        sys.modules.pop("autosave", None)
+        os.chdir(self.cwd)
+        shutil.rmtree(self.folder)
+
+    def autoSave(self, content="set cut_paste_input"):
+        """
+        Runs the autosave callback the way Nuke does and writes the autosave
+        to the path it returned. Returns the path and the callback time.
+        """
+        start = time.time()
+        path = self.autosave.onAutoSave(self.filename)
+        elapsed = time.time() - start
+
+        with open(path, "w") as autosave_file:
+            autosave_file.write(content)
+        return (path, elapsed)
+
+    def mirrorPath(self, path):
+        return os.path.join("L:\\", "autosave", path[3:])
+
+    def test_rolling_numbers(self):
+        """
+        Ensures autosaves roll from 0 to 5 and the autosave files are only
+        globbed the first time.
+        """
+        glob = mock.Mock(wraps=self.autosave.glob.glob)
+        with mock.patch.object(self.autosave.glob, "glob", glob):
+            paths = [self.autoSave()[0] for _ in range(8)]
+
+        suffixes = [path[len(self.filename):] for path in paths]
+        self.assertEqual(suffixes, ["", "1", "2", "3", "4", "5", "", "1"])
+        self.assertEqual(glob.call_count, 2)
+
+    def test_resume_numbers(self):
+        """
+        Ensures the numbers pick up after the last autosave of an earlier
+        session.
+        """
+        for suffix in ("", "1", "2"):
+            with open(self.filename + suffix, "w"):
+                pass
+            os.utime(self.filename + suffix, (0, 100 + len(suffix)))
+
+        self.assertEqual(self.autoSave()[0], self.filename + "3")
+
+    def test_untitled(self):
+        """
+        Ensures the autosave of an untitled script is left alone.
+        """
+        self.root._name = "Root"
+        self.assertEqual(self.autosave.onAutoSave(self.filename), self.filename)
+        self.assertEqual(self.autosave.autoSaveNumbers, {})
+
+    def test_callback_latency(self):
+        """
+        Ensures the callback returns without waiting for slow mirror copies,
+        which collapse into the latest one, and the previous autosave is
+        mirrored.
+        """
+        copy = shutil.copy
+
+        def slow_copy(source, target):
+            time.sleep(0.2)
+            return copy(source, target)
+
+        with mock.patch.object(self.autosave.shutil, "copy", slow_copy):
+            times = []
+            paths = []
+            for index in range(6):
+                (path, elapsed) = self.autoSave("autosave %d" % index)
+                paths.append(path)
+                times.append(elapsed)
+
+            self.assertLess(max(times), MAX_CALLBACK_TIME)
+            self.assertTrue(self.autosave.autoSaveMirror.wait(timeout=5))
+
+        mirror = self.autosave.autoSaveMirror
+        # the first autosave has nothing to mirror
+        self.assertEqual(mirror.copied + mirror.skipped, 5)
+        self.assertGreater(mirror.skipped, 0)
+        # the autosave before the last one was copied last
+        with open(self.mirrorPath(paths[-2])) as mirror_file:
+            self.assertEqual(mirror_file.read(), "autosave 4")
+
+    def test_copy_error(self):
+        """
+        Ensures a failed mirror copy is reported instead of raised.
+        """
+        copy = mock.Mock(side_effect=IOError("offline"))
+        with mock.patch.object(self.autosave.shutil, "copy", copy):
+            self.autoSave()
+            self.autoSave()
+            self.assertTrue(self.autosave.autoSaveMirror.wait(timeout=5))
+
+        self.assertEqual(copy.call_count, 1)
+        self.assertEqual(self.autosave.autoSaveMirror.copied, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""
+Headless tests of the frame write back of copy_rendered_files, run against a
+fake nuke module and temporary folders.
+"""
+
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+SCRIPTS_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "core", "schema", "project",
+    "CONFIG", "NUKE", "SCRIPTS"
+)
+
+
+def _make_nuke():
+    nuke = types.ModuleType("nuke")
+    nuke.messages = []
+    nuke.tprint = nuke.messages.append
+    nuke.addAfterRender = lambda *args, **kwargs: None
+    return nuke
+
+
+class TestFrameWriteBack(unittest.TestCase):
+    def setUp(self):
+        self.nuke = _make_nuke()
+        sys.modules["nuke"] = self.nuke
+        sys.path.insert(0, SCRIPTS_PATH)
+        sys.modules.pop("copy_rendered_files", None)
+        with mock.patch("atexit.register"):
+            import copy_rendered_files
+
+        self.module = copy_rendered_files
+        self.folder = tempfile.mkdtemp()
+        self.cache = os.path.join(self.folder, "cache")
+        self.server = os.path.join(self.folder, "server")
+        os.makedirs(self.cache)
+
+    def tearDown(self):
+        sys.path.pop(0)
+        del sys.modules["nuke"]
+        sys.modules.pop("copy_rendered_files", None)
+        shutil.rmtree(self.folder)
+
+    def render_frame(self, frame, size=1024):
+        """
+        Writes a cached frame and returns its path and the one on the server.
+        """
+        name = "shot_v001.%04d.exr" % frame
+        source = os.path.join(self.cache, name)
+        with open(source, "wb") as frame_file:
+            frame_file.write(b"x" * size)
+        return (source, os.path.join(self.server, "v001", name))
+
+    def test_copy(self):
+        """
+        Ensures frames are copied to missing server folders and their cached
+        copy removed.
+        """
+        write_back = self.module.frameWriteBack(retryDelay=0)
+        frames = [self.render_frame(frame) for frame in range(1, 11)]
+        for (source, target) in frames:
+            write_back.submit(source, target)
+
+        self.assertEqual(write_back.drain(), [])
+        for (source, target) in frames:
+            self.assertFalse(os.path.exists(source))
+            self.assertEqual(os.path.getsize(target), 1024)
+
+        stats = write_back.takeStats()
+        self.assertEqual(
+            (stats["queued"], stats["copied"], stats["failed"]), (10, 10, 0)
+        )
+        self.assertEqual(write_back.takeStats()["queued"], 0)
+
+    def test_retry(self):
+        """
+        Ensures a copy failing for a moment is retried.
+        """
+        copyfile = shutil.copyfile
+        calls = []
+
+        def flaky_copyfile(source, target):
+            calls.append(source)
+            if len(calls) < 3:
+                raise IOError("The network path was not found")
+            return copyfile(source, target)
+
+        write_back = self.module.frameWriteBack(workers=1, retries=3, retryDelay=0)
+        (source, target) = self.render_frame(1)
+        with mock.patch.object(self.module.shutil, "copyfile", flaky_copyfile):
+            write_back.submit(source, target)
+            self.assertEqual(write_back.drain(), [])
+
+        self.assertEqual(len(calls), 3)
+        self.assertTrue(os.path.exists(target))
+        self.assertFalse(os.path.exists(source))
+        stats = write_back.takeStats()
+        self.assertEqual((stats["copied"], stats["retried"]), (1, 2))
+
+    def test_size_mismatch(self):
+        """
+        Ensures a truncated copy is retried and, once the retries are used up,
+        reported with the cached frame kept.
+        """
+        def truncated_copyfile(source, target):
+            with open(target, "wb") as target_file:
+                target_file.write(b"x" * 10)
+
+        write_back = self.module.frameWriteBack(workers=1, retries=2, retryDelay=0)
+        (source, target) = self.render_frame(1)
+        with mock.patch.object(self.module.shutil, "copyfile", truncated_copyfile):
+            write_back.submit(source, target)
+            failed = write_back.drain()
+
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(failed[0][:2], (source, target))
+        self.assertIn("Size of the copy", str(failed[0][2]))
+        self.assertTrue(os.path.exists(source))
+        self.assertEqual(len(self.nuke.messages), 1)
+
+        stats = write_back.takeStats()
+        self.assertEqual(
+            (stats["copied"], stats["failed"], stats["retried"]), (0, 1, 2)
+        )
+
+    def test_drain_write_back(self):
+        """
+        Ensures drainWriteBack waits for the frames of the render and reports
+        the queue depth and the time spent queueing each frame, which has to
+        stay small while the copies are slow.
+        """
+        copyfile = shutil.copyfile
+
+        def slow_copyfile(source, target):
+            self.module.time.sleep(0.01)
+            return copyfile(source, target)
+
+        self.module.drainWriteBack()
+
+        write_back = self.module.frameWriteBack(workers=2, maxQueued=8, retryDelay=0)
+        self.module.writeBack = write_back
+        frames = [self.render_frame(frame) for frame in range(1, 9)]
+        stdout = io.StringIO()
+        with mock.patch.object(self.module.shutil, "copyfile", slow_copyfile):
+            for (source, target) in frames:
+                write_back.submit(source, target)
+            with mock.patch("sys.stdout", stdout):
+                self.module.drainWriteBack()
+
+        for (source, target) in frames:
+            self.assertTrue(os.path.exists(target))
+
+        match = re.search(
+            r"(\d+) queued, (\d+) copied, (\d+) failed, max queue depth (\d+), "
+            r"([\d.]+)s per frame", stdout.getvalue()
+        )
+        self.assertIsNotNone(match, stdout.getvalue())
+        (queued, copied, failed, depth) = [int(value) for value in match.groups()[:4]]
+        self.assertEqual((queued, copied, failed), (8, 8, 0))
+        self.assertTrue(1 <= depth <= 8)
+        # queueing doesn't wait for the copies while the queue has room
+        self.assertLess(float(match.group(5)), 0.005)
+
+        # stats are reset by the drain
+        stdout = io.StringIO()
+        with mock.patch("sys.stdout", stdout):
+            self.module.drainWriteBack()
+        self.assertEqual(stdout.getvalue(), "")
+
+    def test_bounded_queue(self):
+        """
+        Ensures queueing blocks once the queue is full, bounding its depth.
+        """
+        write_back = self.module.frameWriteBack(workers=1, maxQueued=2, retryDelay=0)
+        copyfile = shutil.copyfile
+
+        def slow_copyfile(source, target):
+            self.module.time.sleep(0.02)
+            return copyfile(source, target)
+
+        with mock.patch.object(self.module.shutil, "copyfile", slow_copyfile):
+            for frame in range(1, 11):
+                write_back.submit(*self.render_frame(frame))
+            write_back.drain()
+
+        stats = write_back.takeStats()
+        self.assertEqual(stats["copied"], 10)
+        self.assertLessEqual(stats["maxDepth"], 2)
+        # the render had to wait for the copies
+        self.assertGreater(stats["submitTime"], 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Tests of the templates manifest of generateTools, run against a fake nuke
+module and a temporary folder.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+SCRIPTS_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "core", "schema", "project",
+    "CONFIG", "NUKE", "SCRIPTS"
+)
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        sys.modules["nuke"] = types.ModuleType("nuke")
+        sys.path.insert(0, SCRIPTS_PATH)
+        sys.modules.pop("generateTools", None)
+        import generateTools
+
+        self.generateTools = generateTools
+        self.folder = tempfile.mkdtemp()
+        self.manifestDir = os.path.join(self.folder, ".nuke")
+        generateTools.ManifestPath = os.path.join(
+            self.manifestDir, "templates_manifest.json"
+        )
+
+    def tearDown(self):
+        sys.path.pop(0)
+        del sys.modules["nuke"]
+        sys.modules.pop("generateTools", None)
+        shutil.rmtree(self.folder)
+
+    def test_save(self):
+        """
+        Ensures the manifest is saved, replacing the previous one, without
+        leaving temporary files behind.
+        """
+        manifest = {"/tools": {"mtime": 1.5, "tools": [["blur", "/tools/blur.nk"]]}}
+        self.generateTools.SaveManifest({"/old": {}})
+        self.generateTools.SaveManifest(manifest)
+
+        self.assertEqual(self.generateTools.LoadManifest(), manifest)
+        self.assertEqual(os.listdir(self.manifestDir), ["templates_manifest.json"])
+
+    def test_failed_save(self):
+        """
+        Ensures a manifest that fails to be written leaves the previous one
+        untouched.
+        """
+        self.generateTools.SaveManifest({"/tools": {}})
+
+        with mock.patch.object(
+            self.generateTools.json, "dump", side_effect=IOError("disk full")
+        ):
+            self.generateTools.SaveManifest({"/other": {}})
+
+        with open(self.generateTools.ManifestPath) as manifestFile:
+            self.assertEqual(json.load(manifestFile), {"/tools": {}})
+        self.assertEqual(os.listdir(self.manifestDir), ["templates_manifest.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
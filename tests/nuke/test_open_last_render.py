@@ -0,0 +1,166 @@
+"""
+Tests of openLastRender, run against a fake nuke module and temporary render
+folders.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+SCRIPTS_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "core", "schema", "project",
+    "CONFIG", "NUKE", "SCRIPTS"
+)
+
+
+class FakeRead(object):
+    def __init__(self):
+        self.fileValue = None
+
+    def knob(self, name):
+        return types.SimpleNamespace(fromUserText=self.setFile)
+
+    def setFile(self, value):
+        self.fileValue = value
+
+
+def _make_nuke(scriptPath):
+    nuke = types.ModuleType("nuke")
+    nuke.reads = []
+    nuke.messages = []
+    nuke.root = lambda: types.SimpleNamespace(name=lambda: scriptPath)
+    nuke.message = nuke.messages.append
+
+    def Read():
+        read = FakeRead()
+        nuke.reads.append(read)
+        return read
+
+    nuke.nodes = types.SimpleNamespace(Read=Read)
+    return nuke
+
+
+class TestOpenLastRender(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.images = os.path.join(self.folder, "IMAGES")
+        os.makedirs(os.path.join(self.folder, "SCRIPTS"))
+        os.makedirs(self.images)
+
+        self.nuke = _make_nuke(os.path.join(self.folder, "SCRIPTS", "shot_v010.nk"))
+        sys.modules["nuke"] = self.nuke
+        sys.path.insert(0, SCRIPTS_PATH)
+        sys.modules.pop("openLastRender", None)
+        import openLastRender
+
+        self.module = openLastRender
+
+    def tearDown(self):
+        sys.path.pop(0)
+        del sys.modules["nuke"]
+        sys.modules.pop("openLastRender", None)
+        shutil.rmtree(self.folder)
+
+    def makeRender(self, folderName, names, age=60):
+        """
+        Creates a render folder holding the named files, last modified the
+        given number of seconds ago.
+        """
+        path = os.path.join(self.images, folderName)
+        os.makedirs(path)
+        for name in names:
+            open(os.path.join(path, name), "w").close()
+
+        mtime = self.module.time.time() - age
+        os.utime(path, (mtime, mtime))
+        os.utime(self.images, (mtime, mtime))
+        return path
+
+    def test_sequences(self):
+        """
+        Ensures frames are grouped into sequences padded to the shortest
+        frame, and other files are read on their own.
+        """
+        frames = ["comp_v010.%03d.exr" % frame for frame in range(995, 1201)]
+        path = self.makeRender(
+            "comp_v010", frames + ["matte_0001.exr", "matte_0002.exr", "comp_v010.exr"]
+        )
+
+        self.assertEqual(
+            self.module.getRenderSequences(path),
+            [
+                os.path.join(path, "comp_v010.%03d.exr 995-1200"),
+                os.path.join(path, "matte_%04d.exr 1-2"),
+                os.path.join(path, "comp_v010.exr"),
+            ],
+        )
+
+    def test_open_last_render(self):
+        """
+        Ensures the render folder with the highest version number is read.
+        """
+        self.makeRender("comp_v9", ["comp_v9.001.exr"])
+        path = self.makeRender("comp_v10", ["comp_v10.001.exr", "comp_v10.002.exr"])
+
+        self.module.openLastRender()
+
+        self.assertEqual(
+            [read.fileValue for read in self.nuke.reads],
+            [os.path.join(path, "comp_v10.%03d.exr 1-2")],
+        )
+
+    def test_no_renders(self):
+        """
+        Ensures the user is told when there is no render to open.
+        """
+        self.module.openLastRender()
+        self.assertEqual(len(self.nuke.messages), 1)
+        self.assertEqual(self.nuke.reads, [])
+
+    def test_cached_lookup(self):
+        """
+        Ensures a folder is only listed again once it changed.
+        """
+        path = self.makeRender("comp_v010", ["comp_v010.001.exr"])
+        listEntries = mock.Mock(wraps=self.module.listEntries)
+
+        with mock.patch.object(self.module, "listEntries", listEntries):
+            for _ in range(3):
+                self.module.getRenderSequences(path)
+            self.assertEqual(listEntries.call_count, 1)
+
+            open(os.path.join(path, "comp_v010.002.exr"), "w").close()
+            os.utime(path, (0, 100))
+            self.assertEqual(
+                self.module.getRenderSequences(path),
+                [os.path.join(path, "comp_v010.%03d.exr 1-2")],
+            )
+            self.assertEqual(listEntries.call_count, 2)
+
+    def test_recently_modified_folder(self):
+        """
+        Ensures the lookups of a folder modified within the mtime resolution
+        aren't cached, as the folder may change again without its mtime
+        changing.
+        """
+        path = self.makeRender("comp_v010", ["comp_v010.001.exr"], age=0)
+        self.module.getRenderSequences(path)
+
+        # written within the same mtime tick
+        mtime = os.stat(path).st_mtime
+        open(os.path.join(path, "comp_v010.002.exr"), "w").close()
+        os.utime(path, (mtime, mtime))
+
+        self.assertEqual(
+            self.module.getRenderSequences(path),
+            [os.path.join(path, "comp_v010.%03d.exr 1-2")],
+        )
+        self.assertNotIn(path, self.module.sequenceCache)
+
+
+if __name__ == "__main__":
+    unittest.main()
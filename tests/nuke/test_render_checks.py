@@ -0,0 +1,134 @@
+"""
+Headless tests of the RenderChecks Nuke callbacks, run against a fake nuke
+module.
+"""
+
+import os
+import sys
+import types
+import unittest
+
+SCRIPTS_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "core", "schema", "project",
+    "CONFIG", "NUKE", "SCRIPTS"
+)
+
+
+class FakeKnob(object):
+    def __init__(self, name, value, index=1):
+        self._name = name
+        self._value = value
+        self._index = index
+
+    def name(self):
+        return self._name
+
+    def value(self):
+        return self._value
+
+    def getValue(self):
+        return self._index
+
+    def setValue(self, value):
+        self._value = value
+
+
+class FakeNode(object):
+    def __init__(self, name, **knobs):
+        self._name = name
+        self.knobs = dict((key, FakeKnob(key, value)) for key, value in knobs.items())
+
+    def name(self):
+        return self._name
+
+    def knob(self, name):
+        return self.knobs[name]
+
+
+def _make_nuke(nodes):
+    nuke = types.ModuleType("nuke")
+    nuke.GUI = True
+    nuke.lookups = []
+    nuke.current = {}
+
+    def toNode(name):
+        nuke.lookups.append(name)
+        return nodes.get(name)
+
+    nuke.toNode = toNode
+    root = FakeNode("/shots/shot_v001.nk")
+    nuke.root = lambda: root
+    nuke.thisNode = lambda: nuke.current.get("node")
+    nuke.thisParent = lambda: nuke.current.get("parent")
+    nuke.thisKnob = lambda: nuke.current.get("knob")
+    for callback in ("addKnobChanged", "addOnDestroy", "addOnCreate",
+                     "addOnScriptLoad", "addOnScriptClose"):
+        setattr(nuke, callback, lambda *args, **kwargs: None)
+    return nuke
+
+
+class TestRenderChecks(unittest.TestCase):
+    def setUp(self):
+        self.read = FakeNode("Read1", colorspace="default (sRGB)")
+        self.read.knobs["colorspace"]._index = 0
+        self.nodes = {"Read1": self.read}
+
+        self.nuke = _make_nuke(self.nodes)
+        sys.modules["nuke"] = self.nuke
+        sys.path.insert(0, SCRIPTS_PATH)
+        sys.modules.pop("RenderChecks", None)
+        import RenderChecks
+
+        self.RenderChecks = RenderChecks
+
+    def tearDown(self):
+        sys.path.pop(0)
+        del sys.modules["nuke"]
+        sys.modules.pop("RenderChecks", None)
+
+    def test_default_colorspace_followed(self):
+        """
+        Ensures a change of the default colorspace of the reference Read, from
+        its file or the root color management, is seen without any callback.
+        """
+        self.assertEqual(self.RenderChecks.getReferenceColorspace(), "sRGB")
+
+        self.read.knob("colorspace").setValue("default (linear)")
+        self.assertEqual(self.RenderChecks.getReferenceColorspace(), "linear")
+
+        # the node is only looked up once.
+        self.assertEqual(self.nuke.lookups, ["Read1"])
+
+    def test_reference_read_renamed(self):
+        """
+        Ensures the reference Read is looked up again once a Read is renamed.
+        """
+        self.assertEqual(self.RenderChecks.getReferenceColorspace(), "sRGB")
+
+        del self.nodes["Read1"]
+        self.nuke.current["knob"] = FakeKnob("name", "Plate")
+        self.RenderChecks.onReadKnobChanged()
+        self.assertIsNone(self.RenderChecks.getReferenceColorspace())
+        self.assertEqual(self.nuke.lookups, ["Read1", "Read1"])
+
+    def test_check_sets_colors(self):
+        """
+        Ensures the Write group is colored after its profile and colorspace.
+        """
+        write = FakeNode("Write1", colorspace="sRGB")
+        group = FakeNode("WriteTank1", tk_profile_list="PRECOMP", tile_color=0)
+        self.nuke.current.update(node=write, parent=group)
+
+        self.RenderChecks.checkSets()
+        self.assertEqual(group.knob("tile_color").value(), 13724671)
+
+        write.knob("colorspace").setValue("linear")
+        self.RenderChecks.checkSets()
+        self.assertEqual(
+            group.knob("tile_color").value(), self.RenderChecks.MISMATCH_COLOR
+        )
+        self.assertEqual(self.RenderChecks.getCallTimes()["checkSets"][0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
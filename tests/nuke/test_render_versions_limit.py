@@ -0,0 +1,122 @@
+"""
+Tests of the RenderVersionsLimit purge of old render versions, run against a
+fake nuke module and temporary folders.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+SCRIPTS_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "core", "schema", "project",
+    "CONFIG", "NUKE", "SCRIPTS"
+)
+
+
+class TestRenderVersionsLimit(unittest.TestCase):
+    def setUp(self):
+        sys.modules["nuke"] = types.ModuleType("nuke")
+        sys.path.insert(0, SCRIPTS_PATH)
+        sys.modules.pop("RenderVersionsLimit", None)
+        import RenderVersionsLimit
+
+        self.module = RenderVersionsLimit
+        self.images = tempfile.mkdtemp()
+
+    def tearDown(self):
+        sys.path.pop(0)
+        del sys.modules["nuke"]
+        sys.modules.pop("RenderVersionsLimit", None)
+        shutil.rmtree(self.images)
+
+    def make_version(self, folderName, size=1000, frames=2):
+        """
+        Creates a render version folder holding frames of the given size.
+        """
+        path = os.path.join(self.images, folderName)
+        os.makedirs(path)
+        for frame in range(frames):
+            with open(os.path.join(path, "%04d.exr" % frame), "wb") as frame_file:
+                frame_file.write(b"x" * size)
+        return path
+
+    def test_parse_version(self):
+        """
+        Ensures folder names are split into their base name and version.
+        """
+        self.assertEqual(self.module.ParseVersion("comp_v012"), ("comp_v", 12))
+        self.assertEqual(self.module.ParseVersion("comp_v2"), ("comp_v", 2))
+        self.assertEqual(self.module.ParseVersion("comp"), (None, None))
+
+    def test_versions_ordered_by_number(self):
+        """
+        Ensures versions are ordered by their number rather than by the order
+        of the folder listing, and other renders are left out.
+        """
+        for folderName in ("comp_v10", "comp_v9", "comp_v100", "comp_v1", "bg_v3"):
+            self.make_version(folderName)
+        with open(os.path.join(self.images, "comp_v50"), "w"):
+            pass
+
+        listing = ["comp_v9", "comp_v100", "bg_v3", "comp_v50", "comp_v1", "comp_v10"]
+        with mock.patch.object(self.module.os, "listdir", return_value=listing):
+            versions = self.module.GetVersions(self.images, "comp_v100")
+
+        self.assertEqual([version for (version, path) in versions], [1, 9, 10, 100])
+        self.assertEqual(versions[-1][1], os.path.join(self.images, "comp_v100"))
+        self.assertEqual(self.module.GetVersions(self.images, "comp"), [])
+
+    def test_keep_versions(self):
+        """
+        Ensures only the versions older than the newest ones are surplus.
+        """
+        versions = [(version, "v%d" % version) for version in range(1, 7)]
+
+        self.assertEqual(
+            self.module.GetSurplusVersions(versions, keep=4), versions[:2]
+        )
+        self.assertEqual(self.module.GetSurplusVersions(versions, keep=6), [])
+        self.assertEqual(self.module.GetSurplusVersions(versions[:3]), [])
+
+    def test_purge(self):
+        """
+        Ensures the old versions are deleted, keeping the newest ones, and the
+        reclaimed bytes are counted.
+        """
+        paths = [self.make_version("comp_v%03d" % version) for version in range(1, 7)]
+
+        surplus = self.module.PurgeVersions(self.images, "comp_v006", keep=4)
+        deleter = self.module.GetVersionDeleter()
+        deleter.wait()
+
+        self.assertEqual(surplus, paths[:2])
+        self.assertEqual(deleter.deletedFolders, paths[:2])
+        self.assertEqual(deleter.reclaimedBytes, 2 * 2 * 1000)
+        for path in paths[:2]:
+            self.assertFalse(os.path.exists(path))
+        for path in paths[2:]:
+            self.assertTrue(os.path.isdir(path))
+
+    def test_rendered_version_kept(self):
+        """
+        Ensures the folder being rendered is never deleted, even when an old
+        version is rendered again.
+        """
+        paths = [self.make_version("comp_v%03d" % version) for version in range(1, 7)]
+
+        surplus = self.module.PurgeVersions(self.images, "comp_v002", keep=2)
+        self.module.GetVersionDeleter().wait()
+
+        self.assertEqual(surplus, [paths[0], paths[2], paths[3]])
+        self.assertTrue(os.path.isdir(paths[1]))
+        self.assertEqual(
+            sorted(os.listdir(self.images)), ["comp_v002", "comp_v005", "comp_v006"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests of the review render worker protocol, run with a fake renderer.
+"""
+
+import io
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.join(
+        os.path.dirname(__file__), "..", "..", "hooks", "tk-multi-reviewsubmission",
+        "nuke"
+    )
+)
+
+import render_worker  # noqa: E402
+
+
+def read_messages(stdout):
+    """
+    Return the protocol messages written by the worker.
+    """
+    messages = []
+    for line in stdout.getvalue().splitlines():
+        if line.startswith(render_worker.PROTOCOL_PREFIX):
+            messages.append(json.loads(line[len(render_worker.PROTOCOL_PREFIX):]))
+    return messages
+
+
+class TestRunWorker(unittest.TestCase):
+    def setUp(self):
+        self.jobs = []
+
+    def render(self, job, frame_rendered):
+        self.jobs.append(job)
+        if job.get("fail"):
+            raise RuntimeError("render failed")
+        for frame in range(job["first_frame"], job["last_frame"] + 1):
+            frame_rendered(frame)
+
+    def run_worker(self, *lines):
+        stdin = io.StringIO(u"".join(line + u"\n" for line in lines))
+        stdout = io.StringIO()
+        render_worker.run_worker(render=self.render, stdin=stdin, stdout=stdout)
+        return read_messages(stdout)
+
+    def test_jobs(self):
+        """
+        Ensures the jobs are rendered in turn and a failed job doesn't stop
+        the worker.
+        """
+        messages = self.run_worker(
+            json.dumps({"id": 1, "first_frame": 1, "last_frame": 2}),
+            json.dumps({"id": 2, "fail": True}),
+            u"",
+            json.dumps({"id": 3, "first_frame": 5, "last_frame": 5}),
+        )
+
+        self.assertEqual([job["id"] for job in self.jobs], [1, 2, 3])
+        self.assertEqual(
+            messages,
+            [
+                {"status": "ready"},
+                {"id": 1, "status": "started"},
+                {"id": 1, "status": "frame", "frame": 1},
+                {"id": 1, "status": "frame", "frame": 2},
+                {"id": 1, "status": "done"},
+                {"id": 2, "status": "started"},
+                {"id": 2, "status": "error", "message": "render failed"},
+                {"id": 3, "status": "started"},
+                {"id": 3, "status": "frame", "frame": 5},
+                {"id": 3, "status": "done"},
+            ],
+        )
+
+    def test_invalid_jobs(self):
+        """
+        Ensures jobs that can't be read are answered with an error without an
+        id and the worker keeps going.
+        """
+        messages = self.run_worker(
+            u"not json",
+            u"[1, 2]",
+            json.dumps({"id": 1, "first_frame": 1, "last_frame": 1}),
+        )
+
+        self.assertEqual(len(self.jobs), 1)
+        self.assertEqual(messages[0], {"status": "ready"})
+        for message in messages[1:3]:
+            self.assertEqual(message["status"], "error")
+            self.assertNotIn("id", message)
+        self.assertEqual(messages[-1], {"id": 1, "status": "done"})
+
+    def test_stdin_closed(self):
+        """
+        Ensures the worker exits once stdin is closed.
+        """
+        self.assertEqual(self.run_worker(), [{"status": "ready"}])
+        self.assertEqual(self.jobs, [])
+
+
+if __name__ == "__main__":
+    unittest.main()